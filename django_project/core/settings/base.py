@@ -149,6 +149,31 @@ CACHES = {
         )
     }
 }
+# expiry (in seconds) of cached API responses
+API_CACHE_TTL = int(os.environ.get('API_CACHE_TTL', 3600))
+# delay (in seconds) of view vector tiles task, requests of the same view
+# within this window are coalesced into single task
+VIEW_VECTOR_TILES_DEBOUNCE = int(
+    os.environ.get('VIEW_VECTOR_TILES_DEBOUNCE', 60)
+)
+# limits of user-defined view query: maximum estimated cost from
+# EXPLAIN, statement timeout (in ms) and number of entities in preview
+VIEW_QUERY_MAX_COST = float(
+    os.environ.get('VIEW_QUERY_MAX_COST', 5000000)
+)
+VIEW_QUERY_STATEMENT_TIMEOUT = int(
+    os.environ.get('VIEW_QUERY_STATEMENT_TIMEOUT', 30000)
+)
+VIEW_QUERY_PREVIEW_LIMIT = int(
+    os.environ.get('VIEW_QUERY_PREVIEW_LIMIT', 50000)
+)
+# key of signed vector tile urls that are verified by nginx secure_link,
+# empty key disables signing and tiles are authorized using token
+TILE_URL_SIGNING_KEY = os.environ.get('TILE_URL_SIGNING_KEY', '')
+# validity (in seconds) of signed tile url, must be longer than API_CACHE_TTL
+TILE_URL_SIGNATURE_TTL = int(
+    os.environ.get('TILE_URL_SIGNATURE_TTL', 21600)
+)
 
 LOGIN_URL = '/account/login/'
 LOGIN_REDIRECT_URL = '/'
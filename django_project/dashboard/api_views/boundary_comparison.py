@@ -8,11 +8,14 @@ from rest_framework import serializers
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from area import area
 
 from azure_auth.backends import AzureAuthRequiredMixin
 from dashboard.models import EntityUploadStatus, BoundaryComparison
 from georepo.models import GeographicalEntity, BoundaryType
+from georepo.utils.geometry_metrics import (
+    ensure_geometry_metrics,
+    ensure_geometry_metrics_of_entities
+)
 from modules.admin_boundaries.admin_boundary_matching import (
     get_closest_entities,
     compare_entities,
@@ -151,19 +154,13 @@ class BoundaryComparisonSerializer(serializers.ModelSerializer):
         return 0
 
     def get_new_perimeter(self, obj: BoundaryComparison):
-        if obj.main_boundary and obj.main_boundary.geometry:
-            return round(
-                obj.main_boundary.geometry.length,
-                2
-            )
+        if obj.main_boundary and obj.main_boundary.perimeter:
+            return round(obj.main_boundary.perimeter, 2)
         return 0
 
     def get_old_perimeter(self, obj: BoundaryComparison):
-        if obj.comparison_boundary and obj.comparison_boundary.geometry:
-            return round(
-                obj.comparison_boundary.geometry.length,
-                2
-            )
+        if obj.comparison_boundary and obj.comparison_boundary.perimeter:
+            return round(obj.comparison_boundary.perimeter, 2)
         return 0
 
     def get_default_old_code(self, obj: BoundaryComparison):
@@ -339,6 +336,15 @@ class BoundaryComparisonMatchTable(AzureAuthRequiredMixin, APIView):
             output = []
         else:
             paginated_entities = paginator.get_page(page)
+            # compute metrics of entities in the page that are
+            # not backfilled yet, before the page is loaded
+            entity_ids = set()
+            for ids in paginated_entities.object_list.values_list(
+                    'main_boundary_id', 'comparison_boundary_id'):
+                entity_ids.update(id for id in ids if id)
+            ensure_geometry_metrics_of_entities(
+                GeographicalEntity.objects.filter(id__in=entity_ids)
+            )
             output = (
                 BoundaryComparisonSerializer(
                     paginated_entities, many=True).data
@@ -363,76 +369,43 @@ class BoundaryComparisonGeometry(AzureAuthRequiredMixin, APIView):
         response_data = {}
         bbox = []
         if boundary_comparison.main_boundary:
+            main_boundary = boundary_comparison.main_boundary
+            ensure_geometry_metrics(main_boundary)
             response_data['main_boundary_geom'] = (
                 json.loads(
-                    boundary_comparison.main_boundary.geometry.geojson
+                    main_boundary.geometry.geojson
                 )
             )
-            area_km = boundary_comparison.main_boundary.area
-            if not area_km:
-                area_km = area(
-                        boundary_comparison.main_boundary.
-                        geometry.geojson,
-                ) / 1e+6
-                boundary_comparison.main_boundary.area = area_km
-                boundary_comparison.main_boundary.save()
-
             response_data['main_boundary_data'] = {
-                'label': boundary_comparison.main_boundary.label,
-                'code': boundary_comparison.main_boundary.ucode,
-                'area': (
-                    round(
-                        area_km,
-                        2)
-                ),
-                'perimeter': (
-                    round(
-                        boundary_comparison.main_boundary.geometry.
-                        length,
-                        2
-                    )
-                )
+                'label': main_boundary.label,
+                'code': main_boundary.ucode,
+                'area': round(main_boundary.area, 2),
+                'perimeter': round(main_boundary.perimeter, 2)
             }
-
-            bbox = (
-                boundary_comparison.main_boundary.geometry.extent
-            )
+            bbox = main_boundary.bbox
         if boundary_comparison.comparison_boundary:
+            comparison_boundary = boundary_comparison.comparison_boundary
+            ensure_geometry_metrics(comparison_boundary)
             response_data['comparison_boundary_geom'] = (
                 json.loads(
-                    boundary_comparison.comparison_boundary.geometry.geojson
-                )
-            )
-            area_km = boundary_comparison.comparison_boundary.area
-            union = (
-                boundary_comparison.main_boundary.geometry.union(
-                    boundary_comparison.comparison_boundary.geometry
+                    comparison_boundary.geometry.geojson
                 )
             )
-            if union:
-                bbox = union.extent
-            if not area_km:
-                area_km = area(
-                    boundary_comparison.comparison_boundary.
-                    geometry.geojson,
-                ) / 1e+6
-                boundary_comparison.comparison_boundary.area = area_km
-                boundary_comparison.comparison_boundary.save()
+            if bbox:
+                # extent of both boundaries
+                bbox = [
+                    min(bbox[0], comparison_boundary.bbox[0]),
+                    min(bbox[1], comparison_boundary.bbox[1]),
+                    max(bbox[2], comparison_boundary.bbox[2]),
+                    max(bbox[3], comparison_boundary.bbox[3])
+                ]
+            else:
+                bbox = comparison_boundary.bbox
             response_data['comparison_boundary_data'] = {
-                'label': boundary_comparison.comparison_boundary.label,
-                'code': boundary_comparison.comparison_boundary.ucode,
-                'area': (
-                    round(
-                        area_km,
-                        2)
-                ),
-                'perimeter': (
-                    round(
-                        boundary_comparison.comparison_boundary.geometry.
-                        length,
-                        2
-                    )
-                )
+                'label': comparison_boundary.label,
+                'code': comparison_boundary.ucode,
+                'area': round(comparison_boundary.area, 2),
+                'perimeter': round(comparison_boundary.perimeter, 2)
             }
 
         response_data['bbox'] = bbox
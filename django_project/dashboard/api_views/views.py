@@ -1,11 +1,12 @@
 import re
 import uuid
+import logging
 import os.path
 import math
 from django.db.models.expressions import RawSQL, Q
 from django.conf import settings
 from django.contrib.auth.mixins import UserPassesTestMixin
-from django.db import connection
+from django.db import connection, DatabaseError
 from django.http import Http404, HttpResponseForbidden, HttpResponse
 from django.core.paginator import Paginator
 from django.shortcuts import get_object_or_404
@@ -37,7 +38,8 @@ from georepo.models.dataset_view import (
 from georepo.utils.dataset_view import (
     trigger_generate_vector_tile_for_view,
     create_sql_view,
-    init_view_privacy_level
+    init_view_privacy_level,
+    view_entity_ids_sql
 )
 from georepo.tasks.simplify_geometry import simplify_geometry_in_view
 from georepo.utils.permission import (
@@ -46,8 +48,11 @@ from georepo.utils.permission import (
     get_view_permission_privacy_level
 )
 from georepo.utils.exporter_base import APIDownloaderBase
+from dashboard.tools.query_guard import check_query_cost, guarded_cursor
 
 
+logger = logging.getLogger(__name__)
+
 TABLE_NAMES = [
     'geographicalentity',
     'entityname',
@@ -119,6 +124,23 @@ class QueryStringCheck(object):
                     )
         return True
 
+    def validate_query_cost(self):
+        """
+        Check estimated cost of query string.
+
+        Return error detail if query cannot be planned or
+        its cost exceeds VIEW_QUERY_MAX_COST.
+        """
+        try:
+            cost_valid, plan = check_query_cost(self.query_string)
+        except DatabaseError as ex:
+            return str(ex)
+        if not cost_valid:
+            return (
+                f'Query is too expensive (estimated cost {plan["cost"]})'
+            )
+        return None
+
 
 class DatasetViewBasePermission(UserPassesTestMixin):
 
@@ -293,9 +315,6 @@ class ViewList(AzureAuthRequiredMixin, APIView):
             user_privacy_levels,
             views_querysets
         ) = get_views_for_user(self.request.user)
-        # It seems we cannot use values_list on views_queryset
-        views_querysets = DatasetView.objects.\
-            filter(id__in=[v.id for v in views_querysets])
         views_querysets = self._search_queryset(views_querysets, self.request)
         views_querysets = self._filter_queryset(views_querysets, self.request)
         page = int(self.request.GET.get('page', '1'))
@@ -337,9 +356,6 @@ class ViewFilterValue(
 
     def get_user_views(self):
         _, views_querysets = get_views_for_user(self.request.user)
-        views_querysets = DatasetView.objects.filter(
-            id__in=[v.id for v in views_querysets]
-        )
         return views_querysets
 
     def fetch_tags(self):
@@ -477,6 +493,11 @@ class UpdateView(AzureAuthRequiredMixin,
 
         should_generate_vector_tiles = False
         if self.query_string != dataset_view.query_string:
+            cost_error = self.validate_query_cost()
+            if cost_error:
+                return Response(data={
+                    'detail': cost_error,
+                }, status=400)
             dataset_view.query_string = self.query_string
             should_generate_vector_tiles = True
 
@@ -535,6 +556,12 @@ class CreateNewView(AzureAuthRequiredMixin,
         if not name or not description or not mode or not self.query_string:
             raise Http404('Missing required field')
 
+        cost_error = self.validate_query_cost()
+        if cost_error:
+            return Response(data={
+                'detail': cost_error,
+            }, status=400)
+
         dataset_view = DatasetView.objects.create(
             name=name,
             description=description,
@@ -590,25 +617,42 @@ class QueryViewCheck(APIView, QueryStringCheck):
                 'total': 0
             })
 
-        cursor = connection.cursor()
+        try:
+            cost_valid, plan = check_query_cost(self.query_string)
+        except DatabaseError as ex:
+            logger.warning('Failed to check cost of view query: %s', ex)
+            return Response(data={
+                'valid': False,
+                'total': 0
+            })
+        if not cost_valid:
+            return Response(data={
+                'valid': False,
+                'total': 0,
+                'cost': plan['cost'],
+                'hints': plan['hints'],
+                'detail': 'Query is too expensive'
+            })
         total_count = 0
         try:
             clean_query = self.query_string.replace(';', '')
             sql = f'SELECT COUNT(*) FROM ({clean_query}) AS custom_view'
-            cursor.execute(sql)
-            total_count = cursor.fetchone()[0]
-            cursor.close()
-            connection.commit()
-        except Exception as ex: # noqa
-            print(ex)
-            connection.rollback()
+            with guarded_cursor() as cursor:
+                cursor.execute(sql)
+                total_count = cursor.fetchone()[0]
+        except DatabaseError as ex:
+            logger.warning('Failed to count view query: %s', ex)
             return Response(data={
                 'valid': False,
-                'total': 0
+                'total': 0,
+                'cost': plan['cost'],
+                'hints': plan['hints']
             })
         return Response(data={
             'valid': True,
-            'total': total_count
+            'total': total_count,
+            'cost': plan['cost'],
+            'hints': plan['hints']
         })
 
 
@@ -629,18 +673,49 @@ class QueryViewPreview(APIView, QueryStringCheck):
         query_valid = self.check_query()
         if not query_valid:
             raise Http404('Query invalid')
+        try:
+            cost_valid, plan = check_query_cost(self.query_string)
+            if not cost_valid:
+                return Response(status=400, data={
+                    'detail': 'Query is too expensive',
+                    'cost': plan['cost'],
+                    'hints': plan['hints']
+                })
+            # cache the ids of entities so preview tiles do not
+            # execute the query string
+            limit = settings.VIEW_QUERY_PREVIEW_LIMIT
+            clean_query = self.query_string.replace(';', '')
+            sql = (
+                'SELECT DISTINCT custom_view.id '
+                f'FROM ({clean_query}) AS custom_view '
+                f'LIMIT {limit + 1}'
+            )
+            with guarded_cursor() as cursor:
+                cursor.execute(sql)
+                entity_ids = [row[0] for row in cursor.fetchall()]
+        except DatabaseError as ex:
+            logger.warning('Failed to preview view query: %s', ex)
+            return Response(status=400, data={
+                'detail': 'Query invalid'
+            })
+        limited = len(entity_ids) > limit
+        entity_ids = entity_ids[:limit]
 
         config, _ = EntitiesUserConfig.objects.update_or_create(
             dataset=dataset,
             user=request.user,
             uuid=session,
             defaults={
-                'query_string': self.query_string
+                'query_string': self.query_string,
+                'entity_ids': entity_ids
             }
         )
 
         return Response(data={
-            'session': config.uuid
+            'session': config.uuid,
+            'total': len(entity_ids),
+            'limited': limited,
+            'hints': plan['hints']
         })
 
 
@@ -675,9 +750,7 @@ class DownloadView(AzureAuthRequiredMixin,
             privacy_level__lte=user_privacy_level
         )
         # raw_sql to view to select id
-        raw_sql = (
-            'SELECT id from "{}"'
-        ).format(str(dataset_view.uuid))
+        raw_sql = view_entity_ids_sql(dataset_view)
         entities = entities.filter(
             id__in=RawSQL(raw_sql, [])
         )
@@ -0,0 +1,19 @@
+# Generated by Django 4.0.7 on 2023-09-08 02:10
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0063_update_transform_function'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='entitiesuserconfig',
+            name='entity_ids',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.IntegerField(), blank=True, help_text='Cached ids of entities selected by query_string', null=True, size=None),
+        ),
+    ]
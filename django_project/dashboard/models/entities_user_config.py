@@ -3,6 +3,7 @@ import hashlib
 import json
 
 from django.db import models
+from django.contrib.postgres.fields import ArrayField
 from django.conf import settings
 
 
@@ -49,6 +50,13 @@ class EntitiesUserConfig(models.Model):
         blank=True
     )
 
+    entity_ids = ArrayField(
+        models.IntegerField(),
+        null=True,
+        blank=True,
+        help_text='Cached ids of entities selected by query_string'
+    )
+
     def get_filter_viewname(self):
         _filters = self.filters
         # remove empty filter criteria
@@ -12,6 +12,7 @@ from georepo.utils.permission import (
     get_external_view_permission_privacy_level
 )
 from georepo.utils.dataset_view import get_view_tiling_status
+from georepo.utils.tile_signature import get_signed_tile_url_params
 from rest_framework.authtoken.models import Token
 
 
@@ -77,6 +78,7 @@ class DatasetViewSerializer(TaggitSerializer, serializers.ModelSerializer):
                     f'/layer_tiles/{str(resource.uuid)}/{{z}}/{{x}}/{{y}}'
                     f'?t={updated_at}&'
                     f'token={token}'
+                    f'{get_signed_tile_url_params(resource.uuid)}'
                 )
         return '-'
 
@@ -147,6 +149,11 @@ class DatasetViewDetailSerializer(TaggitSerializer,
                 user=self.context['user'],
                 query_string=obj.query_string
             )
+        elif config.entity_ids is not None:
+            # cached ids are from previous preview and can be stale,
+            # use the query string until the query is previewed again
+            config.entity_ids = None
+            config.save(update_fields=['entity_ids'])
         return str(config.uuid)
 
     def get_permissions(self, obj: DatasetView):
@@ -12,8 +12,16 @@ from georepo.utils import (
 logger = logging.getLogger(__name__)
 
 
-@shared_task(name="generate_view_vector_tiles")
-def generate_view_vector_tiles_task(view_resource_id: str,
+def is_vector_tiles_task_superseded(view_resource, task_id) -> bool:
+    """Check whether newer vector tiles task of resource is scheduled."""
+    if task_id is None:
+        return False
+    view_resource.refresh_from_db(fields=['vector_tiles_task_id'])
+    return view_resource.vector_tiles_task_id != task_id
+
+
+@shared_task(name="generate_view_vector_tiles", bind=True)
+def generate_view_vector_tiles_task(self, view_resource_id: str,
                                     export_data: bool = True,
                                     overwrite: bool = True):
     from georepo.models.dataset_view import DatasetViewResource
@@ -24,13 +32,20 @@ def generate_view_vector_tiles_task(view_resource_id: str,
 
     try:
         view_resource = DatasetViewResource.objects.get(id=view_resource_id)
+        if is_vector_tiles_task_superseded(view_resource, self.request.id):
+            logger.info(
+                f'Skipping vector tile of view_resource {view_resource.id}, '
+                'superseded by newer task'
+            )
+            return
         logger.info(
             f'Generating vector tile from view_resource {view_resource.id} '
             f'- {view_resource.privacy_level} '
             f'- {view_resource.dataset_view.name}'
         )
         generate_view_vector_tiles(view_resource, overwrite=overwrite)
-        if export_data:
+        if export_data and not is_vector_tiles_task_superseded(
+                view_resource, self.request.id):
             view = view_resource.dataset_view
             logger.info(
                 f'Extracting geojson from view {view.name} - '
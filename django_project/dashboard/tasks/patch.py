@@ -105,3 +105,18 @@ def fix_entity_name_encoding(dataset_id):
                                     f'{total_features}')
                 logger.info(f'Finished patching {feature_idx+1}/'
                             f'{total_features}')
+    from georepo.utils.cache_generation import (
+        bump_generation,
+        dataset_schema_scope
+    )
+    bump_generation(dataset_schema_scope(dataset.uuid))
+    if dataset.read_model_generated_at:
+        from georepo.utils.entity_read_model import (
+            generate_entity_read_model
+        )
+        generate_entity_read_model(dataset)
+    if dataset.search_document_generated_at:
+        from georepo.utils.search_document import (
+            generate_search_document
+        )
+        generate_search_document(dataset)
@@ -102,7 +102,8 @@ from georepo.utils.dataset_view import (
     generate_default_view_dataset_latest
 )
 from georepo.utils.dataset_view import (
-    init_view_privacy_level
+    init_view_privacy_level,
+    generate_view_membership
 )
 from core.models.preferences import SitePreferences
 
@@ -748,6 +749,52 @@ class TestApiViews(TestCase):
             rev_2_geo_2.label
         )
 
+    def test_boundary_table_geometry_metrics(self):
+        parent = GeographicalEntityF.create(
+            revision_number=1,
+            level=0
+        )
+        entity = GeographicalEntityF.create(
+            revision_number=1,
+            parent=parent,
+            level=1,
+            geometry=GEOSGeometry(
+                'POLYGON((0 0, 0 1, 1 1, 1 0, 0 0))',
+                srid=4326
+            )
+        )
+        # entity before the metrics were stored
+        GeographicalEntity.objects.filter(id=entity.id).update(
+            area=None,
+            perimeter=None
+        )
+        BoundaryComparisonF.create(
+            main_boundary=entity
+        )
+        entity_upload = EntityUploadF.create(
+            original_geographical_entity=parent,
+            revised_geographical_entity=parent
+        )
+        kwargs = {
+            'entity_upload_id': entity_upload.id,
+            'level': 1
+        }
+        request = self.factory.get(
+            reverse('boundary-comparison-match-table', kwargs=kwargs)
+        )
+        request.user = UserF.create()
+        view = BoundaryComparisonMatchTable.as_view()
+        response = view(request, **kwargs)
+        self.assertEqual(response.status_code, 200)
+        result = response.data['results'][0]
+        # 1x1 degree at equator is about 12308 km2
+        self.assertAlmostEqual(result['new_area'], 12308, delta=10)
+        self.assertAlmostEqual(result['new_perimeter'], 443.8, delta=1)
+        self.assertEqual(result['old_area'], 0)
+        self.assertEqual(result['old_perimeter'], 0)
+        entity.refresh_from_db()
+        self.assertIsNotNone(entity.area)
+
     def test_layer_file_entity_type_list(self):
         request_by = UserF.create(username='test_user')
         request = self.factory.get(
@@ -2776,6 +2823,8 @@ class TestApiViews(TestCase):
             unique_code='PAK_001',
             unique_code_version=1
         )
+        # entities are added after the view is created
+        generate_view_membership(dataset_view)
         kwargs = {
             'id': str(dataset_view.id)
         }
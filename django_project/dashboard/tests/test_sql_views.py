@@ -1,13 +1,14 @@
-from django.test import TransactionTestCase
+from django.test import TransactionTestCase, override_settings
 from django.urls import reverse
 from rest_framework.test import APIRequestFactory
 
 from dashboard.api_views.views import SQLColumnsTablesList, QueryViewCheck,\
     QueryViewPreview
 from georepo.tests.model_factories import (
-    UserF, GeographicalEntityF, DatasetF
+    UserF, GeographicalEntityF, DatasetF, DatasetViewF
 )
 from dashboard.models.entities_user_config import EntitiesUserConfig
+from dashboard.serializers.view import DatasetViewDetailSerializer
 
 
 class TestSqlViews(TransactionTestCase):
@@ -75,9 +76,13 @@ class TestSqlViews(TransactionTestCase):
         query_string = (
             'select * from georepo_geographicalentity WHERE label=\'test\''
         )
-        GeographicalEntityF.create()
-        user = UserF.create()
         dataset = DatasetF.create()
+        entity = GeographicalEntityF.create(
+            dataset=dataset,
+            label='test'
+        )
+        GeographicalEntityF.create(dataset=dataset)
+        user = UserF.create()
         request = self.factory.post(
             reverse('query-view-preview'), {
                 'query_string': query_string,
@@ -94,3 +99,49 @@ class TestSqlViews(TransactionTestCase):
                 uuid=response.data['session']
             ).exists()
         )
+        config = EntitiesUserConfig.objects.get(
+            uuid=response.data['session']
+        )
+        self.assertEqual(config.entity_ids, [entity.id])
+        self.assertEqual(response.data['total'], 1)
+        self.assertFalse(response.data['limited'])
+        # reused config of view does not serve the cached ids
+        dataset_view = DatasetViewF.create(
+            dataset=dataset,
+            query_string=query_string
+        )
+        session = DatasetViewDetailSerializer(
+            context={'user': user}
+        ).get_preview_session(dataset_view)
+        self.assertEqual(session, str(config.uuid))
+        config.refresh_from_db()
+        self.assertIsNone(config.entity_ids)
+
+    @override_settings(VIEW_QUERY_MAX_COST=0)
+    def test_query_cost_limit(self):
+        query_string = (
+            'select * from georepo_geographicalentity WHERE label=\'test\''
+        )
+        user = UserF.create()
+        dataset = DatasetF.create()
+        request = self.factory.post(
+            reverse('query-view-check'), {
+                'query_string': query_string,
+                'dataset': dataset.id
+            }
+        )
+        request.user = user
+        response = QueryViewCheck.as_view()(request)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['valid'], False)
+        self.assertIn('cost', response.data)
+        request = self.factory.post(
+            reverse('query-view-preview'), {
+                'query_string': query_string,
+                'dataset': dataset.id
+            }
+        )
+        request.user = user
+        response = QueryViewPreview.as_view()(request)
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(EntitiesUserConfig.objects.exists())
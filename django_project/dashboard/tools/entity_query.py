@@ -5,6 +5,8 @@ from django.contrib.gis.geos import Point
 from georepo.models import (
     Dataset, DatasetView
 )
+from georepo.utils.dataset_view import view_entity_ids_sql
+from georepo.utils.entity_validity import validity_sql_condition
 
 from dashboard.models import (
     EntitiesUserConfig
@@ -76,31 +78,41 @@ def generate_query_condition(
         valid_from = validate_datetime(filter.filters['valid_from'])
         if (valid_from):
             sql = (
-                sql + 'AND (gg.start_date<=%s AND '
-                '(gg.end_date IS NULL OR gg.end_date>=%s)) '
+                sql + 'AND ' + validity_sql_condition('gg') + ' '
             )
             query_values.append(valid_from)
-            query_values.append(valid_from)
     if ('search_text' in filter.filters and
             len(filter.filters['search_text']) > 0):
-        sql = (
-            sql + 'AND (gg.label ilike %s OR '
+        search_text = '%' + filter.filters['search_text'] + '%'
+        search_sql = (
+            '(gg.label ilike %s OR '
             'ge.label ilike %s OR '
             'parent_0.label ilike %s OR '
             'gg.unique_code ilike %s OR '
             'gg.concept_ucode ilike %s OR '
-            'ge_id.value ilike %s OR '
-            'ge_name.name ilike %s '
+            'EXISTS (SELECT 1 FROM georepo_entityid ge_id '
+            '  WHERE ge_id.geographical_entity_id = gg.id AND '
+            '  ge_id.value ilike %s) OR '
+            'EXISTS (SELECT 1 FROM georepo_entityname ge_name '
+            '  WHERE ge_name.geographical_entity_id = gg.id AND '
+            '  ge_name.name ilike %s)'
             ') '
         )
-        search_text = '%' + filter.filters['search_text'] + '%'
-        query_values.append(search_text)
-        query_values.append(search_text)
-        query_values.append(search_text)
-        query_values.append(search_text)
-        query_values.append(search_text)
-        query_values.append(search_text)
-        query_values.append(search_text)
+        search_values = [search_text] * 7
+        if dataset.search_document_generated_at:
+            # search document only exists for approved entities
+            search_sql = (
+                '(gg.id IN (SELECT sd.geographical_entity_id '
+                '  FROM georepo_entitysearchdocument sd '
+                '  WHERE sd.dataset_id = %s AND '
+                '  sd.document LIKE lower(unaccent(%s))) OR '
+                '((gg.is_approved=false OR gg.is_approved IS NULL) AND ' +
+                search_sql +
+                ')) '
+            )
+            search_values = [dataset.id, search_text] + search_values
+        sql = sql + 'AND ' + search_sql
+        query_values.extend(search_values)
     if 'points' in filter.filters:
         points_cond = []
         for lngLat in filter.filters['points']:
@@ -128,6 +140,32 @@ def generate_query_condition(
     return sql, query_values
 
 
+def generate_query_string_condition(
+        filter: EntitiesUserConfig,
+        query_values: List[str]) -> str:
+    """
+    Condition of entities selected by query_string of filter.
+
+    Use the cached entity ids from query preview if exists,
+    so the query string is not executed for every page/tile.
+    """
+    if filter.entity_ids is not None and filter.id:
+        query_values.append(filter.id)
+        return (
+            ' AND gg.id = ANY((SELECT euc.entity_ids '
+            'FROM dashboard_entitiesuserconfig euc '
+            'WHERE euc.id = %s)) '
+        )
+    query_string = filter.query_string.replace(';', '')
+    query_string = query_string.replace('%', '%%')
+    return (
+        ' AND gg.id IN (SELECT temp_table.id FROM (' +
+        query_string +
+        ') AS temp_table'
+        ') '
+    )
+
+
 def generate_entity_query(
         dataset: Dataset,
         filter: EntitiesUserConfig,
@@ -165,10 +203,6 @@ def generate_entity_query(
         'left join georepo_geographicalentity parent_0 on ( '
         '    parent_0.id = gg.ancestor_id '
         ') '
-        'left join georepo_entityid ge_id on '
-        '    ge_id.geographical_entity_id = gg.id '
-        'left join georepo_entityname ge_name on '
-        '    ge_name.geographical_entity_id = gg.id '
     )
     sql_joins = sql_joins + 'where gg.dataset_id = %s '
     sql_cond, query_values = generate_query_condition(
@@ -176,15 +210,8 @@ def generate_entity_query(
         filter,
         privacy_level=privacy_level)
     if filter.query_string:
-        query_string = filter.query_string.replace(';', '')
-        query_string = query_string.replace('%', '%%')
-        sql_cond = (
-            sql_cond +
-            ' AND gg.id IN (SELECT temp_table.id FROM (' +
-            query_string +
-            ') AS temp_table'
-            ') '
-        )
+        sql_cond = sql_cond + generate_query_string_condition(
+            filter, query_values)
     sql = (
         sql_select + sql_joins + sql_cond +
         'group by gg.id, parent_0.id, ge.label, '
@@ -245,10 +272,6 @@ def generate_entity_query_map(
         'left join georepo_geographicalentity parent_0 on ( '
         '    parent_0.id = gg.ancestor_id '
         ') '
-        'left join georepo_entityid ge_id on '
-        '    ge_id.geographical_entity_id = gg.id '
-        'left join georepo_entityname ge_name on '
-        '    ge_name.geographical_entity_id = gg.id '
     )
     sql_joins = (
         sql_joins +
@@ -260,15 +283,8 @@ def generate_entity_query_map(
         filter,
         privacy_level=privacy_level)
     if filter.query_string:
-        query_string = filter.query_string.replace(';', '')
-        query_string = query_string.replace('%', '%%')
-        sql_cond = (
-            sql_cond +
-            ' AND gg.id IN (SELECT temp_table.id FROM (' +
-            query_string +
-            ') AS temp_table'
-            ') '
-        )
+        sql_cond = sql_cond + generate_query_string_condition(
+            filter, query_values)
     if filter.concept_ucode:
         sql_cond = (
             sql_cond +
@@ -368,13 +384,10 @@ def generate_entity_query_map_for_temp(
             sql_cond + 'AND gg.privacy_level <= %s ')
         query_values.append(privacy_level)
     if dataset_view:
-        query_string = dataset_view.query_string.replace(';', '')
-        query_string = query_string.replace('%', '%%')
         sql_cond = (
             sql_cond +
-            ' AND gg.id IN (SELECT temp_table.id FROM (' +
-            query_string +
-            ') AS temp_table'
+            ' AND gg.id IN (' +
+            view_entity_ids_sql(dataset_view) +
             ') '
         )
     sql = (
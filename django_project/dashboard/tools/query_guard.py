@@ -0,0 +1,76 @@
+import json
+from contextlib import contextmanager
+from typing import Tuple
+
+from django.conf import settings
+from django.db import connection, transaction
+
+# sequential scan with more estimated rows than this is reported
+# as missing index hint
+SEQ_SCAN_HINT_MIN_ROWS = 10000
+
+
+@contextmanager
+def guarded_cursor(timeout=None):
+    """
+    Cursor that is cancelled by postgres after statement timeout.
+
+    The timeout is set locally in a transaction, so it does not leak
+    to other queries in the same connection.
+    """
+    if timeout is None:
+        timeout = settings.VIEW_QUERY_STATEMENT_TIMEOUT
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL statement_timeout = %s', [timeout])
+            yield cursor
+
+
+def _collect_hints(plan, hints):
+    """Find sequential scan of large relation in the query plan."""
+    if (
+        plan.get('Node Type') == 'Seq Scan' and
+        plan.get('Plan Rows', 0) >= SEQ_SCAN_HINT_MIN_ROWS
+    ):
+        hint = {
+            'relation': plan.get('Relation Name'),
+            'rows': plan.get('Plan Rows')
+        }
+        if plan.get('Filter'):
+            hint['filter'] = plan.get('Filter')
+        if hint not in hints:
+            hints.append(hint)
+    for child in plan.get('Plans', []):
+        _collect_hints(child, hints)
+    return hints
+
+
+def explain_query(query: str):
+    """
+    Return estimated cost, rows and missing index hints of query.
+
+    The query is only planned, not executed.
+    """
+    clean_query = query.replace(';', '')
+    with guarded_cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {clean_query}')
+        result = cursor.fetchone()[0]
+    if isinstance(result, str):
+        result = json.loads(result)
+    plan = result[0]['Plan']
+    return {
+        'cost': plan.get('Total Cost', 0),
+        'rows': plan.get('Plan Rows', 0),
+        'hints': _collect_hints(plan, [])
+    }
+
+
+def check_query_cost(query: str) -> Tuple[bool, dict]:
+    """
+    Check whether estimated cost of query is below
+    VIEW_QUERY_MAX_COST.
+
+    Raise database error if the query is invalid.
+    """
+    plan = explain_query(query)
+    return plan['cost'] <= settings.VIEW_QUERY_MAX_COST, plan
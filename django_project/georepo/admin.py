@@ -441,8 +441,14 @@ def download_view_size_action(modeladmin, request, queryset):
 
 @admin.action(description='Fix Privacy Level')
 def fix_view_privacy_level(modeladmin, request, queryset):
-    from georepo.utils.dataset_view import init_view_privacy_level
+    from georepo.utils.dataset_view import (
+        ensure_sql_views,
+        generate_view_membership,
+        init_view_privacy_level
+    )
+    ensure_sql_views(queryset)
     for dataset_view in queryset:
+        generate_view_membership(dataset_view)
         init_view_privacy_level(dataset_view)
 
 
@@ -474,7 +480,11 @@ def view_generate_simplified_geometry(modeladmin, request, queryset):
 
 @admin.action(description='Fix Entity Count in View')
 def fix_view_entity_count(modeladmin, request, queryset):
-    from georepo.utils.dataset_view import get_entities_count_in_view
+    from georepo.utils.dataset_view import (
+        ensure_sql_views,
+        get_entities_count_in_view
+    )
+    ensure_sql_views(queryset)
     for dataset_view in queryset:
         view_resources = DatasetViewResource.objects.filter(
             dataset_view=dataset_view
@@ -538,52 +548,28 @@ class TagAdmin(admin.ModelAdmin):
 
 @admin.action(description='Regenerate Vector Tiles')
 def regenerate_resource_vector_tiles(modeladmin, request, queryset):
-    from celery.result import AsyncResult
-    from core.celery import app
-    from dashboard.tasks import (
-        generate_view_vector_tiles_task
+    from georepo.utils.dataset_view import (
+        schedule_view_resource_vector_tiles
     )
     for view_resource in queryset:
-        if view_resource.vector_tiles_task_id:
-            res = AsyncResult(view_resource.vector_tiles_task_id)
-            if not res.ready():
-                # find if there is running task and stop it
-                app.control.revoke(view_resource.vector_tiles_task_id,
-                                   terminate=True)
-        view_resource.status = DatasetView.DatasetViewStatus.PENDING
-        view_resource.vector_tiles_progress = 0
-        view_resource.save()
-        task = generate_view_vector_tiles_task.apply_async(
-            (view_resource.id, True, True),
-            queue='tegola'
+        schedule_view_resource_vector_tiles(
+            view_resource,
+            export_data=True,
+            overwrite=True
         )
-        view_resource.vector_tiles_task_id = task.id
-        view_resource.save(update_fields=['vector_tiles_task_id'])
 
 
 @admin.action(description='Resume Vector Tiles Generation')
 def resume_vector_tiles_generation(modeladmin, request, queryset):
-    from celery.result import AsyncResult
-    from core.celery import app
-    from dashboard.tasks import (
-        generate_view_vector_tiles_task
+    from georepo.utils.dataset_view import (
+        schedule_view_resource_vector_tiles
     )
     for view_resource in queryset:
-        if view_resource.vector_tiles_task_id:
-            res = AsyncResult(view_resource.vector_tiles_task_id)
-            if not res.ready():
-                # find if there is running task and stop it
-                app.control.revoke(view_resource.vector_tiles_task_id,
-                                   terminate=True)
-        view_resource.status = DatasetView.DatasetViewStatus.PENDING
-        view_resource.vector_tiles_progress = 0
-        view_resource.save()
-        task = generate_view_vector_tiles_task.apply_async(
-            (view_resource.id, True, False),
-            queue='tegola'
+        schedule_view_resource_vector_tiles(
+            view_resource,
+            export_data=True,
+            overwrite=False
         )
-        view_resource.vector_tiles_task_id = task.id
-        view_resource.save(update_fields=['vector_tiles_task_id'])
 
 
 @admin.action(description='Calculate Vector Tiles Size')
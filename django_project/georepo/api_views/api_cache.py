@@ -1,10 +1,46 @@
+import hashlib
+import time
 from typing import Tuple
+from django.conf import settings
 from django.core.cache import cache
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
 from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 from rest_framework.response import Response
 
+from georepo.utils.cache_generation import (
+    GLOBAL_SCOPE,
+    PERMISSION_SCOPE,
+    dataset_scope,
+    view_scope,
+    get_generations
+)
+from georepo.utils.tile_signature import (
+    get_signature_window,
+    is_tile_url_signing_enabled
+)
+
+API_CACHE_KEY_PREFIX = 'api'
+API_CACHE_HIT_KEY = 'api_cache:hit'
+API_CACHE_MISS_KEY = 'api_cache:miss'
+
+
+def increment_cache_stat(stat_key: str, class_name: str):
+    key = f'{stat_key}:{class_name}'
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
+
+
+def get_cache_stats(class_name: str) -> Tuple[int, int]:
+    """Return (hit, miss) counter of api class."""
+    hit_key = f'{API_CACHE_HIT_KEY}:{class_name}'
+    miss_key = f'{API_CACHE_MISS_KEY}:{class_name}'
+    stats = cache.get_many([hit_key, miss_key])
+    return stats.get(hit_key, 0), stats.get(miss_key, 0)
+
 
 class ApiCache(APIView, LimitOffsetPagination):
     permission_classes = [IsAuthenticated]
@@ -16,67 +52,171 @@ class ApiCache(APIView, LimitOffsetPagination):
                 *args, **kwargs) -> Tuple[dict, dict | None]:
         raise NotImplementedError
 
+    def get_cache_scopes(self, request, *args, **kwargs):
+        """
+        Return list of generation scopes that are included in cache key.
+
+        Bumping generation of any of the scopes invalidates the response.
+        """
+        scopes = [GLOBAL_SCOPE]
+        uuid = kwargs.get('uuid', None)
+        if uuid and self.cache_model:
+            if self.cache_model.__name__ == 'Dataset':
+                scopes.append(dataset_scope(uuid))
+            elif self.cache_model.__name__ == 'DatasetView':
+                scopes.append(view_scope(uuid))
+        return scopes
+
     def get(self, request, *args, **kwargs):
-        # disabled cache temporary
-        # if self.use_cache and (
-        #     request.GET.get('cached', 'True').lower()
-        # ) == 'true':
-        #     cached_data = self.get_cache()
-        #     if cached_data:
-        #         try:
-        #             return Response(
-        #                 cached_data['data'],
-        #                 headers=cached_data['response_headers']
-        #             )
-        #         except (TypeError, KeyError):
-        #             pass
+        etag = self.get_etag() if self.use_cache else None
+        # validate before running any query of the response
+        if etag and self.is_not_modified(request, etag):
+            return self.not_modified_response(etag)
+        use_cache = self.use_cache and (
+            request.GET.get('cached', 'True').lower()
+        ) == 'true'
+        if use_cache:
+            cached_data = self.get_cache()
+            if cached_data:
+                increment_cache_stat(
+                    API_CACHE_HIT_KEY, self.__class__.__name__)
+                last_modified = cached_data.get('last_modified', None)
+                if self.is_not_modified(request, None, last_modified):
+                    return self.not_modified_response(etag, last_modified)
+                return Response(
+                    cached_data['data'],
+                    headers=self.get_validator_headers(
+                        cached_data['response_headers'],
+                        etag, last_modified
+                    )
+                )
+            increment_cache_stat(
+                API_CACHE_MISS_KEY, self.__class__.__name__)
 
         response_data, response_headers = self.get_response_data(
             request, *args, **kwargs
         )
-        self.set_cache({
-            'data': response_data,
-            'response_headers': response_headers
-        })
+        last_modified = int(time.time()) if self.use_cache else None
+        if self.use_cache:
+            self.set_cache({
+                'data': response_data,
+                'response_headers': response_headers,
+                'last_modified': last_modified
+            })
         return Response(
             response_data,
-            headers=response_headers
+            headers=self.get_validator_headers(
+                response_headers, etag, last_modified
+            )
         )
 
-    def get_cache(self):
-        cache_key = (
-            f'{self.request.get_full_path()}'
+    def get_cache_generations(self) -> dict:
+        """
+        Return generations of cache scopes and permissions
+        in one cache call.
+        """
+        if getattr(self, '_cache_generations', None):
+            return self._cache_generations
+        scopes = self.get_cache_scopes(
+            self.request, *self.args, **self.kwargs)
+        self._cache_generations = get_generations(
+            scopes + [PERMISSION_SCOPE])
+        return self._cache_generations
+
+    def get_etag(self) -> str:
+        """
+        Return ETag of the response.
+
+        The response only changes when generation of its scopes is
+        bumped or the permissions (privacy level) of the user change,
+        so the ETag is computed without querying the database.
+        """
+        etag_key = self.get_cache_key()
+        if is_tile_url_signing_enabled():
+            # signed tile urls in the response expire
+            etag_key = f'{etag_key}:{get_signature_window()}'
+        return '"{}"'.format(
+            hashlib.md5(etag_key.encode('utf-8')).hexdigest()
+        )
+
+    def is_not_modified(self, request, etag, last_modified=None) -> bool:
+        """Check conditional request headers against the validators."""
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH', None)
+        if if_none_match:
+            if etag is None:
+                return False
+            # weak comparison, proxy may mark the ETag as weak
+            # '*' is not honoured: this check runs before the request
+            # is authorised and before the resource is found
+            etags = [
+                tag.removeprefix('W/') for tag in parse_etags(if_none_match)
+            ]
+            return etag in etags
+        if_modified_since = parse_http_date_safe(
+            request.META.get('HTTP_IF_MODIFIED_SINCE', None)
+        )
+        return (
+            last_modified is not None and
+            if_modified_since is not None and
+            last_modified <= if_modified_since
         )
-        _cached_data = cache.get(cache_key)
-        if _cached_data:
+
+    def get_validator_headers(self, response_headers, etag,
+                              last_modified=None):
+        if etag is None:
+            return response_headers
+        headers = dict(response_headers) if response_headers else {}
+        headers['ETag'] = etag
+        # response is per user, client must revalidate before reuse
+        headers['Cache-Control'] = 'private, no-cache'
+        if last_modified is not None:
+            headers['Last-Modified'] = http_date(last_modified)
+        return headers
+
+    def not_modified_response(self, etag, last_modified=None):
+        return Response(
+            status=304,
+            headers=self.get_validator_headers(None, etag, last_modified)
+        )
+
+    def get_cache_key(self):
+        if getattr(self, '_cache_key', None):
+            return self._cache_key
+        scopes = self.get_cache_scopes(
+            self.request, *self.args, **self.kwargs)
+        generations = self.get_cache_generations()
+        # permission generation is bumped when access or privacy level
+        # of any user is changed, cached response must not outlive it
+        generation_key = '-'.join(
+            [str(generations[scope]) for scope in scopes] +
+            [str(generations[PERMISSION_SCOPE])]
+        )
+        renderer = getattr(self.request, 'accepted_renderer', None)
+        renderer_format = renderer.format if renderer else ''
+        path_hash = hashlib.md5(
+            self.request.get_full_path().encode('utf-8')
+        ).hexdigest()
+        self._cache_key = (
+            f'{API_CACHE_KEY_PREFIX}:{self.__class__.__name__}:'
+            f'{generation_key}:{self.request.user.id}:'
+            f'{renderer_format}:{path_hash}'
+        )
+        return self._cache_key
+
+    def get_cache(self):
+        _cached_data = cache.get(self.get_cache_key())
+        if (
+            isinstance(_cached_data, dict) and
+            'data' in _cached_data and
+            'response_headers' in _cached_data
+        ):
             return _cached_data
         return None
 
     def set_cache(self, cached_data: dict):
-        cache_model_name = f'{self.cache_model.__name__}'
-        cache_keys = 'cache_keys'
-        cache_keys_data = cache.get(cache_keys)
-        cache_key = (
-            f'{self.request.get_full_path()}'
+        cache.set(
+            self.get_cache_key(),
+            cached_data,
+            settings.API_CACHE_TTL
         )
-        if (
-                not cache_keys_data or
-                cache_model_name not in cache_keys_data
-        ):
-            cache_keys_data = {
-                cache_model_name: []
-            }
-
-        if cache_key not in cache_keys_data[cache_model_name]:
-            cache_keys_data[cache_model_name].append(cache_key)
-
-        cache.set(cache_keys, cache_keys_data, None)
-
-        _cached_data = cache.get(cache_key)
-        if not _cached_data:
-            cache.set(cache_key,
-                      cached_data,
-                      None)
-        else:
-            cached_data = _cached_data
         return cached_data
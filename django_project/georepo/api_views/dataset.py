@@ -23,6 +23,7 @@ from georepo.utils.permission import (
     get_view_permission_privacy_level
 )
 from georepo.api_views.api_cache import ApiCache
+from georepo.utils.cache_generation import GLOBAL_SCOPE, module_scope
 from georepo.models import (
     GeographicalEntity,
     Dataset,
@@ -43,9 +44,10 @@ from georepo.serializers.dataset import (
 )
 from georepo.utils.renderers import GeojsonRenderer, ShapefileRenderer
 from georepo.utils.exporter_base import DatasetExporterBase
-from georepo.utils.unique_code import parse_unique_code
+from georepo.utils.unique_code import parse_unique_code, get_unique_code
 from georepo.utils.uuid_helper import get_uuid_value
 from georepo.utils.url_helper import get_page_size
+from georepo.utils.entity_tree import build_entity_tree
 from georepo.api_views.api_collections import (
     SEARCH_DATASET_TAG,
     SEARCH_ENTITY_TAG,
@@ -124,6 +126,9 @@ class DatasetList(ApiCache):
     cache_model = Dataset
     use_cache = True
 
+    def get_cache_scopes(self, request, *args, **kwargs):
+        return [GLOBAL_SCOPE, module_scope(kwargs.get('uuid'))]
+
     def get_response_data(self, request, *args, **kwargs):
         uuid = kwargs.get('uuid')
         page = int(request.GET.get('page', '1'))
@@ -748,31 +753,29 @@ class DatasetEntityListHierarchical(ApiCache):
 
     def entities_code(self, parent_entity: GeographicalEntity,
                       max_privacy_level: int):
-        codes = []
         entities = GeographicalEntity.objects.filter(
-            parent=parent_entity,
             is_approved=True,
             is_latest=True,
             dataset=parent_entity.dataset,
             privacy_level__lte=max_privacy_level
-        ).order_by('unique_code').defer('geometry').iterator()
-        for entity in entities:
-            if (
-                GeographicalEntity.objects.filter(
-                    parent=entity,
-                    is_approved=True,
-                    is_latest=True,
-                    dataset=parent_entity.dataset,
-                    privacy_level__lte=max_privacy_level
-                ).exists()
-            ):
-                codes.append({
-                    entity.ucode: self.entities_code(entity,
-                                                     max_privacy_level)
-                })
-            else:
-                codes.append(entity.ucode)
-        return codes
+        ).order_by('unique_code')
+        use_ancestry_path = parent_entity.has_complete_ancestry_path()
+        if use_ancestry_path:
+            # fetch whole subtree in single query
+            entities = entities.filter(
+                ancestry_path__descendant_of=parent_entity.ancestry_path
+            ).exclude(id=parent_entity.id)
+        return build_entity_tree(
+            [parent_entity.id],
+            entities.values(
+                'id', 'parent_id', 'unique_code', 'unique_code_version'
+            ),
+            lambda entity: get_unique_code(
+                entity['unique_code'],
+                entity['unique_code_version']
+            ),
+            is_subtree=use_ancestry_path
+        )[parent_entity.id]
 
     def get_response_data(self, request, *args, **kwargs):
         dataset_uuid = kwargs.get('uuid', None)
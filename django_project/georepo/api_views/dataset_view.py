@@ -11,7 +11,6 @@ from django.core.paginator import Paginator
 from django.utils.decorators import method_decorator
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
-from guardian.core import ObjectPermissionChecker
 from guardian.shortcuts import get_objects_for_user
 
 from georepo.utils.permission import (
@@ -19,9 +18,16 @@ from georepo.utils.permission import (
     DatasetViewDetailAccessPermission,
     get_dataset_views_for_user,
     get_view_permission_privacy_level,
-    check_user_has_view_permission
+    check_user_has_view_permission,
+    EXTERNAL_READ_VIEW_PERMISSION_LIST
 )
 from georepo.api_views.api_cache import ApiCache
+from georepo.utils.cache_generation import (
+    GLOBAL_SCOPE,
+    VIEW_LIST_SCOPE,
+    dataset_scope,
+    dataset_views_scope
+)
 from georepo.models.dataset_view import (
     DatasetView,
     DatasetViewResource,
@@ -46,14 +52,12 @@ from georepo.serializers.common import APIErrorSerializer
 from georepo.utils.unique_code import parse_unique_code
 from georepo.utils.uuid_helper import get_uuid_value
 from georepo.utils.url_helper import get_page_size
+from georepo.utils.dataset_view import view_entity_ids_sql
 from georepo.api_views.api_collections import (
     SEARCH_VIEW_TAG,
     DOWNLOAD_DATA_TAG
 )
 from georepo.utils.api_parameters import common_api_params
-from georepo.utils.permission import (
-    EXTERNAL_READ_VIEW_PERMISSION_LIST
-)
 from georepo.utils.exporter_base import APIDownloaderBase
 
 
@@ -131,6 +135,14 @@ class DatasetViewList(ApiCache):
     permission_classes = [DatasetDetailAccessPermission]
     cache_model = DatasetView
 
+    def get_cache_scopes(self, request, *args, **kwargs):
+        dataset_uuid = kwargs.get('uuid', None)
+        return [
+            GLOBAL_SCOPE,
+            dataset_scope(dataset_uuid),
+            dataset_views_scope(dataset_uuid)
+        ]
+
     def get_response_data(self, request, *args, **kwargs):
         dataset_uuid = self.kwargs.get('uuid', None)
         page = int(request.GET.get('page', '1'))
@@ -256,10 +268,12 @@ class DatasetViewListForUser(ApiCache):
     permission_classes = [IsAuthenticated]
     cache_model = DatasetView
 
+    def get_cache_scopes(self, request, *args, **kwargs):
+        return [GLOBAL_SCOPE, VIEW_LIST_SCOPE]
+
     def get_response_data(self, request, *args, **kwargs):
         page = int(request.GET.get('page', '1'))
         page_size = get_page_size(request)
-        checker = ObjectPermissionChecker(request.user)
         views = (
             DatasetView.objects.select_related('dataset').filter(
                 dataset__module__is_active=True
@@ -267,6 +281,8 @@ class DatasetViewListForUser(ApiCache):
                 'name'
             )
         )
+        # list every view with read permission, views above the user
+        # privacy level are returned without vector tiles and bbox
         permission_list = ['view_datasetview']
         permission_list.extend(EXTERNAL_READ_VIEW_PERMISSION_LIST)
         dataset_views = get_objects_for_user(
@@ -290,7 +306,7 @@ class DatasetViewListForUser(ApiCache):
                     many=True,
                     context={
                         'request': self.request,
-                        'obj_checker': checker
+                        'user': request.user
                     }
                 ).data
             )
@@ -404,9 +420,7 @@ class DatasetViewExportDownload(APIDownloaderBase):
             privacy_level__lte=user_privacy_level
         )
         # raw_sql to view to select id
-        raw_sql = (
-            'SELECT id from "{}"'
-        ).format(str(dataset_view.uuid))
+        raw_sql = view_entity_ids_sql(dataset_view)
         entities = entities.filter(
             id__in=RawSQL(raw_sql, [])
         )
@@ -601,9 +615,7 @@ class DatasetViewExportDownloadByCountry(DatasetViewExportDownload):
             privacy_level__lte=privacy_level
         )
         # raw_sql to view to select id
-        raw_sql = (
-            'SELECT id from "{}"'
-        ).format(str(dataset_view.uuid))
+        raw_sql = view_entity_ids_sql(dataset_view)
         entities = entities.filter(
             id__in=RawSQL(raw_sql, [])
         )
@@ -704,9 +716,7 @@ class DatasetViewExportDownloadByCountry(DatasetViewExportDownload):
                 (Q(ancestor__isnull=True) & Q(id=adm0.id))
             )
             # raw_sql to view to select id
-            raw_sql = (
-                'SELECT id from "{}"'
-            ).format(str(dataset_view.uuid))
+            raw_sql = view_entity_ids_sql(dataset_view)
             entities = entities.filter(
                 id__in=RawSQL(raw_sql, [])
             )
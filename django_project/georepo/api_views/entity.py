@@ -1,27 +1,37 @@
+import hashlib
 import json
 import math
-from typing import Tuple
+from typing import Tuple, List, Dict
 from enum import Enum
 from datetime import datetime
 from dateutil.parser import isoparse
-from django.db import connection
+from django.db import connection, transaction
 from django.http import Http404
 from django.core.exceptions import PermissionDenied
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 from django.utils.decorators import method_decorator
+from rest_framework.exceptions import ParseError
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 from rest_framework.generics import get_object_or_404
 from django.contrib.gis.geos import GEOSGeometry
 from core.models.preferences import SitePreferences
-from django.db.models import FilteredRelation, Q, Value, F, Max, IntegerField
-from django.db.models.functions import Replace, Greatest
-from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db.models import (
+    FilteredRelation, Q, Value, F, IntegerField, OuterRef, Subquery
+)
+from django.db.models.functions import Replace, Greatest, Coalesce
+from django.contrib.gis.db.models import PointField
+from django.contrib.gis.db.models.functions import AsGeoJSON
+from django.contrib.postgres.search import (
+    TrigramWordSimilarity,
+    SearchQuery
+)
 from django.core.paginator import Paginator
-from rest_framework.renderers import JSONRenderer
-from georepo.utils.renderers import GeojsonRenderer
+from django.core.cache import cache
+from django.conf import settings
+from georepo.utils.renderers import FastJSONRenderer, GeojsonRenderer
 from georepo.utils.permission import (
     DatasetDetailAccessPermission,
     get_view_permission_privacy_level
@@ -32,14 +42,37 @@ from georepo.utils.custom_geo_functions import (
 )
 
 from georepo.api_views.api_cache import ApiCache
+from georepo.utils.keyset_pagination import paginate_by_cursor
+from georepo.utils.dataset_schema import get_dataset_schema
+from georepo.utils.entity_tree import build_entity_tree
+from georepo.utils.dataset_view import view_entity_ids_sql
+from georepo.utils.geometry_metrics import get_entity_bbox
+from georepo.utils.entity_validity import (
+    parse_as_of,
+    filter_entities_as_of
+)
+from georepo.utils.search_document import (
+    SEARCH_DOCUMENT_TS_CONFIG,
+    normalize_search_text,
+    set_word_similarity_threshold
+)
+from georepo.utils.point_lookup import (
+    InvalidPointData,
+    POINT_LOOKUP_MAX_POINTS,
+    parse_points,
+    parse_points_csv,
+    lookup_points
+)
 from georepo.models import (
     Dataset,
     GeographicalEntity,
     IdType,
     EntityId,
-    EntityType,
     EntityName,
-    DatasetView
+    EntityType,
+    DatasetView,
+    EntitySimplified,
+    AdminLevelTilingConfig
 )
 from georepo.serializers.entity import (
     SearchEntitySerializer,
@@ -68,7 +101,21 @@ from georepo.api_views.api_collections import (
     OPERATION_ENTITY_TAG,
     CONTROLLED_LIST_TAG
 )
-from georepo.utils.api_parameters import common_api_params
+from georepo.utils.api_parameters import (
+    common_api_params,
+    cursor_api_params,
+    geometry_api_params,
+    as_of_api_params
+)
+
+# max number of input geometries in single containment check query
+CONTAINMENT_CHECK_BATCH_SIZE = 1000
+# number of candidates from the first phase of geometry search
+GEOMETRY_SEARCH_CANDIDATE_LIMIT = 100
+# max decimal digits of geometry coordinates in full_geom output
+GEOMETRY_MAX_PRECISION = 15
+# max number of ids in single batch lookup request
+BATCH_LOOKUP_MAX_IDS = 5000
 
 
 class GeomReturnType(Enum):
@@ -170,6 +217,7 @@ class EntityBoundingBox(APIView, DatasetDetailCheckPermission):
     ```
     """
     permission_classes = [DatasetDetailAccessPermission]
+    renderer_classes = [FastJSONRenderer]
     uuid_param = openapi.Parameter(
         'uuid', openapi.IN_PATH,
         description='Dataset UUID',
@@ -213,14 +261,14 @@ class EntityBoundingBox(APIView, DatasetDetailCheckPermission):
         )
         req_label = kwargs.get('id_type', '').lower()
         req_id = kwargs.get('id', '')
-        geom = None
+        bbox = None
         if req_label in MAIN_ENTITY_ID_LIST:
             entity = GeographicalEntity.objects.filter(
                 is_latest=True,
                 is_approved=True,
                 dataset=dataset,
                 privacy_level__lte=max_privacy_level
-            )
+            ).defer('geometry')
             if req_label == UUID_ENTITY_ID:
                 uuid_val = get_uuid_value(req_id)
                 entity = entity.filter(
@@ -255,7 +303,7 @@ class EntityBoundingBox(APIView, DatasetDetailCheckPermission):
                 )
             entity = entity.last()
             if entity:
-                geom = entity.geometry
+                bbox = get_entity_bbox(entity)
         else:
             entity_id = EntityId.objects.filter(
                 code__name__iexact=req_label,
@@ -266,13 +314,15 @@ class EntityBoundingBox(APIView, DatasetDetailCheckPermission):
                 geographical_entity__privacy_level__lte=max_privacy_level
             ).select_related(
                 'geographical_entity'
+            ).defer(
+                'geographical_entity__geometry'
             ).order_by('geographical_entity__id').last()
             if entity_id:
-                geom = entity_id.geographical_entity.geometry
-        if not geom:
+                bbox = get_entity_bbox(entity_id.geographical_entity)
+        if not bbox:
             raise Http404('No GeographicalEntity matches the given query.')
         return Response(
-            geom.extent
+            bbox
         )
 
 
@@ -346,6 +396,7 @@ class EntityContainmentCheck(APIView, DatasetDetailCheckPermission):
     ```
     """
     permission_classes = [DatasetDetailAccessPermission]
+    renderer_classes = [FastJSONRenderer]
     uuid_param = openapi.Parameter(
         'uuid', openapi.IN_PATH,
         description='Dataset UUID',
@@ -429,7 +480,7 @@ class EntityContainmentCheck(APIView, DatasetDetailCheckPermission):
         return None
 
     def get_id_value(self, id_type, results, is_hierarchical,
-                     max_privacy_level):
+                     max_privacy_level, trees=None):
         if not results:
             return []
         idx = 0
@@ -444,14 +495,19 @@ class EntityContainmentCheck(APIView, DatasetDetailCheckPermission):
         if is_hierarchical:
             hierarchical_list = []
             id_idx = 1 if isinstance(id_type, IdType) else 0
+            if trees is None:
+                trees = self.entities_code(
+                    [result[id_idx] for result in results if result[idx]],
+                    id_type,
+                    max_privacy_level
+                )
             for result in results:
                 geo_id = result[id_idx]
                 id_key = result[idx]
                 if not id_key:
                     continue
                 hierarchy = {
-                    str(id_key): self.entities_code(geo_id, id_type,
-                                                    max_privacy_level)
+                    str(id_key): trees[geo_id]
                 }
                 hierarchical_list.append(
                     hierarchy
@@ -459,30 +515,101 @@ class EntityContainmentCheck(APIView, DatasetDetailCheckPermission):
             return hierarchical_list
         return [str(row[idx]) for row in results]
 
-    def do_run_query(
+    def get_root_entity_ids(self, id_type, results_by_feature) -> list:
+        """Return entity ids of all results to build hierarchy trees."""
+        idx = 0
+        if id_type == CODE_ENTITY_ID:
+            idx = 3
+        elif id_type == UUID_ENTITY_ID:
+            idx = 2
+        elif id_type == UCODE_ENTITY_ID:
+            idx = 1
+        id_idx = 1 if isinstance(id_type, IdType) else 0
+        root_ids = set()
+        for results in results_by_feature.values():
+            root_ids.update(
+                [result[id_idx] for result in results if result[idx]]
+            )
+        return list(root_ids)
+
+    def do_run_batch_query(
             self,
             return_type: str,
             id_type: IdType | str,
             dataset: Dataset,
             spatial_query: str,
             dwithin_distance: int,
-            geom: GEOSGeometry,
+            geoms: List[GEOSGeometry],
             max_privacy_level: int,
             admin_level: str = None,
-            entity_type: EntityType = None) -> list:
+            entity_type: EntityType = None,
+            dataset_view: DatasetView = None) -> Dict[int, list]:
+        """
+        Run spatial query of multiple geometries in a single statement.
+
+        Input geometries are loaded into a relation using unnest with
+        ordinality and joined to the entities, so the result rows can be
+        grouped by the index of input geometry.
+        :return: dict of index of geometry to its result rows
+        """
+        results = {}
+        for start in range(0, len(geoms), CONTAINMENT_CHECK_BATCH_SIZE):
+            batch = geoms[start:start + CONTAINMENT_CHECK_BATCH_SIZE]
+            rows = self._run_batch_query(
+                return_type, id_type, dataset, spatial_query,
+                dwithin_distance, batch, max_privacy_level,
+                admin_level=admin_level,
+                entity_type=entity_type,
+                dataset_view=dataset_view
+            )
+            for row in rows:
+                # ordinality starts from 1
+                results.setdefault(start + row[0] - 1, []).append(row[1:])
+        return results
+
+    def _run_batch_query(
+            self,
+            return_type: str,
+            id_type: IdType | str,
+            dataset: Dataset,
+            spatial_query: str,
+            dwithin_distance: int,
+            geoms: List[GEOSGeometry],
+            max_privacy_level: int,
+            admin_level: str = None,
+            entity_type: EntityType = None,
+            dataset_view: DatasetView = None) -> list:
         query_values = [
-            dataset.id
+            [geom.ewkt for geom in geoms]
         ]
         query = (
-            'SELECT ' + ('gi.value, ' if isinstance(id_type, IdType) else '')
+            'WITH input_geom AS ('
+            '  SELECT t.idx, ST_GeomFromEWKT(t.geom) AS geom '
+            '  FROM unnest(%s::text[]) WITH ORDINALITY AS t(geom, idx)'
+            ') '
+            'SELECT input_geom.idx, ' +
+            ('gi.value, ' if isinstance(id_type, IdType) else '')
         )
+        if spatial_query == 'ST_Intersects':
+            spatial_params = 'ST_Intersects(input_geom.geom, gg.geometry)'
+        elif spatial_query == 'ST_Within':
+            spatial_params = 'ST_Within(input_geom.geom, gg.geometry)'
+        elif spatial_query == 'ST_Within(ST_Centroid)':
+            spatial_params = (
+                'ST_Within(ST_Centroid(input_geom.geom), gg.geometry)'
+            )
+        elif spatial_query == 'ST_DWithin':
+            spatial_params = 'ST_DWithin(input_geom.geom, gg.geometry, %s)'
+            query_values.append(dwithin_distance)
         query = (
             query +
             "gg.id, gg.unique_code || '_V' || CASE WHEN "
             'gg.unique_code_version IS NULL THEN 1 ELSE '
             'gg.unique_code_version END, '
             'gg.uuid, gg.internal_code '
-            'FROM georepo_geographicalentity gg '
+            'FROM input_geom '
+            'INNER JOIN georepo_geographicalentity gg '
+            f'  ON { spatial_params } '
         )
         if isinstance(id_type, IdType):
             # should query from EntityId
@@ -492,6 +619,8 @@ class EntityContainmentCheck(APIView, DatasetDetailCheckPermission):
                 'LEFT JOIN georepo_idtype gc '
                 '  ON gi.code_id = gc.id '
             )
+        query_values.append(dataset.id)
+        if isinstance(id_type, IdType):
             query_values.append(return_type)
         query = (
             query +
@@ -517,53 +646,87 @@ class EntityContainmentCheck(APIView, DatasetDetailCheckPermission):
             )
             query_values.append(admin_level)
         query_values.append(max_privacy_level)
-        query_values.append(geom.ewkt)
-        if spatial_query == 'ST_Intersects':
-            spatial_params = 'ST_Intersects(%s, gg.geometry)'
-        elif spatial_query == 'ST_Within':
-            spatial_params = 'ST_Within(%s, gg.geometry)'
-        elif spatial_query == 'ST_Within(ST_Centroid)':
-            spatial_params = 'ST_Within(ST_Centroid(%s), gg.geometry)'
-        elif spatial_query == 'ST_DWithin':
-            spatial_params = 'ST_DWithin(%s, gg.geometry, %s)'
-            query_values.append(dwithin_distance)
+        if dataset_view:
+            entity_filter = (
+                'gg.id IN ({}) '
+            ).format(view_entity_ids_sql(dataset_view))
+        else:
+            entity_filter = 'gg.is_latest=true '
         query = (
             query +
-            'gg.is_approved=true AND gg.is_latest=true AND '
-            'gg.privacy_level<=%s AND '
-            f'{ spatial_params } '
+            'gg.is_approved=true AND gg.privacy_level<=%s AND ' +
+            entity_filter
         )
         if isinstance(id_type, IdType):
             query = (
                 query +
-                'GROUP BY gi.value, gg.id '
-                'ORDER BY gi.value'
+                'GROUP BY input_geom.idx, gi.value, gg.id '
+                'ORDER BY input_geom.idx, gi.value'
             )
         else:
             query = (
                 query +
-                'GROUP BY gg.id '
-                'ORDER BY gg.id'
+                'GROUP BY input_geom.idx, gg.id '
+                'ORDER BY input_geom.idx, gg.id'
             )
         rows = []
         with connection.cursor() as cursor:
             cursor.execute(query, query_values)
             rows = cursor.fetchall()
-        return [row for row in rows]
+        return rows
 
-    def entities_code(self, parent_entity_id, id_type, max_privacy_level):
-        codes = []
+    def do_run_query(
+            self,
+            return_type: str,
+            id_type: IdType | str,
+            dataset: Dataset,
+            spatial_query: str,
+            dwithin_distance: int,
+            geom: GEOSGeometry,
+            max_privacy_level: int,
+            admin_level: str = None,
+            entity_type: EntityType = None) -> list:
+        results = self.do_run_batch_query(
+            return_type,
+            id_type,
+            dataset,
+            spatial_query,
+            dwithin_distance,
+            [geom],
+            max_privacy_level,
+            admin_level,
+            entity_type
+        )
+        return results.get(0, [])
+
+    def get_input_features(self, geojson) -> list:
+        if geojson['type'] == 'Feature':
+            return [geojson]
+        return geojson['features']
+
+    def get_tree_key(self, entity, id_type):
+        key = None
+        if isinstance(id_type, IdType):
+            key = entity.get('selected_id__value', None)
+        elif id_type == UUID_ENTITY_ID:
+            key = entity.get('uuid_revision', None)
+        elif id_type == CONCEPT_UUID_ENTITY_ID:
+            key = entity.get('uuid', None)
+        elif id_type == CODE_ENTITY_ID:
+            key = entity.get('internal_code', None)
+        elif id_type == UCODE_ENTITY_ID:
+            key_1 = entity.get('unique_code', None)
+            key_2 = entity.get('unique_code_version', 1)
+            if key_1:
+                key = get_unique_code(key_1, key_2)
+        return key
+
+    def get_tree_values(self, entities, id_type):
         # initial fields to select
         values = [
-            'id', 'internal_code', 'unique_code', 'uuid',
-            'uuid_revision', 'unique_code_version'
+            'id', 'parent_id', 'internal_code', 'unique_code', 'uuid',
+            'uuid_revision', 'unique_code_version', 'is_latest'
         ]
-        entities = GeographicalEntity.objects.filter(
-            parent__id=parent_entity_id,
-            is_approved=True,
-            is_latest=True,
-            privacy_level__lte=max_privacy_level
-        ).order_by('id')
         if isinstance(id_type, IdType):
             annotations = {
                 'selected_id': FilteredRelation(
@@ -573,40 +736,20 @@ class EntityContainmentCheck(APIView, DatasetDetailCheckPermission):
             }
             entities = entities.annotate(**annotations)
             values.append('selected_id__value')
-        entities = entities.values(*values).iterator()
-        for entity in entities:
-            key = None
-            entity_id = entity.get('id', None)
-            if isinstance(id_type, IdType):
-                key = entity.get('selected_id__value', None)
-            elif id_type == UUID_ENTITY_ID:
-                key = entity.get('uuid_revision', None)
-            elif id_type == CONCEPT_UUID_ENTITY_ID:
-                key = entity.get('uuid', None)
-            elif id_type == CODE_ENTITY_ID:
-                key = entity.get('internal_code', None)
-            elif id_type == UCODE_ENTITY_ID:
-                key_1 = entity.get('unique_code', None)
-                key_2 = entity.get('unique_code_version', 1)
-                if key_1:
-                    key = get_unique_code(key_1, key_2)
-            if not key or not entity_id:
-                continue
-            if (
-                GeographicalEntity.objects.filter(
-                    parent__id=entity_id,
-                    is_approved=True,
-                    is_latest=True,
-                    privacy_level__lte=max_privacy_level
-                ).exists()
-            ):
-                codes.append({
-                    str(key): self.entities_code(entity_id, id_type,
-                                                 max_privacy_level)
-                })
-            else:
-                codes.append(str(key))
-        return codes
+        return entities.values(*values)
+
+    def entities_code(self, parent_entity_ids, id_type, max_privacy_level):
+        """Return dict of parent entity id to its hierarchy codes."""
+        entities = GeographicalEntity.objects.filter(
+            is_approved=True,
+            is_latest=True,
+            privacy_level__lte=max_privacy_level
+        ).order_by('id')
+        return build_entity_tree(
+            parent_entity_ids,
+            self.get_tree_values(entities, id_type),
+            lambda entity: self.get_tree_key(entity, id_type)
+        )
 
     @swagger_auto_schema(
         operation_id='operation-containment-check',
@@ -675,59 +818,160 @@ class EntityContainmentCheck(APIView, DatasetDetailCheckPermission):
                 }).data
             )
         is_hierarchical = level_type is None and admin_level is None
-        if geojson['type'] == 'Feature':
-            results = self.do_run_query(
-                        return_type,
-                        id_type,
-                        dataset,
-                        spatial_query,
-                        dwithin_distance,
-                        GEOSGeometry(
-                            json.dumps(geojson['geometry']), srid=4326
-                        ),
-                        max_privacy_level,
-                        admin_level,
-                        entity_type
-                    )
-            if results:
-                return_type = kwargs.get('id_type', None)
-                if 'properties' not in geojson:
-                    geojson['properties'] = {}
-                geojson['properties'][return_type] = (
-                    self.get_id_value(id_type, results, is_hierarchical,
-                                      max_privacy_level)
-                )
-        elif geojson['type'] == 'FeatureCollection':
-            for idx, feature in enumerate(geojson['features']):
-                results = self.do_run_query(
-                            return_type,
-                            id_type,
-                            dataset,
-                            spatial_query,
-                            dwithin_distance,
-                            GEOSGeometry(
-                                json.dumps(feature['geometry']), srid=4326
-                            ),
-                            max_privacy_level,
-                            admin_level,
-                            entity_type
-                        )
-                if results:
-                    return_type = kwargs.get('id_type', None)
-                    if 'properties' not in feature:
-                        feature['properties'] = {}
-                    feature['properties'][return_type] = (
-                        self.get_id_value(id_type, results, is_hierarchical,
-                                          max_privacy_level)
-                    )
+        features = self.get_input_features(geojson)
+        results_by_feature = self.do_run_batch_query(
+            return_type,
+            id_type,
+            dataset,
+            spatial_query,
+            dwithin_distance,
+            [
+                GEOSGeometry(
+                    json.dumps(feature['geometry']), srid=4326
+                ) for feature in features
+            ],
+            max_privacy_level,
+            admin_level,
+            entity_type
+        )
+        trees = None
+        if is_hierarchical:
+            trees = self.entities_code(
+                self.get_root_entity_ids(id_type, results_by_feature),
+                id_type,
+                max_privacy_level
+            )
+        return_type = kwargs.get('id_type', None)
+        for idx, results in results_by_feature.items():
+            feature = features[idx]
+            if 'properties' not in feature:
+                feature['properties'] = {}
+            feature['properties'][return_type] = (
+                self.get_id_value(id_type, results, is_hierarchical,
+                                  max_privacy_level, trees=trees)
+            )
         return Response(
             geojson
         )
 
 
+
+class EntityPointLookup(EntityContainmentCheck):
+    """
+    Find geographical entities that contain the points
+
+    Given list of points (SRID 4326) in the payload, find the \
+        identifier value of {id_type} from Geographical Entity \
+        at all levels in the dataset that contain each point.
+
+    The points can be sent as JSON body:
+    ```
+    {"points": [[longitude, latitude], ...]}
+    ```
+    or as CSV file in the multipart field 'file' with longitude \
+        and latitude columns (lon,lat or longitude,latitude or x,y).
+
+    The result is ordered as the input points, each item is the list \
+        of entities sorted by admin level.
+
+    Example request:
+    ```
+    POST /operation/dataset/{uuid}/point-lookup/ucode/
+    Request Content-type: application/json
+    Request Body: {"points": [[69.2, 30.1]]}
+    ```
+    """
+    points_body = openapi.Schema(
+        description=(
+            'List of points [longitude, latitude] in SRID 4326'
+        ),
+        type=openapi.TYPE_OBJECT,
+        properties={
+            'points': openapi.Schema(
+                type=openapi.TYPE_ARRAY,
+                items=openapi.Schema(
+                    type=openapi.TYPE_ARRAY,
+                    items=openapi.Schema(type=openapi.TYPE_NUMBER)
+                )
+            )
+        }
+    )
+
+    def get_input_points(self, request):
+        csv_file = request.FILES.get('file', None)
+        if csv_file:
+            return parse_points_csv(csv_file)
+        if not isinstance(request.data, dict):
+            raise InvalidPointData('Invalid points data')
+        return parse_points(request.data.get('points', None))
+
+    def do_lookup(self, request, kwargs, dataset, max_privacy_level,
+                  dataset_view=None):
+        return_type = kwargs.get('id_type', None)
+        id_type = self.validate_return_type(
+            return_type.lower() if return_type else None
+        )
+        if not id_type:
+            return Response(
+                status=400,
+                data=APIErrorSerializer({
+                    'detail': 'Invalid Type.'
+                }).data
+            )
+        try:
+            points = self.get_input_points(request)
+        except InvalidPointData as ex:
+            return Response(
+                status=400,
+                data=APIErrorSerializer({
+                    'detail': str(ex)
+                }).data
+            )
+        if len(points) > POINT_LOOKUP_MAX_POINTS:
+            return Response(
+                status=400,
+                data=APIErrorSerializer({
+                    'detail': (
+                        'Maximum number of points is '
+                        f'{POINT_LOOKUP_MAX_POINTS}.'
+                    )
+                }).data
+            )
+        results = lookup_points(
+            dataset,
+            points,
+            id_type,
+            return_type,
+            max_privacy_level,
+            dataset_view=dataset_view
+        )
+        return Response({
+            'results': results
+        })
+
+    @swagger_auto_schema(
+        operation_id='operation-point-lookup',
+        tags=[OPERATION_ENTITY_TAG],
+        manual_parameters=[
+            EntityContainmentCheck.uuid_param,
+            EntityContainmentCheck.id_type_param
+        ],
+        request_body=points_body,
+        responses={
+            200: openapi.Schema(type=openapi.TYPE_OBJECT),
+            400: APIErrorSerializer
+        }
+    )
+    def post(self, request, *args, **kwargs):
+        dataset, max_privacy_level = self.get_dataset_obj(
+            request, kwargs
+        )
+        return self.do_lookup(request, kwargs, dataset, max_privacy_level)
+
+
 class EntitySearchBase(ApiCache, DatasetDetailCheckPermission):
     cache_model = Dataset
-    renderer_classes = [JSONRenderer, GeojsonRenderer]
+    renderer_classes = [FastJSONRenderer, GeojsonRenderer]
     # [Dataset, View]
     search_source = 'Dataset'
     permission_classes = [DatasetDetailAccessPermission]
@@ -742,13 +986,94 @@ class EntitySearchBase(ApiCache, DatasetDetailCheckPermission):
             else GeographicalEntitySerializer
         )
 
+    def get_geometry_precision(self) -> int:
+        """Return max decimal digits of geometry coordinates."""
+        try:
+            precision = int(self.request.GET.get('precision', ''))
+        except ValueError:
+            return GEOMETRY_MAX_PRECISION
+        return max(0, min(precision, GEOMETRY_MAX_PRECISION))
+
+    def get_as_of(self):
+        """Return datetime of as_of parameter, None if not requested."""
+        as_of = self.request.GET.get('as_of', None)
+        if not as_of:
+            return None
+        result = parse_as_of(as_of)
+        if result is None:
+            raise ParseError(f'Invalid as_of date {as_of}')
+        return result
+
+    def filter_latest_entities(self, entities):
+        """
+        Filter latest revision of entities in dataset.
+
+        If as_of is requested, then filter the revisions that are
+        valid at that date instead.
+        """
+        as_of = self.get_as_of()
+        if as_of:
+            return filter_entities_as_of(entities, as_of)
+        if self.search_source == 'Dataset':
+            return entities.filter(is_latest=True)
+        return entities
+
+    def get_zoom_tolerances(self, dataset, zoom: int):
+        """Return simplify tolerance for the level of outer entity."""
+        return AdminLevelTilingConfig.objects.filter(
+            dataset_tiling_config__dataset=dataset,
+            dataset_tiling_config__zoom_level=zoom,
+            level=OuterRef(OuterRef('level'))
+        ).values('simplify_tolerance')[:1]
+
+    def get_geometry_source(self, dataset):
+        """
+        Return geometry expression for full_geom output.
+
+        If tolerance or zoom is requested, then use the simplified
+        geometry with matching tolerance, otherwise full geometry.
+        """
+        simplified = EntitySimplified.objects.filter(
+            geographical_entity_id=OuterRef('id'),
+            simplified_geometry__isnull=False
+        )
+        tolerance = self.request.GET.get('tolerance', None)
+        zoom = self.request.GET.get('zoom', None)
+        try:
+            if tolerance is not None:
+                simplified = simplified.filter(
+                    simplify_tolerance=float(tolerance)
+                )
+            elif zoom is not None:
+                simplified = simplified.filter(
+                    simplify_tolerance=Subquery(
+                        self.get_zoom_tolerances(dataset, int(zoom))
+                    )
+                )
+            else:
+                return F('geometry')
+        except ValueError:
+            return F('geometry')
+        return Coalesce(
+            Subquery(simplified.values('simplified_geometry')[:1]),
+            F('geometry')
+        )
+
     def generate_entity_query(
         self,
         entities,
-        dataset_uuid,
+        dataset,
         entity_type=None,
-        admin_level=None
+        admin_level=None,
+        use_read_model=False
     ):
+        """
+        Build entity values query.
+
+        If use_read_model is True, ext_codes, names and parents are read
+        from EntityReadModel instead of joining each id type, name index
+        and parent level.
+        """
         # centroid, full_geom, no_geom. Default to no_geom
         geom_type = self.request.GET.get('geom', 'no_geom')
         geom_type = GeomReturnType.from_str(geom_type)
@@ -763,41 +1088,47 @@ class EntitySearchBase(ApiCache, DatasetDetailCheckPermission):
             'is_latest', 'admin_level_name', 'concept_ucode'
         ]
         if geom_type == GeomReturnType.FULL_GEOM or format == 'geojson':
+            # encode geometry to geojson text in the database
             entities = entities.annotate(
-                rhr_geom=ForcePolygonCCW(F('geometry'))
+                rhr_geom=AsGeoJSON(
+                    ForcePolygonCCW(self.get_geometry_source(dataset)),
+                    precision=self.get_geometry_precision()
+                )
             )
             values.append('rhr_geom')
         elif geom_type == GeomReturnType.CENTROID:
             entities = entities.annotate(
-                centroid=CentroidGravity(F('geometry'))
+                centroid=Coalesce(
+                    F('point_on_surface'),
+                    CentroidGravity(F('geometry')),
+                    output_field=PointField(srid=4326)
+                )
             )
             values.append('centroid')
-        # retrieve all ids+names in current dataset
-        ids = EntityId.objects.filter(
-            geographical_entity__is_approved=True,
-            geographical_entity__dataset__uuid=dataset_uuid
-        )
-        names = EntityName.objects.filter(
-            geographical_entity__is_approved=True,
-            geographical_entity__dataset__uuid=dataset_uuid
+        # retrieve id types and name slots in current dataset
+        schema = get_dataset_schema(
+            dataset,
+            entity_type=entity_type,
+            admin_level=admin_level
         )
-        if entity_type:
-            ids = ids.filter(
-                geographical_entity__type=entity_type.id
-            )
-            names = names.filter(
-                geographical_entity__type=entity_type.id
-            )
+        ids = schema['ids']
+        names_max_idx = schema['names']
+        # max level to build query for the parent's code
         if admin_level is not None:
-            ids = ids.filter(
-                geographical_entity__level=admin_level
-            )
-            names = names.filter(
-                geographical_entity__level=admin_level
+            max_level = int(admin_level)
+        else:
+            max_level = schema['max_level']
+        if use_read_model:
+            values.extend([
+                'read_model__ext_codes',
+                'read_model__names',
+                'read_model__parents'
+            ])
+            entities = entities.order_by('level', 'unique_code_version',
+                                         'unique_code', 'id')
+            return (
+                entities.values(*values), max_level, ids, names_max_idx
             )
-        ids = ids.order_by('code').values(
-            'code__id', 'code__name', 'default'
-        ).distinct('code__id')
         # conditional join to entity id for each id
         for id in ids:
             field_key = f"id_{id['code__id']}"
@@ -809,10 +1140,6 @@ class EntitySearchBase(ApiCache, DatasetDetailCheckPermission):
             }
             entities = entities.annotate(**annotations)
             values.append(f'{field_key}__value')
-        # get max idx in the names
-        names_max_idx = names.aggregate(
-            Max('idx')
-        )
         if names_max_idx['idx__max'] is not None:
             for name_idx in range(names_max_idx['idx__max'] + 1):
                 field_key = f"name_{name_idx}"
@@ -828,13 +1155,6 @@ class EntitySearchBase(ApiCache, DatasetDetailCheckPermission):
                 values.append(f'{field_key}__name')
                 values.append(f'{field_key}__language__code')
                 values.append(f'{field_key}__label')
-        # find max level to build query for the parent's code
-        max_level = 0
-        max_level_entity = entities.order_by(
-            'level'
-        ).last()
-        if max_level_entity:
-            max_level = max_level_entity.level
         related = ''
         for i in range(max_level):
             related = related + (
@@ -850,10 +1170,81 @@ class EntitySearchBase(ApiCache, DatasetDetailCheckPermission):
                                      'unique_code', 'id')
         return entities.values(*values), max_level, ids, names_max_idx
 
+    def get_total_count(self, entities) -> int:
+        """
+        Return total count of entities.
+
+        The count is cached using the generation of the dataset/view,
+        so the COUNT query only runs once until the data is changed.
+        """
+        scopes = self.get_cache_scopes(
+            self.request, *self.args, **self.kwargs)
+        generations = self.get_cache_generations()
+        query_params = sorted([
+            (key, value) for key, value in self.request.GET.items() if
+            key not in ['cursor', 'page', 'page_size', 'cached']
+        ])
+        params_hash = hashlib.md5(
+            f'{self.request.path}{query_params}'.encode('utf-8')
+        ).hexdigest()
+        cache_key = (
+            f'entity_count:{self.__class__.__name__}:'
+            f'{"-".join([str(generations[scope]) for scope in scopes])}:'
+            f'{self.request.user.id}:{params_hash}'
+        )
+        total_count = cache.get(cache_key)
+        if total_count is None:
+            total_count = entities.count()
+            cache.set(cache_key, total_count, settings.API_CACHE_TTL)
+        return total_count
+
+    def generate_cursor_response(self, entities,
+                                 context=None) -> Tuple[dict, dict]:
+        """
+        Return (keyset paginated response, response headers)
+
+        Cursor pagination is used when cursor parameter exists.
+        Empty cursor returns the first page.
+        """
+        cursor = self.request.GET.get('cursor', '')
+        page_size = get_page_size(self.request)
+        include_count = (
+            self.request.GET.get('include_count', 'false').lower() == 'true'
+        )
+        # json or geojson. Default to json
+        format = self.request.GET.get('format', 'json')
+        rows = []
+        next_cursor = None
+        total_count = 0
+        if entities is not None:
+            rows, next_cursor = paginate_by_cursor(
+                entities, page_size, cursor)
+            if include_count:
+                total_count = self.get_total_count(entities)
+        output = (
+            self.get_serializer()(
+                rows,
+                many=True,
+                context=context
+            ).data
+        )
+        metadata = {
+            'page_size': page_size,
+            'next': next_cursor if next_cursor else ''
+        }
+        if include_count:
+            metadata['total_count'] = total_count
+        if format == 'geojson':
+            return output, metadata
+        metadata['results'] = output
+        return metadata, None
+
     def generate_response(self, entities, context=None) -> Tuple[dict, dict]:
         """
         Return (paginated response, response headers)
         """
+        if 'cursor' in self.request.GET:
+            return self.generate_cursor_response(entities, context)
         # pagination parameter
         page = int(self.request.GET.get('page', '1'))
         page_size = get_page_size(self.request)
@@ -938,10 +1329,7 @@ class EntitySearchBase(ApiCache, DatasetDetailCheckPermission):
         entities = entities.filter(
             privacy_level__lte=max_privacy_level
         )
-        if self.search_source == 'Dataset':
-            entities = entities.filter(
-                is_latest=True
-            )
+        entities = self.filter_latest_entities(entities)
         if entity_type:
             entities = entities.filter(
                 type=entity_type.id
@@ -977,9 +1365,10 @@ class EntitySearchBase(ApiCache, DatasetDetailCheckPermission):
 
         entities, max_level, ids, names = self.generate_entity_query(
             entities,
-            str(dataset.uuid),
+            dataset,
             entity_type=entity_type,
-            admin_level=admin_level
+            admin_level=admin_level,
+            use_read_model=dataset.read_model_generated_at is not None
         )
         return self.generate_response(
             entities,
@@ -1057,6 +1446,79 @@ class EntityFuzzySearch(EntitySearchBase):
         search_text = search_text.replace('\x00', '')
         return search_text
 
+    def search_by_names(self, entities, names, search_text):
+        """Search by trigram similarity of each entity name."""
+        similarities = []
+        if names['idx__max'] is not None:
+            for name_idx in range(names['idx__max'] + 1):
+                field_key = f"name_{name_idx}__name"
+                similarities.append(
+                    TrigramWordSimilarity(
+                        F(field_key),
+                        Value(search_text)
+                    )
+                )
+        if len(similarities) == 1:
+            annotation = {
+                'similarity': similarities[0]
+            }
+        elif len(similarities) > 1:
+            annotation = {
+                'similarity': Greatest(
+                    *similarities
+                )
+            }
+        else:
+            annotation = {
+                'similarity': Value(0, output_field=IntegerField())
+            }
+        entities = entities.annotate(**annotation).filter(
+            similarity__gte=self.get_trigram_similarity()
+        ).order_by('-similarity')
+        return entities
+
+    def search_by_document(self, entities, search_text):
+        """
+        Search by entity search document.
+
+        Match either similar word using trigram index or all words
+        using full text search index.
+        The document also contains ancestor labels, so entities whose
+        own label or names match are ranked first.
+        The word similarity threshold is transaction local, hence the
+        query must be evaluated in the transaction that calls
+        set_word_similarity_threshold.
+        """
+        search_text = normalize_search_text(search_text)
+        search_query = SearchQuery(
+            search_text,
+            config=SEARCH_DOCUMENT_TS_CONFIG
+        )
+        name_similarity = EntityName.objects.filter(
+            geographical_entity=OuterRef('pk')
+        ).annotate(
+            name_similarity=TrigramWordSimilarity(
+                search_text,
+                normalize_search_text(F('name'))
+            )
+        ).order_by('-name_similarity').values('name_similarity')[:1]
+        return entities.filter(
+            Q(search_document__document__word_similar=search_text) |
+            Q(search_document__search_vector=search_query)
+        ).annotate(
+            own_similarity=Greatest(
+                TrigramWordSimilarity(
+                    search_text,
+                    normalize_search_text(F('label'))
+                ),
+                Coalesce(Subquery(name_similarity), Value(0.0))
+            ),
+            similarity=TrigramWordSimilarity(
+                search_text,
+                F('search_document__document')
+            )
+        ).order_by('-own_similarity', '-similarity')
+
     def generate_response(self, entities, context=None):
         # pagination parameter
         page = int(self.request.GET.get('page', '1'))
@@ -1101,8 +1563,9 @@ class EntityFuzzySearch(EntitySearchBase):
         tags=[SEARCH_ENTITY_TAG],
         manual_parameters=[
             dataset_uuid_param, search_param, is_latest_param,
-            *common_api_params,
-            geom_param, format_param
+            *common_api_params, *as_of_api_params,
+            geom_param, format_param,
+            *geometry_api_params
         ],
         responses={
             200: openapi.Schema(
@@ -1172,45 +1635,31 @@ class EntityFuzzySearch(EntitySearchBase):
             entities = entities.filter(
                 is_latest=is_latest
             )
+        as_of = self.get_as_of()
+        if as_of:
+            entities = filter_entities_as_of(entities, as_of)
+        # search by names needs the joins to each name index,
+        # search document does not, so the output can use read model
         entities, max_level, ids, names = self.generate_entity_query(
             entities,
-            str(dataset.uuid)
-        )
-        similarities = []
-        if names['idx__max'] is not None:
-            for name_idx in range(names['idx__max'] + 1):
-                field_key = f"name_{name_idx}__name"
-                similarities.append(
-                    TrigramWordSimilarity(
-                        F(field_key),
-                        Value(search_text)
-                    )
-                )
-        if len(similarities) == 1:
-            annotation = {
-                'similarity': similarities[0]
-            }
-        elif len(similarities) > 1:
-            annotation = {
-                'similarity': Greatest(
-                    *similarities
-                )
-            }
-        else:
-            annotation = {
-                'similarity': Value(0, output_field=IntegerField())
-            }
-        entities = entities.annotate(**annotation).filter(
-            similarity__gte=self.get_trigram_similarity()
-        ).order_by('-similarity')
-        return self.generate_response(
-            entities,
-            context={
-                'max_level': max_level,
-                'ids': ids,
-                'names': names
-            }
+            dataset,
+            use_read_model=(
+                dataset.search_document_generated_at is not None and
+                dataset.read_model_generated_at is not None
+            )
         )
+        context = {
+            'max_level': max_level,
+            'ids': ids,
+            'names': names
+        }
+        if not dataset.search_document_generated_at:
+            entities = self.search_by_names(entities, names, search_text)
+            return self.generate_response(entities, context=context)
+        with transaction.atomic():
+            set_word_similarity_threshold(self.get_trigram_similarity())
+            entities = self.search_by_document(entities, search_text)
+            return self.generate_response(entities, context=context)
 
 
 class EntityGeometryFuzzySearch(EntitySearchBase):
@@ -1272,14 +1721,35 @@ class EntityGeometryFuzzySearch(EntitySearchBase):
         # fetch from site preferences
         return SitePreferences.preferences().search_simplify_tolerance
 
-    def generate_query(
+    def get_search_table(self):
+        return 'georepo_geographicalentity'
+
+    def get_search_conditions(self, is_latest, levels, dataset_uuid):
+        conditions = []
+        query_values = []
+        if is_latest is not None:
+            conditions.append('gg.is_latest=%s')
+            query_values.append(is_latest)
+        if levels:
+            conditions.append('gg.level IN %s')
+            query_values.append(tuple(levels))
+        if dataset_uuid:
+            conditions.append('gg.dataset_id IN %s')
+            query_values.append(tuple(
+                Dataset.objects.filter(
+                    uuid=dataset_uuid
+                ).values_list('id', flat=True)
+            ))
+        return conditions, query_values
+
+    def generate_exact_query(
             self,
-            geom,
+            simplified_input,
             is_latest,
             levels,
             dataset_uuid,
             max_privacy_level):
-        simplified_input = geom.simplify(self.get_simplify_tolerance()).ewkt
+        """Compute Hausdorff distance of all intersecting entities."""
         query_values = [
             simplified_input,
             simplified_input,
@@ -1289,27 +1759,17 @@ class EntityGeometryFuzzySearch(EntitySearchBase):
             'SELECT gg.*, parent_0.label as country, '
             'ST_HausdorffDistance(gg.geometry, %s) '
             'AS similarity '
-            'FROM georepo_geographicalentity gg '
+            'FROM {} gg '
             'left join georepo_geographicalentity parent_0 on ( '
             '    parent_0.id = gg.ancestor_id '
             ') '
             'WHERE gg.is_approved AND ST_Intersects(gg.geometry, %s) AND '
             'gg.privacy_level<=%s'
+        ).format(self.get_search_table())
+        conditions, condition_values = self.get_search_conditions(
+            is_latest, levels, dataset_uuid
         )
-        conditions = []
-        if is_latest is not None:
-            conditions.append('gg.is_latest=%s')
-            query_values.append(is_latest)
-        if levels:
-            conditions.append('gg.level IN %s')
-            query_values.append(tuple(levels))
-        if dataset_uuid:
-            conditions.append('gg.dataset_id IN %s')
-            query_values.append(tuple(
-                Dataset.objects.filter(
-                    uuid=dataset_uuid
-                ).values_list('id', flat=True)
-            ))
+        query_values.extend(condition_values)
         if conditions:
             subquery_sql = (
                 subquery_sql + 'AND ' + ' AND '.join(conditions)
@@ -1327,6 +1787,115 @@ class EntityGeometryFuzzySearch(EntitySearchBase):
         )
         return query, query_values
 
+    def generate_query(
+            self,
+            geom,
+            is_latest,
+            levels,
+            dataset_uuid,
+            max_privacy_level):
+        """
+        Generate two-phase search query.
+
+        The first phase reads the simplified geometry with the largest
+        tolerance of each admin level, joined once. It keeps entities
+        whose simplified bbox overlaps the input and ranks them by bbox
+        overlap ratio and area similarity.
+        Entity without simplified geometry falls back to full geometry.
+        The second phase loads the full geometry of the top candidates
+        only to compute the exact Hausdorff distance.
+        Point and line input has no area, so it uses the exact query.
+        """
+        simplified_input = geom.simplify(self.get_simplify_tolerance()).ewkt
+        if geom.dims < 2:
+            return self.generate_exact_query(
+                simplified_input, is_latest, levels,
+                dataset_uuid, max_privacy_level
+            )
+        query_values = [
+            simplified_input,
+            dataset_uuid,
+            max_privacy_level
+        ]
+        candidate_sql = (
+            'SELECT gg.id, gg.label, gg.uuid_revision, gg.type_id, '
+            'gg.level, gg.dataset_id, gg.ancestor_id, '
+            'COALESCE(bbox.overlap_area / NULLIF('
+            '  bbox.area + input.bbox_area - bbox.overlap_area, 0), 0) + '
+            'COALESCE(LEAST(simplified.area, input.area) / NULLIF('
+            '  GREATEST(simplified.area, input.area), 0), 0) AS score '
+            'FROM {} gg '
+            'CROSS JOIN input '
+            'LEFT JOIN tolerance ON tolerance.level = gg.level '
+            'LEFT JOIN georepo_entitysimplified es ON ('
+            '  es.geographical_entity_id = gg.id AND '
+            '  es.simplify_tolerance = tolerance.simplify_tolerance AND '
+            '  es.simplified_geometry IS NOT NULL'
+            ') '
+            'CROSS JOIN LATERAL ('
+            '  SELECT ST_Envelope(COALESCE('
+            '    es.simplified_geometry, gg.geometry)) AS bbox, '
+            '  ST_Area(COALESCE('
+            '    es.simplified_geometry, gg.geometry)) AS area'
+            ') AS simplified '
+            'CROSS JOIN LATERAL ('
+            '  SELECT ST_Area(simplified.bbox) AS area, '
+            '  ST_Area(ST_Intersection('
+            '    simplified.bbox, input.bbox)) AS overlap_area'
+            ') AS bbox '
+            'WHERE gg.is_approved AND gg.privacy_level<=%s AND ('
+            '  es.simplified_geometry && input.bbox OR ('
+            '    es.geographical_entity_id IS NULL AND '
+            '    gg.geometry && input.bbox'
+            '  )'
+            ')'
+        ).format(self.get_search_table())
+        conditions, condition_values = self.get_search_conditions(
+            is_latest, levels, dataset_uuid
+        )
+        query_values.extend(condition_values)
+        if conditions:
+            candidate_sql = (
+                candidate_sql + ' AND ' + ' AND '.join(conditions)
+            )
+        candidate_sql = candidate_sql + ' ORDER BY score DESC LIMIT %s'
+        query_values.append(GEOMETRY_SEARCH_CANDIDATE_LIMIT)
+        query = (
+            'WITH input AS ('
+            '  SELECT t.geom, ST_Envelope(t.geom) AS bbox, '
+            '  ST_Area(ST_Envelope(t.geom)) AS bbox_area, '
+            '  ST_Area(t.geom) AS area '
+            '  FROM (SELECT ST_GeomFromEWKT(%s) AS geom) AS t'
+            '), tolerance AS ('
+            '  SELECT atc.level, '
+            '  MAX(atc.simplify_tolerance) AS simplify_tolerance '
+            '  FROM georepo_adminleveltilingconfig atc '
+            '  INNER JOIN georepo_datasettilingconfig dtc ON '
+            '  dtc.id = atc.dataset_tiling_config_id '
+            '  INNER JOIN georepo_dataset gd ON gd.id = dtc.dataset_id '
+            '  WHERE gd.uuid = %s '
+            '  GROUP BY atc.level'
+            '), candidate AS (' +
+            candidate_sql +
+            ') '
+            'SELECT candidate.id, candidate.label, candidate.uuid_revision,'
+            'candidate.type_id, '
+            'candidate.level, candidate.dataset_id, '
+            'parent_0.label AS country, '
+            'ST_HausdorffDistance(gg.geometry, input.geom) '
+            'AS similarity '
+            'FROM candidate '
+            'INNER JOIN {} gg ON gg.id = candidate.id '
+            'CROSS JOIN input '
+            'left join georepo_geographicalentity parent_0 on ( '
+            '    parent_0.id = candidate.ancestor_id '
+            ') '
+            'WHERE ST_Intersects(gg.geometry, input.geom) '
+            'ORDER BY similarity '
+            'LIMIT 10'
+        ).format(self.get_search_table())
+        return query, query_values
+
     @swagger_auto_schema(auto_schema=None)
     def get(self, request, *args, **kwargs):
         pass
@@ -1336,7 +1905,8 @@ class EntityGeometryFuzzySearch(EntitySearchBase):
         tags=[SEARCH_ENTITY_TAG],
         manual_parameters=[
             dataset_uuid_param, level_param,
-            is_latest_param, geom_param, format_param
+            is_latest_param, geom_param, format_param,
+            *geometry_api_params
         ],
         request_body=geojson_body,
         responses={
@@ -1420,7 +1990,7 @@ class EntityGeometryFuzzySearch(EntitySearchBase):
         )
         entities, max_level, ids, names = self.generate_entity_query(
             entities,
-            str(dataset.uuid)
+            dataset
         )
         if format == 'geojson':
             output = GeographicalGeojsonSerializer(
@@ -1473,7 +2043,7 @@ class EntityGeometryFuzzySearch(EntitySearchBase):
                         'e.g. Sub district -> Sub_district'
                     ),
                     type=openapi.TYPE_STRING
-                ), *common_api_params, openapi.Parameter(
+                ), *common_api_params, *cursor_api_params, openapi.Parameter(
                     'geom', openapi.IN_QUERY,
                     description=(
                         'Geometry format: '
@@ -1488,7 +2058,7 @@ class EntityGeometryFuzzySearch(EntitySearchBase):
                     type=openapi.TYPE_STRING,
                     default='json',
                     required=False
-                )],
+                ), *geometry_api_params, *as_of_api_params],
                 responses={
                     200: openapi.Schema(
                         title='Entity List',
@@ -1582,7 +2152,7 @@ class EntityList(EntitySearchBase):
                     'ucode', openapi.IN_PATH,
                     description='Entity Root UCode',
                     type=openapi.TYPE_STRING
-                ), *common_api_params, openapi.Parameter(
+                ), *common_api_params, *cursor_api_params, openapi.Parameter(
                     'geom', openapi.IN_QUERY,
                     description=(
                         'Geometry format: '
@@ -1597,7 +2167,7 @@ class EntityList(EntitySearchBase):
                     type=openapi.TYPE_STRING,
                     default='json',
                     required=False
-                )],
+                ), *geometry_api_params, *as_of_api_params],
                 responses={
                     200: openapi.Schema(
                         title='Entity List',
@@ -1686,7 +2256,7 @@ class EntityListByUCode(EntitySearchBase):
                         'Admin level of the entity'
                     ),
                     type=openapi.TYPE_INTEGER
-                ), *common_api_params, openapi.Parameter(
+                ), *common_api_params, *cursor_api_params, openapi.Parameter(
                     'geom', openapi.IN_QUERY,
                     description=(
                         'Geometry format: '
@@ -1701,7 +2271,7 @@ class EntityListByUCode(EntitySearchBase):
                     type=openapi.TYPE_STRING,
                     default='json',
                     required=False
-                )],
+                ), *geometry_api_params, *as_of_api_params],
                 responses={
                     200: openapi.Schema(
                         title='Entity List',
@@ -1792,7 +2362,7 @@ class EntityListByAdminLevel(EntitySearchBase):
                     'ucode', openapi.IN_PATH,
                     description='Entity Root UCode',
                     type=openapi.TYPE_STRING
-                ), *common_api_params, openapi.Parameter(
+                ), *common_api_params, *cursor_api_params, openapi.Parameter(
                     'geom', openapi.IN_QUERY,
                     description=(
                         'Geometry format: '
@@ -1807,7 +2377,7 @@ class EntityListByAdminLevel(EntitySearchBase):
                     type=openapi.TYPE_STRING,
                     default='json',
                     required=False
-                )],
+                ), *geometry_api_params, *as_of_api_params],
                 responses={
                     200: openapi.Schema(
                         title='Entity List',
@@ -1917,7 +2487,7 @@ class EntityListByAdminLevelAndUCode(EntitySearchBase):
                     type=openapi.TYPE_STRING,
                     default='json',
                     required=False
-                )],
+                ), *geometry_api_params],
                 responses={
                     200: openapi.Schema(
                         title='Entity List',
@@ -2011,15 +2581,8 @@ class FindEntityById(EntitySearchBase):
             if not timestamp:
                 # invalid timestamp value
                 return self.generate_response(None)
-            entities = entities.filter(
-                start_date__lte=timestamp
-            ).filter(
-                Q(end_date__isnull=True) | Q(end_date__gt=timestamp)
-            )
-        if self.search_source == 'Dataset':
-            entities = entities.filter(
-                is_latest=True
-            )
+            entities = filter_entities_as_of(entities, timestamp)
+        entities = self.filter_latest_entities(entities)
         if id_type in MAIN_ENTITY_ID_LIST:
             if id_type == UUID_ENTITY_ID:
                 uuid_val = get_uuid_value(id_value)
@@ -2051,7 +2614,7 @@ class FindEntityById(EntitySearchBase):
 
         entities, max_level, ids, names = self.generate_entity_query(
             entities,
-            str(dataset.uuid)
+            dataset
         )
         if id_type not in MAIN_ENTITY_ID_LIST:
             searched_id = (
@@ -2074,6 +2637,238 @@ class FindEntityById(EntitySearchBase):
         )
 
 
+class EntityBatchLookup(EntitySearchBase):
+    """
+    Find geographical entities in dataset by list of ID
+
+    Given list of identifier values with type {id_type} in the payload, \
+        return geographical entity detail that has each identifier.
+    For {id_type} list can be retrieved from API id-type-list
+
+    The result is keyed by the input id, the value is the list of \
+        entities with the identifier or null if the id is not found.
+
+    Example request:
+    ```
+    POST /search/dataset/{uuid}/entity/batch/identifier/ucode/
+    Request Content-type: application/json
+    Request Body: {"ids": ["PAK_V1", "PAK_0001_V1"]}
+    ```
+    """
+    # input ids are only read from the POST payload
+    http_method_names = ['post']
+    renderer_classes = [FastJSONRenderer]
+    ids_body = openapi.Schema(
+        description=(
+            f'List of entity id value, maximum {BATCH_LOOKUP_MAX_IDS} ids'
+        ),
+        type=openapi.TYPE_OBJECT,
+        properties={
+            'ids': openapi.Schema(
+                type=openapi.TYPE_ARRAY,
+                items=openapi.Schema(type=openapi.TYPE_STRING)
+            )
+        }
+    )
+
+    def get_serializer(self):
+        if getattr(self, 'swagger_fake_view', False):
+            return None
+        return GeographicalEntitySerializer
+
+    def get_input_ids(self, request) -> List[str]:
+        ids = (
+            request.data.get('ids', None) if
+            isinstance(request.data, dict) else None
+        )
+        if not isinstance(ids, list) or not all(
+                isinstance(id, (str, int)) for id in ids):
+            raise ValueError('ids should be a list of id value')
+        if len(ids) > BATCH_LOOKUP_MAX_IDS:
+            raise ValueError(
+                f'Maximum number of ids is {BATCH_LOOKUP_MAX_IDS}.'
+            )
+        # remove duplicate ids, keep the input order
+        return list(dict.fromkeys([str(id) for id in ids]))
+
+    def add_lookup_key(self, key, id_value: str):
+        self.lookup_keys.setdefault(key, []).append(id_value)
+
+    def filter_by_ids(self, entities, id_type: str, id_values: List[str]):
+        """
+        Filter entities that have any of the ids.
+
+        Fill lookup_keys with the normalized key of each id and set
+        get_row_key to read the key from the entity row.
+        """
+        if id_type in [UUID_ENTITY_ID, CONCEPT_UUID_ENTITY_ID]:
+            field = (
+                'uuid_revision' if id_type == UUID_ENTITY_ID else 'uuid'
+            )
+            for id_value in id_values:
+                uuid_val = get_uuid_value(id_value)
+                if uuid_val:
+                    self.add_lookup_key(str(uuid_val), id_value)
+            self.get_row_key = lambda row: str(row[field])
+            return entities.filter(**{
+                f'{field}__any': list(self.lookup_keys.keys())
+            })
+        if id_type in [CODE_ENTITY_ID, CONCEPT_UCODE_ENTITY_ID]:
+            field = (
+                'internal_code' if id_type == CODE_ENTITY_ID else
+                'concept_ucode'
+            )
+            for id_value in id_values:
+                self.add_lookup_key(id_value, id_value)
+            self.get_row_key = lambda row: row[field]
+            return entities.filter(**{
+                f'{field}__any': id_values
+            })
+        if id_type == UCODE_ENTITY_ID:
+            ucodes = set()
+            for id_value in id_values:
+                try:
+                    ucode, version = parse_unique_code(id_value)
+                except ValueError:
+                    continue
+                ucodes.add(ucode)
+                self.add_lookup_key(
+                    get_unique_code(ucode, version), id_value)
+            # filter by ucode, then match the version from the row key
+            self.get_row_key = lambda row: get_unique_code(
+                row['unique_code'], row['unique_code_version'])
+            return entities.filter(
+                unique_code__any=list(ucodes)
+            )
+        id_type_obj = IdType.objects.filter(name__iexact=id_type).first()
+        if id_type_obj is None:
+            return None
+        for id_value in id_values:
+            self.add_lookup_key(id_value, id_value)
+        self.get_row_key = lambda row: row['lookup_id']
+        return entities.annotate(
+            lookup_ids=FilteredRelation(
+                'entity_ids',
+                condition=Q(entity_ids__code=id_type_obj)
+            )
+        ).filter(
+            lookup_ids__value__any=id_values
+        )
+
+    def get_response_data(self, request, *args, **kwargs):
+        # get dataset by uuid
+        dataset, max_privacy_level = self.get_dataset_obj(
+            request, kwargs, self.search_source
+        )
+        id_type = kwargs.get('id_type', None)
+        id_type = id_type.lower() if id_type else None
+        self.lookup_keys = {}
+        entities = GeographicalEntity.objects.filter(
+            dataset=dataset,
+            is_approved=True,
+            privacy_level__lte=max_privacy_level
+        )
+        entities = self.filter_latest_entities(entities)
+        entities = self.filter_by_ids(entities, id_type, self.input_ids)
+        if entities is None:
+            return self.generate_response(None)
+        entities, max_level, ids, names = self.generate_entity_query(
+            entities,
+            dataset,
+            use_read_model=dataset.read_model_generated_at is not None
+        )
+        if id_type not in MAIN_ENTITY_ID_LIST:
+            entities = entities.annotate(
+                lookup_id=F('lookup_ids__value')
+            )
+        return self.generate_response(
+            entities,
+            context={
+                'max_level': max_level,
+                'ids': ids,
+                'names': names
+            }
+        )
+
+    def generate_response(self, entities, context=None):
+        """
+        Return (results keyed by input id, response headers)
+        """
+        results = {id_value: None for id_value in self.input_ids}
+        if entities is None:
+            return {
+                'results': results
+            }, None
+        rows = []
+        row_ids = []
+        for row in entities.iterator():
+            id_values = self.lookup_keys.get(self.get_row_key(row), [])
+            if not id_values:
+                continue
+            rows.append(row)
+            row_ids.append(id_values)
+        output = self.get_serializer()(
+            rows,
+            many=True,
+            context=context
+        ).data
+        for item, id_values in zip(output, row_ids):
+            for id_value in id_values:
+                if results[id_value] is None:
+                    results[id_value] = []
+                results[id_value].append(item)
+        return {
+            'results': results
+        }, None
+
+    @swagger_auto_schema(
+        operation_id='search-entity-by-id-batch',
+        tags=[SEARCH_ENTITY_TAG],
+        manual_parameters=[openapi.Parameter(
+            'uuid', openapi.IN_PATH,
+            description='Dataset UUID', type=openapi.TYPE_STRING
+        ), openapi.Parameter(
+            'id_type', openapi.IN_PATH,
+            description=(
+                'Entity ID Type; The list is available '
+                'from API id-type-list'
+            ),
+            type=openapi.TYPE_STRING
+        ), openapi.Parameter(
+            'geom', openapi.IN_QUERY,
+            description=(
+                'Geometry format: '
+                '[no_geom, centroid, full_geom]'
+            ),
+            type=openapi.TYPE_STRING,
+            default='no_geom',
+            required=False
+        ), *geometry_api_params],
+        request_body=ids_body,
+        responses={
+            200: openapi.Schema(type=openapi.TYPE_OBJECT),
+            400: APIErrorSerializer
+        }
+    )
+    def post(self, request, *args, **kwargs):
+        try:
+            self.input_ids = self.get_input_ids(request)
+        except ValueError as ex:
+            return Response(
+                status=400,
+                data=APIErrorSerializer({
+                    'detail': str(ex)
+                }).data
+            )
+        response_data, response_headers = self.get_response_data(
+            request, *args, **kwargs
+        )
+        return Response(
+            response_data,
+            headers=response_headers
+        )
+
+
 class FindEntityVersionsByConceptUCode(EntitySearchBase):
     """
     Find all revision of geographical entities in dataset by Concept UCode
@@ -2123,7 +2918,7 @@ class FindEntityVersionsByConceptUCode(EntitySearchBase):
             type=openapi.TYPE_STRING,
             default='json',
             required=False
-        )],
+        ), *geometry_api_params],
         responses={
             200: openapi.Schema(
                 title='Entity List',
@@ -2229,14 +3024,10 @@ class FindEntityVersionsByConceptUCode(EntitySearchBase):
             if not timestamp:
                 # invalid timestamp value
                 return self.generate_response(None)
-            entities = entities.filter(
-                start_date__lte=timestamp
-            ).filter(
-                Q(end_date__isnull=True) | Q(end_date__gt=timestamp)
-            )
+            entities = filter_entities_as_of(entities, timestamp)
         entities, max_level, ids, names = self.generate_entity_query(
             entities,
-            str(dataset.uuid)
+            dataset
         )
         return self.generate_response(
             entities,
@@ -2297,7 +3088,7 @@ class FindEntityVersionsByUCode(FindEntityVersionsByConceptUCode):
             type=openapi.TYPE_STRING,
             default='json',
             required=False
-        )],
+        ), *geometry_api_params],
         responses={
             200: openapi.Schema(
                 title='Entity List',
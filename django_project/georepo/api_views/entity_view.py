@@ -1,8 +1,7 @@
 import json
 from rest_framework.views import APIView
-from django.db import connection
+from django.db.models import OuterRef
 from django.db.models.expressions import RawSQL
-from django.db.models import FilteredRelation, Q
 from django.http import Http404
 from django.core.exceptions import PermissionDenied
 from rest_framework.response import Response
@@ -16,6 +15,7 @@ from georepo.utils.permission import (
 )
 from georepo.api_views.entity import (
     FindEntityById,
+    EntityBatchLookup,
     EntityListByAdminLevel,
     EntityListByAdminLevelAndUCode,
     EntityList,
@@ -25,6 +25,7 @@ from georepo.api_views.entity import (
     EntityFuzzySearch,
     EntityGeometryFuzzySearch,
     EntityContainmentCheck,
+    EntityPointLookup,
     EntitySearchBase
 )
 from georepo.models.dataset import Dataset
@@ -40,23 +41,32 @@ from georepo.models.entity import (
 )
 from georepo.models.id_type import IdType
 from georepo.models.dataset_view import DatasetView
+from georepo.models.dataset_view_tile_config import (
+    ViewAdminLevelTilingConfig
+)
 from georepo.serializers.common import APIErrorSerializer
 from georepo.serializers.entity import (
     GeographicalEntitySerializer,
     SearchGeometrySerializer,
     SearchEntitySerializer
 )
-from georepo.utils.unique_code import (
-    parse_unique_code,
-    get_unique_code
-)
+from georepo.utils.unique_code import parse_unique_code
+from georepo.utils.entity_tree import build_entity_tree
 from georepo.utils.uuid_helper import get_uuid_value
 from georepo.utils.geojson import validate_geojson
+from georepo.utils.renderers import FastJSONRenderer
+from georepo.utils.dataset_view import view_entity_ids_sql
+from georepo.utils.geometry_metrics import get_entity_bbox
 from georepo.api_views.api_collections import (
     SEARCH_VIEW_ENTITY_TAG,
     OPERATION_VIEW_ENTITY_TAG
 )
-from georepo.utils.api_parameters import common_api_params
+from georepo.utils.api_parameters import (
+    common_api_params,
+    cursor_api_params,
+    geometry_api_params,
+    as_of_api_params
+)
 
 
 class DatasetViewDetailCheckPermission(object):
@@ -106,6 +116,7 @@ class DatasetViewSearchBase(object):
             if not dataset_view.dataset.module.is_active:
                 raise Http404
             self.check_object_permissions(request, dataset_view)
+            self.dataset_view = dataset_view
             kwargs['uuid'] = str(dataset_view.dataset.uuid)
             kwargs['view_uuid'] = str(dataset_view.uuid)
         except DatasetView.DoesNotExist:
@@ -114,12 +125,29 @@ class DatasetViewSearchBase(object):
             request, *args, **kwargs
         )
 
+    def get_zoom_tolerances(self, dataset, zoom: int):
+        view_tolerances = ViewAdminLevelTilingConfig.objects.filter(
+            view_tiling_config__dataset_view__uuid=self.kwargs.get('uuid'),
+            view_tiling_config__zoom_level=zoom
+        )
+        if not view_tolerances.exists():
+            # view without tiling config uses dataset tiling config
+            return super(DatasetViewSearchBase, self).get_zoom_tolerances(
+                dataset, zoom
+            )
+        return view_tolerances.filter(
+            level=OuterRef(OuterRef('level'))
+        ).values('simplify_tolerance')[:1]
+
     def generate_response(self, entities, context=None):
         if entities is not None:
+            dataset_view = getattr(self, 'dataset_view', None)
+            if dataset_view is None:
+                dataset_view = DatasetView.objects.get(
+                    uuid=self.kwargs.get('uuid')
+                )
             # raw_sql to view to select id
-            raw_sql = (
-                'SELECT id from "{}"'
-            ).format(str(self.kwargs.get('uuid')))
+            raw_sql = view_entity_ids_sql(dataset_view)
             # Query existing entities with uuids found in views
             entities = entities.filter(
                 id__in=RawSQL(raw_sql, [])
@@ -174,7 +202,7 @@ class FindViewEntityById(DatasetViewSearchBase, FindEntityById):
             ),
             type=openapi.TYPE_STRING,
             required=False
-        ), *common_api_params, openapi.Parameter(
+        ), *common_api_params, *cursor_api_params, openapi.Parameter(
             'geom', openapi.IN_QUERY,
             description=(
                 'Geometry format: '
@@ -189,7 +217,7 @@ class FindViewEntityById(DatasetViewSearchBase, FindEntityById):
             type=openapi.TYPE_STRING,
             default='json',
             required=False
-        )],
+        ), *geometry_api_params, *as_of_api_params],
         responses={
             200: openapi.Schema(
                 title='Entity List',
@@ -240,6 +268,60 @@ class FindViewEntityById(DatasetViewSearchBase, FindEntityById):
         )
 
 
+class ViewEntityBatchLookup(DatasetViewSearchBase, EntityBatchLookup):
+    """
+    Find geographical entities in view by list of ID
+
+    Given list of identifier values with type {id_type} in the payload, \
+        return geographical entity detail that has each identifier.
+    For {id_type} list can be retrieved from API id-type-list
+
+    The result is keyed by the input id, the value is the list of \
+        entities with the identifier or null if the id is not found.
+
+    Example request:
+    ```
+    POST /search/view/{uuid}/entity/batch/identifier/ucode/
+    Request Content-type: application/json
+    Request Body: {"ids": ["PAK_V1", "PAK_0001_V1"]}
+    ```
+    """
+
+    @swagger_auto_schema(
+        operation_id='search-view-entity-by-id-batch',
+        tags=[SEARCH_VIEW_ENTITY_TAG],
+        manual_parameters=[openapi.Parameter(
+            'uuid', openapi.IN_PATH,
+            description='View UUID', type=openapi.TYPE_STRING
+        ), openapi.Parameter(
+            'id_type', openapi.IN_PATH,
+            description=(
+                'Entity ID Type; The list is available '
+                'from API id-type-list'
+            ),
+            type=openapi.TYPE_STRING
+        ), openapi.Parameter(
+            'geom', openapi.IN_QUERY,
+            description=(
+                'Geometry format: '
+                '[no_geom, centroid, full_geom]'
+            ),
+            type=openapi.TYPE_STRING,
+            default='no_geom',
+            required=False
+        ), *geometry_api_params],
+        request_body=EntityBatchLookup.ids_body,
+        responses={
+            200: openapi.Schema(type=openapi.TYPE_OBJECT),
+            400: APIErrorSerializer
+        }
+    )
+    def post(self, request, *args, **kwargs):
+        return super(ViewEntityBatchLookup, self).post(
+            request, *args, **kwargs
+        )
+
+
 class ViewEntityListByAdminLevel0(DatasetViewSearchBase,
                                   EntityListByAdminLevel):
     """
@@ -274,7 +356,7 @@ class ViewEntityListByAdminLevel0(DatasetViewSearchBase,
         manual_parameters=[openapi.Parameter(
             'uuid', openapi.IN_PATH,
             description='View UUID', type=openapi.TYPE_STRING
-        ), *common_api_params, openapi.Parameter(
+        ), *common_api_params, *cursor_api_params, openapi.Parameter(
             'geom', openapi.IN_QUERY,
             description=(
                 'Geometry format: '
@@ -289,7 +371,7 @@ class ViewEntityListByAdminLevel0(DatasetViewSearchBase,
             type=openapi.TYPE_STRING,
             default='json',
             required=False
-        )],
+        ), *geometry_api_params, *as_of_api_params],
         responses={
             200: openapi.Schema(
                 title='Entity List',
@@ -385,7 +467,7 @@ class ViewEntityListByAdminLevel(DatasetViewSearchBase,
                 'Admin level of the entity'
             ),
             type=openapi.TYPE_INTEGER
-        ), *common_api_params, openapi.Parameter(
+        ), *common_api_params, *cursor_api_params, openapi.Parameter(
             'geom', openapi.IN_QUERY,
             description=(
                 'Geometry format: '
@@ -400,7 +482,7 @@ class ViewEntityListByAdminLevel(DatasetViewSearchBase,
             type=openapi.TYPE_STRING,
             default='json',
             required=False
-        )],
+        ), *geometry_api_params, *as_of_api_params],
         responses={
             200: openapi.Schema(
                 title='Entity List',
@@ -495,7 +577,7 @@ class ViewEntityListByAdminLevelAndUCode(
             'ucode', openapi.IN_PATH,
             description='Entity Root UCode',
             type=openapi.TYPE_STRING
-        ), *common_api_params, openapi.Parameter(
+        ), *common_api_params, *cursor_api_params, openapi.Parameter(
             'geom', openapi.IN_QUERY,
             description=(
                 'Geometry format: '
@@ -510,7 +592,7 @@ class ViewEntityListByAdminLevelAndUCode(
             type=openapi.TYPE_STRING,
             default='json',
             required=False
-        )],
+        ), *geometry_api_params, *as_of_api_params],
         responses={
             200: openapi.Schema(
                 title='Entity List',
@@ -606,7 +688,7 @@ class ViewEntityListByAdminLevelAndConceptUCode(
             'concept_ucode', openapi.IN_PATH,
             description='Entity Root Concept UCode',
             type=openapi.TYPE_STRING
-        ), *common_api_params, openapi.Parameter(
+        ), *common_api_params, *cursor_api_params, openapi.Parameter(
             'geom', openapi.IN_QUERY,
             description=(
                 'Geometry format: '
@@ -621,7 +703,7 @@ class ViewEntityListByAdminLevelAndConceptUCode(
             type=openapi.TYPE_STRING,
             default='json',
             required=False
-        )],
+        ), *geometry_api_params, *as_of_api_params],
         responses={
             200: openapi.Schema(
                 title='Entity List',
@@ -715,7 +797,7 @@ class ViewEntityListByEntityType(
                 'e.g. Sub district -> Sub_district'
             ),
             type=openapi.TYPE_STRING
-        ), *common_api_params, openapi.Parameter(
+        ), *common_api_params, *cursor_api_params, openapi.Parameter(
             'geom', openapi.IN_QUERY,
             description=(
                 'Geometry format: '
@@ -730,7 +812,7 @@ class ViewEntityListByEntityType(
             type=openapi.TYPE_STRING,
             default='json',
             required=False
-        )],
+        ), *geometry_api_params, *as_of_api_params],
         responses={
             200: openapi.Schema(
                 title='Entity List',
@@ -844,7 +926,7 @@ class ViewEntityListByEntityTypeAndUcode(
             type=openapi.TYPE_STRING,
             default='json',
             required=False
-        )],
+        ), *geometry_api_params],
         responses={
             200: openapi.Schema(
                 title='Entity List',
@@ -946,7 +1028,7 @@ class ViewFindEntityVersionsByConceptUCode(
             type=openapi.TYPE_STRING,
             default='json',
             required=False
-        )],
+        ), *geometry_api_params],
         responses={
             200: openapi.Schema(
                 title='Entity List',
@@ -1048,7 +1130,7 @@ class ViewFindEntityVersionsByUCode(
             type=openapi.TYPE_STRING,
             default='json',
             required=False
-        )],
+        ), *geometry_api_params],
         responses={
             200: openapi.Schema(
                 title='Entity List',
@@ -1131,7 +1213,7 @@ class ViewFindEntityFuzzySearch(
             type=openapi.TYPE_BOOLEAN,
             default=True,
             required=False
-        ), *common_api_params, openapi.Parameter(
+        ), *common_api_params, *as_of_api_params, openapi.Parameter(
             'geom', openapi.IN_QUERY,
             description=(
                 'Geometry format: '
@@ -1146,7 +1228,7 @@ class ViewFindEntityFuzzySearch(
             type=openapi.TYPE_STRING,
             default='json',
             required=False
-        )],
+        ), *geometry_api_params],
         responses={
             200: openapi.Schema(
                 title='Entity List',
@@ -1231,54 +1313,13 @@ class ViewFindEntityGeometryFuzzySearch(
     ```
     """
 
-    def generate_query(
-            self,
-            geom,
-            is_latest,
-            levels,
-            dataset_uuid,
-            max_privacy_level):
+    def get_search_table(self):
         view_uuid = self.kwargs.get('uuid', None)
-        simplified_input = geom.simplify(self.get_simplify_tolerance()).ewkt
-        query_values = [
-            simplified_input,
-            simplified_input,
-            max_privacy_level
-        ]
-        subquery_sql = (
-            'SELECT gg.*, parent_0.label as country, '
-            'ST_HausdorffDistance(gg.geometry, %s) '
-            'AS similarity '
-            'FROM "{}" gg '
-            'left join georepo_geographicalentity parent_0 on ( '
-            '    parent_0.id = gg.ancestor_id '
-            ') '
-            'WHERE gg.is_approved AND ST_Intersects(gg.geometry, %s) AND '
-            'gg.privacy_level<=%s'
-        ).format(str(view_uuid))
-        conditions = []
-        if is_latest is not None:
-            conditions.append('gg.is_latest=%s')
-            query_values.append(is_latest)
-        if levels:
-            conditions.append('gg.level IN %s')
-            query_values.append(tuple(levels))
-        if conditions:
-            subquery_sql = (
-                subquery_sql + 'AND ' + ' AND '.join(conditions)
-            )
-        query = (
-            'SELECT search.id, search.label, search.uuid_revision,'
-            'search.type_id, '
-            'search.level, search.dataset_id, search.country, '
-            'search.similarity '
-            'FROM (' +
-            subquery_sql +
-            ') as search '
-            'ORDER BY search.similarity '
-            'LIMIT 10'
-        )
-        return query, query_values
+        return '"{}"'.format(str(view_uuid))
+
+    def get_search_conditions(self, is_latest, levels, dataset_uuid):
+        # entities are already filtered by the view
+        return super().get_search_conditions(is_latest, levels, None)
 
     @swagger_auto_schema(
         operation_id='search-view-entity-by-geometry',
@@ -1312,7 +1353,7 @@ class ViewFindEntityGeometryFuzzySearch(
             type=openapi.TYPE_STRING,
             default='json',
             required=False
-        )],
+        ), *geometry_api_params],
         request_body=openapi.Schema(
             description='Geometry data (SRID 4326) in geojson format',
             type=openapi.TYPE_STRING
@@ -1391,6 +1432,7 @@ class ViewEntityBoundingBox(APIView, DatasetViewDetailCheckPermission):
     ```
     """
     permission_classes = [DatasetViewDetailAccessPermission]
+    renderer_classes = [FastJSONRenderer]
     uuid_param = openapi.Parameter(
         'uuid', openapi.IN_PATH,
         description='View UUID',
@@ -1433,18 +1475,16 @@ class ViewEntityBoundingBox(APIView, DatasetViewDetailCheckPermission):
             request, kwargs.get('uuid', None)
         )
         # raw_sql to view to select id
-        raw_sql = (
-            'SELECT id from "{}"'
-        ).format(str(dataset_view.uuid))
+        raw_sql = view_entity_ids_sql(dataset_view)
         req_label = kwargs.get('id_type', '').lower()
         req_id = kwargs.get('id', '')
-        geom = None
+        bbox = None
         if req_label in MAIN_ENTITY_ID_LIST:
             entity = GeographicalEntity.objects.filter(
                 is_approved=True,
                 dataset=dataset_view.dataset,
                 privacy_level__lte=max_privacy_level
-            )
+            ).defer('geometry')
             # Query existing entity with uuids found in views
             entity = entity.filter(
                 id__in=RawSQL(raw_sql, [])
@@ -1483,7 +1523,7 @@ class ViewEntityBoundingBox(APIView, DatasetViewDetailCheckPermission):
                 )
             entity = entity.last()
             if entity:
-                geom = entity.geometry
+                bbox = get_entity_bbox(entity)
         else:
             entity_id = EntityId.objects.filter(
                 code__name__iexact=req_label,
@@ -1498,13 +1538,15 @@ class ViewEntityBoundingBox(APIView, DatasetViewDetailCheckPermission):
             )
             entity_id = entity_id.select_related(
                 'geographical_entity'
+            ).defer(
+                'geographical_entity__geometry'
             ).order_by('geographical_entity__id').last()
             if entity_id:
-                geom = entity_id.geographical_entity.geometry
-        if not geom:
+                bbox = get_entity_bbox(entity_id.geographical_entity)
+        if not bbox:
             raise Http404('No GeographicalEntity matches the given query.')
         return Response(
-            geom.extent
+            bbox
         )
 
 
@@ -1583,7 +1625,7 @@ class ViewEntityContainmentCheck(EntityContainmentCheck,
     )
 
     def get_id_value(self, id_type, results, is_hierarchical, dataset_view,
-                     max_privacy_level):
+                     max_privacy_level, trees=None):
         if not results:
             return []
         idx = 0
@@ -1598,18 +1640,20 @@ class ViewEntityContainmentCheck(EntityContainmentCheck,
         if is_hierarchical:
             hierarchical_list = []
             id_idx = 1 if isinstance(id_type, IdType) else 0
+            if trees is None:
+                trees = self.entities_code(
+                    [result[id_idx] for result in results if result[idx]],
+                    id_type,
+                    dataset_view,
+                    max_privacy_level
+                )
             for result in results:
                 geo_id = result[id_idx]
                 id_key = result[idx]
                 if not id_key:
                     continue
                 hierarchy = {
-                    str(id_key): self.entities_code(
-                        geo_id,
-                        id_type,
-                        dataset_view,
-                        max_privacy_level
-                    )
+                    str(id_key): trees[geo_id]
                 }
                 hierarchical_list.append(
                     hierarchy
@@ -1629,164 +1673,41 @@ class ViewEntityContainmentCheck(EntityContainmentCheck,
             max_privacy_level,
             admin_level: str = None,
             entity_type: EntityType = None) -> list:
-        query_values = [
-            dataset.id
-        ]
-        query = (
-            'SELECT ' + ('gi.value, ' if isinstance(id_type, IdType) else '')
-        )
-        query = (
-            query +
-            "gg.id, gg.unique_code || '_V' || CASE WHEN "
-            'gg.unique_code_version IS NULL THEN 1 ELSE '
-            'gg.unique_code_version END, '
-            'gg.uuid, gg.internal_code '
-            'FROM georepo_geographicalentity gg '
-        )
-        if isinstance(id_type, IdType):
-            # should query from EntityId
-            query = (
-                query + 'LEFT JOIN georepo_entityid gi '
-                '  ON gi.geographical_entity_id = gg.id '
-                'LEFT JOIN georepo_idtype gc '
-                '  ON gi.code_id = gc.id '
-            )
-            query_values.append(return_type)
-        query = (
-            query +
-            'INNER JOIN georepo_entitytype ge '
-            '  ON gg.type_id = ge.id '
-            'WHERE gg.dataset_id = %s AND ' +
-            ('gc.name ilike %s AND ' if isinstance(id_type, IdType) else '')
+        results = self.do_run_batch_query(
+            return_type,
+            id_type,
+            dataset,
+            spatial_query,
+            dwithin_distance,
+            [geom],
+            max_privacy_level,
+            admin_level,
+            entity_type,
+            dataset_view=dataset_view
         )
+        return results.get(0, [])
 
-        if entity_type is None and admin_level is None:
-            # search only in level 0 and return hierarchical
-            query = (
-                query + 'gg.level = 0 AND '
-            )
-        elif entity_type is not None:
-            query = (
-                query + 'ge.id = %s AND '
-            )
-            query_values.append(entity_type.id)
-        else:
-            query = (
-                query + 'gg.level = %s AND '
-            )
-            query_values.append(admin_level)
-        query_values.append(max_privacy_level)
-        query_values.append(geom.ewkt)
-        if spatial_query == 'ST_Intersects':
-            spatial_params = 'ST_Intersects(%s, gg.geometry)'
-        elif spatial_query == 'ST_Within':
-            spatial_params = 'ST_Within(%s, gg.geometry)'
-        elif spatial_query == 'ST_Within(ST_Centroid)':
-            spatial_params = 'ST_Within(ST_Centroid(%s), gg.geometry)'
-        elif spatial_query == 'ST_DWithin':
-            spatial_params = 'ST_DWithin(%s, gg.geometry, %s)'
-            query_values.append(dwithin_distance)
-        view_sql = (
-            'gg.id IN (SELECT id from "{}") AND '
-        ).format(str(dataset_view.uuid))
-        query = (
-            query +
-            'gg.is_approved=true AND gg.privacy_level<=%s AND ' +
-            view_sql +
-            f'{ spatial_params } '
-        )
-        if isinstance(id_type, IdType):
-            query = (
-                query +
-                'GROUP BY gi.value, gg.id '
-                'ORDER BY gi.value'
-            )
-        else:
-            query = (
-                query +
-                'GROUP BY gg.id '
-                'ORDER BY gg.id'
-            )
-        rows = []
-        with connection.cursor() as cursor:
-            cursor.execute(query, query_values)
-            rows = cursor.fetchall()
-        return [row for row in rows]
-
-    def entities_code(self, parent_entity_id, id_type, dataset_view,
+    def entities_code(self, parent_entity_ids, id_type, dataset_view,
                       max_privacy_level):
-        codes = []
-        # initial fields to select
-        values = [
-            'id', 'internal_code', 'unique_code', 'uuid',
-            'uuid_revision', 'unique_code_version'
-        ]
+        """Return dict of parent entity id to its hierarchy codes."""
         entities = GeographicalEntity.objects.filter(
-            parent__id=parent_entity_id,
             is_approved=True,
-            is_latest=True,
             privacy_level__lte=max_privacy_level
         ).order_by('id')
         # raw_sql to view to select id
-        raw_sql = (
-            'SELECT id from "{}"'
-        ).format(str(dataset_view.uuid))
+        raw_sql = view_entity_ids_sql(dataset_view)
         # Query existing entities with uuids found in views
         entities = entities.filter(
             id__in=RawSQL(raw_sql, [])
         )
-        if isinstance(id_type, IdType):
-            annotations = {
-                'selected_id': FilteredRelation(
-                    'entity_ids',
-                    condition=Q(entity_ids__code__id=id_type.id)
-                )
-            }
-            entities = entities.annotate(**annotations)
-            values.append('selected_id__value')
-        entities = entities.values(*values).iterator()
-        for entity in entities:
-            key = None
-            entity_id = entity.get('id', None)
-            if isinstance(id_type, IdType):
-                key = entity.get('selected_id__value', None)
-            elif id_type == UUID_ENTITY_ID:
-                key = entity.get('uuid_revision', None)
-            elif id_type == CONCEPT_UUID_ENTITY_ID:
-                key = entity.get('uuid', None)
-            elif id_type == CODE_ENTITY_ID:
-                key = entity.get('internal_code', None)
-            elif id_type == UCODE_ENTITY_ID:
-                key_1 = entity.get('unique_code', None)
-                key_2 = entity.get('unique_code_version', 1)
-                if key_1:
-                    key = get_unique_code(key_1, key_2)
-            if not key or not entity_id:
-                continue
-            count_child_sql = (
-                'SELECT count(*) '
-                'FROM "{}" gg '
-                'INNER JOIN georepo_geographicalentity parent '
-                '  ON parent.id=gg.parent_id '
-                'WHERE parent.id=%s AND gg.is_approved=true '
-                'AND gg.privacy_level<=%s'
-            ).format(str(dataset_view.uuid))
-            with connection.cursor() as cursor:
-                cursor.execute(count_child_sql,
-                               [entity['id'], max_privacy_level])
-                total_child_count = cursor.fetchone()[0]
-            if total_child_count > 0:
-                codes.append({
-                    str(key): self.entities_code(
-                        entity_id,
-                        id_type,
-                        dataset_view,
-                        max_privacy_level
-                    )
-                })
-            else:
-                codes.append(str(key))
-        return codes
+        # any child in the view makes the entity a branch,
+        # but only the latest entities are listed
+        return build_entity_tree(
+            parent_entity_ids,
+            self.get_tree_values(entities, id_type),
+            lambda entity: self.get_tree_key(entity, id_type),
+            is_listed=lambda entity: entity['is_latest']
+        )
 
     @swagger_auto_schema(
         operation_id='operation-view-containment-check',
@@ -1855,68 +1776,105 @@ class ViewEntityContainmentCheck(EntityContainmentCheck,
                 }).data
             )
         is_hierarchical = level_type is None and admin_level is None
-        if geojson['type'] == 'Feature':
-            results = self.do_run_query(
-                        return_type,
-                        id_type,
-                        dataset_view.dataset,
-                        dataset_view,
-                        spatial_query,
-                        dwithin_distance,
-                        GEOSGeometry(
-                            json.dumps(geojson['geometry']), srid=4326
-                        ),
-                        max_privacy_level,
-                        admin_level,
-                        entity_type
-                    )
-            if results:
-                return_type = kwargs.get('id_type', None)
-                if 'properties' not in geojson:
-                    geojson['properties'] = {}
-                geojson['properties'][return_type] = (
-                    self.get_id_value(
-                        id_type,
-                        results,
-                        is_hierarchical,
-                        dataset_view,
-                        max_privacy_level
-                    )
+        features = self.get_input_features(geojson)
+        results_by_feature = self.do_run_batch_query(
+            return_type,
+            id_type,
+            dataset_view.dataset,
+            spatial_query,
+            dwithin_distance,
+            [
+                GEOSGeometry(
+                    json.dumps(feature['geometry']), srid=4326
+                ) for feature in features
+            ],
+            max_privacy_level,
+            admin_level,
+            entity_type,
+            dataset_view=dataset_view
+        )
+        trees = None
+        if is_hierarchical:
+            trees = self.entities_code(
+                self.get_root_entity_ids(id_type, results_by_feature),
+                id_type,
+                dataset_view,
+                max_privacy_level
+            )
+        return_type = kwargs.get('id_type', None)
+        for idx, results in results_by_feature.items():
+            feature = features[idx]
+            if 'properties' not in feature:
+                feature['properties'] = {}
+            feature['properties'][return_type] = (
+                self.get_id_value(
+                    id_type,
+                    results,
+                    is_hierarchical,
+                    dataset_view,
+                    max_privacy_level,
+                    trees=trees
                 )
-        elif geojson['type'] == 'FeatureCollection':
-            for idx, feature in enumerate(geojson['features']):
-                results = self.do_run_query(
-                            return_type,
-                            id_type,
-                            dataset_view.dataset,
-                            dataset_view,
-                            spatial_query,
-                            dwithin_distance,
-                            GEOSGeometry(
-                                json.dumps(feature['geometry']), srid=4326
-                            ),
-                            max_privacy_level,
-                            admin_level,
-                            entity_type
-                        )
-                if results:
-                    return_type = kwargs.get('id_type', None)
-                    if 'properties' not in feature:
-                        feature['properties'] = {}
-                    feature['properties'][return_type] = (
-                        self.get_id_value(
-                            id_type,
-                            results,
-                            is_hierarchical,
-                            dataset_view,
-                            max_privacy_level
-                        )
-                    )
+            )
         return Response(
             geojson
         )
 
 
+class ViewEntityPointLookup(EntityPointLookup,
+                            DatasetViewDetailCheckPermission):
+    """
+    Find geographical entities in the view that contain the points
+
+    Given list of points (SRID 4326) in the payload, find the \
+        identifier value of {id_type} from Geographical Entity \
+        at all levels in the view that contain each point.
+
+    The points can be sent as JSON body:
+    ```
+    {"points": [[longitude, latitude], ...]}
+    ```
+    or as CSV file in the multipart field 'file' with longitude \
+        and latitude columns (lon,lat or longitude,latitude or x,y).
+
+    The result is ordered as the input points, each item is the list \
+        of entities sorted by admin level.
+
+    Example request:
+    ```
+    POST /operation/view/{uuid}/point-lookup/ucode/
+    Request Content-type: application/json
+    Request Body: {"points": [[69.2, 30.1]]}
+    ```
+    """
+    permission_classes = [DatasetViewDetailAccessPermission]
+
+    @swagger_auto_schema(
+        operation_id='operation-view-point-lookup',
+        tags=[OPERATION_VIEW_ENTITY_TAG],
+        manual_parameters=[
+            ViewEntityContainmentCheck.uuid_param,
+            ViewEntityContainmentCheck.id_type_param
+        ],
+        request_body=EntityPointLookup.points_body,
+        responses={
+            200: openapi.Schema(type=openapi.TYPE_OBJECT),
+            400: APIErrorSerializer
+        }
+    )
+    def post(self, request, *args, **kwargs):
+        dataset_view, max_privacy_level = self.get_dataset_view_obj(
+            request, kwargs.get('uuid', None)
+        )
+        return self.do_lookup(
+            request,
+            kwargs,
+            dataset_view.dataset,
+            max_privacy_level,
+            dataset_view=dataset_view
+        )
+
+
 class ViewEntityTraverseHierarchyByUCode(
         DatasetViewSearchBase,
         EntitySearchBase,
@@ -1967,9 +1925,7 @@ class ViewEntityTraverseHierarchyByUCode(
             privacy_level__lte=max_privacy_level
         )
         # raw_sql to view to select id
-        raw_sql = (
-            'SELECT id from "{}"'
-        ).format(str(dataset_view.uuid))
+        raw_sql = view_entity_ids_sql(dataset_view)
         if self.traverse_direction == 'up':
             # find parent
             child = GeographicalEntity.objects.filter(
@@ -2010,7 +1966,7 @@ class ViewEntityTraverseHierarchyByUCode(
                 return self.generate_response(None)
         entities, max_level, ids, names = self.generate_entity_query(
             entities,
-            str(dataset_view.dataset.uuid),
+            dataset_view.dataset,
             admin_level=admin_level
         )
         return self.generate_response(
@@ -2047,7 +2003,7 @@ class ViewEntityTraverseHierarchyByUCode(
             type=openapi.TYPE_STRING,
             default='json',
             required=False
-        )],
+        ), *geometry_api_params],
         responses={
             200: openapi.Schema(
                 title='Entity List',
@@ -2151,7 +2107,7 @@ class ViewEntityTraverseChildrenHierarchyByUCode(
             type=openapi.TYPE_STRING,
             default='json',
             required=False
-        )],
+        ), *geometry_api_params],
         responses={
             200: openapi.Schema(
                 title='Entity List',
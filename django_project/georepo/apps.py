@@ -5,4 +5,10 @@ class GeorepoConfig(AppConfig):
     name = 'georepo'
 
     def ready(self):
-        pass
+        from django.contrib.auth import get_user_model
+        from django.db.models.signals import m2m_changed
+        from georepo.utils.permission import user_groups_changed
+        m2m_changed.connect(
+            user_groups_changed,
+            sender=get_user_model().groups.through
+        )
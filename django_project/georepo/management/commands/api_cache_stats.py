@@ -0,0 +1,29 @@
+from django.core.management import BaseCommand
+
+from georepo.api_views.api_cache import ApiCache, get_cache_stats
+
+
+def get_api_cache_classes(cls=ApiCache):
+    classes = []
+    for subclass in cls.__subclasses__():
+        classes.append(subclass)
+        classes.extend(get_api_cache_classes(subclass))
+    return classes
+
+
+class Command(BaseCommand):
+    help = 'Print hit/miss counter of API response cache'
+
+    def handle(self, *args, **options):
+        # import urls so all api views are loaded
+        import core.urls  # noqa
+        for api_class in sorted(
+                set(get_api_cache_classes()), key=lambda c: c.__name__):
+            hit, miss = get_cache_stats(api_class.__name__)
+            total = hit + miss
+            if total == 0:
+                continue
+            self.stdout.write(
+                f'{api_class.__name__}: hit={hit} miss={miss} '
+                f'ratio={hit / total:.2f}'
+            )
@@ -0,0 +1,46 @@
+from django.core.management import BaseCommand, CommandError
+
+from georepo.models import DatasetView
+from georepo.utils.entity_validity import parse_as_of
+from georepo.utils.geojson import generate_view_geojson
+from georepo.utils.kml import generate_view_kml
+from georepo.utils.shapefile import generate_view_shapefile
+from georepo.utils.topojson import generate_view_topojson
+
+# other formats are converted from geojson
+VIEW_EXPORTERS = [
+    ('geojson', generate_view_geojson),
+    ('shapefile', generate_view_shapefile),
+    ('kml', generate_view_kml),
+    ('topojson', generate_view_topojson)
+]
+
+
+class Command(BaseCommand):
+    help = 'Export entity revisions in view that are valid at a date'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--view',
+            type=str,
+            required=True,
+            help='View UUID'
+        )
+        parser.add_argument(
+            '--as-of',
+            type=str,
+            required=True,
+            help='Date in ISO format or unix timestamp'
+        )
+
+    def handle(self, *args, **options):
+        as_of = parse_as_of(options['as_of'])
+        if as_of is None:
+            raise CommandError(f'Invalid as_of date {options["as_of"]}')
+        view = DatasetView.objects.filter(uuid=options['view']).first()
+        if view is None:
+            raise CommandError(f'View {options["view"]} does not exist')
+        for output, exporter in VIEW_EXPORTERS:
+            self.stdout.write(
+                f'Exporting {output} of view {view.name} as of {as_of}')
+            exporter(view, as_of=as_of)
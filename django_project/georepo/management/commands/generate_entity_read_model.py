@@ -0,0 +1,23 @@
+from django.core.management import BaseCommand
+
+from georepo.models import Dataset
+from georepo.utils.entity_read_model import generate_entity_read_model
+
+
+class Command(BaseCommand):
+    help = 'Generate entity read model of datasets'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dataset',
+            type=str,
+            help='Dataset UUID, default to all datasets'
+        )
+
+    def handle(self, *args, **options):
+        datasets = Dataset.objects.all().order_by('id')
+        if options.get('dataset'):
+            datasets = datasets.filter(uuid=options['dataset'])
+        for dataset in datasets:
+            self.stdout.write(f'Generating read model of {dataset.label}')
+            generate_entity_read_model(dataset)
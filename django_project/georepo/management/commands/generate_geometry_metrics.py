@@ -0,0 +1,24 @@
+from django.core.management import BaseCommand
+
+from georepo.models import Dataset
+from georepo.utils.geometry_metrics import generate_geometry_metrics
+
+
+class Command(BaseCommand):
+    help = 'Backfill centroid, bbox, area and perimeter of entities'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dataset',
+            type=str,
+            help='Dataset UUID, default to all datasets'
+        )
+
+    def handle(self, *args, **options):
+        datasets = Dataset.objects.all().order_by('id')
+        if options.get('dataset'):
+            datasets = datasets.filter(uuid=options['dataset'])
+        for dataset in datasets:
+            self.stdout.write(
+                f'Generating geometry metrics of {dataset.label}')
+            generate_geometry_metrics(dataset)
@@ -0,0 +1,24 @@
+from django.core.management import BaseCommand
+
+from georepo.models import Dataset
+from georepo.utils.search_document import generate_search_document
+
+
+class Command(BaseCommand):
+    help = 'Generate search document of entities for name search'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dataset',
+            type=str,
+            help='Dataset UUID, default to all datasets'
+        )
+
+    def handle(self, *args, **options):
+        datasets = Dataset.objects.all().order_by('id')
+        if options.get('dataset'):
+            datasets = datasets.filter(uuid=options['dataset'])
+        for dataset in datasets:
+            self.stdout.write(
+                f'Generating search document of {dataset.label}')
+            generate_search_document(dataset)
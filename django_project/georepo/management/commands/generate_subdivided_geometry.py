@@ -0,0 +1,24 @@
+from django.core.management import BaseCommand
+
+from georepo.models import Dataset
+from georepo.utils.subdivided_geometry import generate_subdivided_geometry
+
+
+class Command(BaseCommand):
+    help = 'Generate subdivided geometry of entities for point lookup'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dataset',
+            type=str,
+            help='Dataset UUID, default to all datasets'
+        )
+
+    def handle(self, *args, **options):
+        datasets = Dataset.objects.all().order_by('id')
+        if options.get('dataset'):
+            datasets = datasets.filter(uuid=options['dataset'])
+        for dataset in datasets:
+            self.stdout.write(
+                f'Generating subdivided geometry of {dataset.label}')
+            generate_subdivided_geometry(dataset)
@@ -0,0 +1,36 @@
+from django.core.management import BaseCommand
+from django.db import ProgrammingError
+
+from georepo.models import DatasetView
+from georepo.utils.dataset_view import generate_view_membership
+
+
+class Command(BaseCommand):
+    help = 'Generate membership of entities in dataset views'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dataset',
+            type=str,
+            help='Dataset UUID, default to all datasets'
+        )
+        parser.add_argument(
+            '--view',
+            type=str,
+            help='View UUID, default to all views'
+        )
+
+    def handle(self, *args, **options):
+        views = DatasetView.objects.all().order_by('id')
+        if options.get('dataset'):
+            views = views.filter(dataset__uuid=options['dataset'])
+        if options.get('view'):
+            views = views.filter(uuid=options['view'])
+        for view in views:
+            self.stdout.write(
+                f'Generating membership of view {view.name}')
+            try:
+                generate_view_membership(view)
+            except ProgrammingError as ex:
+                # sql view does not exist
+                self.stderr.write(f'Failed to generate {view.name}: {ex}')
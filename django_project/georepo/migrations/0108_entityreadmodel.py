@@ -0,0 +1,34 @@
+# Generated by Django 4.0.7 on 2023-08-28 09:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('georepo', '0107_datasetviewresource_entity_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dataset',
+            name='read_model_generated_at',
+            field=models.DateTimeField(blank=True, help_text='Time when entity read model of this dataset is generated. Entity list API uses the read model when this is set.', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='geographicalentity',
+            index=models.Index(fields=['dataset', 'is_approved', 'is_latest', 'level'], name='entity_ds_latest_level_idx'),
+        ),
+        migrations.CreateModel(
+            name='EntityReadModel',
+            fields=[
+                ('geographical_entity', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='read_model', serialize=False, to='georepo.geographicalentity')),
+                ('ext_codes', models.JSONField(blank=True, default=dict)),
+                ('names', models.JSONField(blank=True, default=list)),
+                ('parents', models.JSONField(blank=True, default=list)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('dataset', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='georepo.dataset')),
+            ],
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.0.7 on 2023-08-30 07:41
+
+from django.contrib.postgres.operations import CreateExtension
+import django.contrib.postgres.indexes
+from django.db import migrations
+import georepo.models.entity
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('georepo', '0108_entityreadmodel'),
+    ]
+
+    operations = [
+        CreateExtension('ltree'),
+        migrations.AddField(
+            model_name='geographicalentity',
+            name='ancestry_path',
+            field=georepo.models.entity.LtreeField(blank=True, help_text='Materialized path of entity ids from level 0', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='geographicalentity',
+            index=django.contrib.postgres.indexes.GistIndex(fields=['ancestry_path'], name='entity_ancestry_path_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.0.7 on 2023-08-30 08:41
+
+import django.contrib.gis.db.models.fields
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('georepo', '0109_geographicalentity_ancestry_path'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dataset',
+            name='subdivided_geometry_generated_at',
+            field=models.DateTimeField(blank=True, help_text='Time when subdivided geometry of this dataset is generated. Point lookup API uses the subdivided geometry when this is set.', null=True),
+        ),
+        migrations.CreateModel(
+            name='EntitySubdividedGeometry',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('geometry', django.contrib.gis.db.models.fields.GeometryField(srid=4326)),
+                ('dataset', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='georepo.dataset')),
+                ('geographical_entity', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='subdivided_geometries', to='georepo.geographicalentity')),
+            ],
+        ),
+    ]
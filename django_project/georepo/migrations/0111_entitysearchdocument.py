@@ -0,0 +1,41 @@
+# Generated by Django 4.0.7 on 2023-08-31 03:15
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import UnaccentExtension
+import django.contrib.postgres.search
+from django.db import migrations, models
+import django.db.models.deletion
+import georepo.models.entity
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('georepo', '0110_entitysubdividedgeometry'),
+    ]
+
+    operations = [
+        UnaccentExtension(),
+        migrations.AddField(
+            model_name='dataset',
+            name='search_document_generated_at',
+            field=models.DateTimeField(blank=True, help_text='Time when entity search document of this dataset is generated. Name search uses the search document when this is set.', null=True),
+        ),
+        migrations.CreateModel(
+            name='EntitySearchDocument',
+            fields=[
+                ('geographical_entity', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_document', serialize=False, to='georepo.geographicalentity')),
+                ('document', georepo.models.entity.SearchDocumentField(blank=True, default='')),
+                ('search_vector', django.contrib.postgres.search.SearchVectorField(blank=True, null=True)),
+                ('dataset', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='georepo.dataset')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='entitysearchdocument',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['document'], name='entity_search_doc_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='entitysearchdocument',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='entity_search_vector_idx'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 4.0.7 on 2023-09-05 02:41
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('georepo', '0111_entitysearchdocument'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='datasetview',
+            name='membership_generated_at',
+            field=models.DateTimeField(blank=True, help_text='Time when entity membership of this view is generated. View queries use the membership table when this is set.', null=True),
+        ),
+        migrations.CreateModel(
+            name='DatasetViewEntity',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('privacy_level', models.IntegerField()),
+                ('level', models.IntegerField()),
+                ('dataset_view', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='georepo.datasetview')),
+                ('geographical_entity', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='georepo.geographicalentity')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='datasetviewentity',
+            index=models.Index(fields=['dataset_view', 'privacy_level'], name='view_entity_privacy_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='datasetviewentity',
+            index=models.Index(fields=['dataset_view', 'level'], name='view_entity_level_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='datasetviewentity',
+            constraint=models.UniqueConstraint(fields=['dataset_view', 'geographical_entity'], name='unique_view_entity'),
+        ),
+    ]
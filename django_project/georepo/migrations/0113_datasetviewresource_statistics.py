@@ -0,0 +1,23 @@
+# Generated by Django 4.0.7 on 2023-09-06 04:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('georepo', '0112_datasetviewentity'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='datasetviewresource',
+            name='levels',
+            field=models.JSONField(blank=True, default=list, help_text='Admin levels of entities in this resource'),
+        ),
+        migrations.AddField(
+            model_name='datasetviewresource',
+            name='statistics_updated_at',
+            field=models.DateTimeField(blank=True, help_text='Time when entity count, levels and bbox of this resource are generated', null=True),
+        ),
+    ]
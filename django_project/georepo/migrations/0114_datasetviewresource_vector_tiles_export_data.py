@@ -0,0 +1,18 @@
+# Generated by Django 4.0.7 on 2023-09-07 03:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('georepo', '0113_datasetviewresource_statistics'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='datasetviewresource',
+            name='vector_tiles_export_data',
+            field=models.BooleanField(default=False, help_text='Whether the latest vector tiles task also exports data'),
+        ),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 4.0.7 on 2023-09-08 04:12
+
+import django.contrib.gis.db.models.fields
+import django.contrib.postgres.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('georepo', '0114_datasetviewresource_vector_tiles_export_data'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='geographicalentity',
+            name='area',
+            field=models.FloatField(blank=True, help_text='Geodesic area in km2', null=True),
+        ),
+        migrations.AlterField(
+            model_name='geographicalentity',
+            name='perimeter',
+            field=models.FloatField(blank=True, help_text='The total length of borders, geodesic length in km', null=True),
+        ),
+        migrations.AddField(
+            model_name='geographicalentity',
+            name='point_on_surface',
+            field=django.contrib.gis.db.models.fields.PointField(blank=True, help_text='Point that is guaranteed to be on the geometry', null=True, srid=4326),
+        ),
+        migrations.AddField(
+            model_name='geographicalentity',
+            name='bbox',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.FloatField(), blank=True, help_text='Bounding box of geometry: [xmin, ymin, xmax, ymax]', null=True, size=4),
+        ),
+        migrations.RunSQL(
+            'CREATE OR REPLACE FUNCTION entity_geometry_metrics() '
+            'RETURNS trigger AS $entity_geometry_metrics$ '
+            'BEGIN '
+            '    IF TG_OP = \'UPDATE\' AND '
+            '        NEW.geometry IS NOT DISTINCT FROM OLD.geometry '
+            '    THEN '
+            '        RETURN NEW; '
+            '    END IF; '
+            '    IF NEW.geometry IS NULL THEN '
+            '        NEW.point_on_surface := NULL; '
+            '        NEW.bbox := NULL; '
+            '        NEW.area := NULL; '
+            '        NEW.perimeter := NULL; '
+            '    ELSE '
+            '        NEW.point_on_surface := ST_PointOnSurface(NEW.geometry); '
+            '        NEW.bbox := ARRAY[ST_XMin(NEW.geometry), '
+            '            ST_YMin(NEW.geometry), ST_XMax(NEW.geometry), '
+            '            ST_YMax(NEW.geometry)]; '
+            '        NEW.area := ST_Area(NEW.geometry::geography) / 1e6; '
+            '        NEW.perimeter := '
+            '            ST_Perimeter(NEW.geometry::geography) / 1e3; '
+            '    END IF; '
+            '    RETURN NEW; '
+            'END; '
+            '$entity_geometry_metrics$ LANGUAGE plpgsql; '
+            'CREATE TRIGGER entity_geometry_metrics_trigger '
+            'BEFORE INSERT OR UPDATE OF geometry '
+            'ON georepo_geographicalentity '
+            'FOR EACH ROW EXECUTE PROCEDURE entity_geometry_metrics();',
+            reverse_sql=(
+                'DROP TRIGGER IF EXISTS entity_geometry_metrics_trigger '
+                'ON georepo_geographicalentity; '
+                'DROP FUNCTION IF EXISTS entity_geometry_metrics();'
+            )
+        ),
+    ]
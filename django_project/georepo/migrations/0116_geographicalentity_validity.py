@@ -0,0 +1,55 @@
+# Generated by Django 4.0.7 on 2023-09-12 03:25
+
+import django.contrib.postgres.fields.ranges
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import BtreeGistExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('georepo', '0115_geographicalentity_geometry_metrics'),
+    ]
+
+    operations = [
+        BtreeGistExtension(),
+        migrations.AddField(
+            model_name='geographicalentity',
+            name='validity',
+            field=django.contrib.postgres.fields.ranges.DateTimeRangeField(blank=True, editable=False, help_text='Range of [start_date, end_date), maintained by entity_validity trigger', null=True),
+        ),
+        migrations.RunSQL(
+            'CREATE OR REPLACE FUNCTION entity_validity() '
+            'RETURNS trigger AS $entity_validity$ '
+            'BEGIN '
+            '    IF NEW.start_date IS NULL OR '
+            '        NEW.end_date < NEW.start_date '
+            '    THEN '
+            '        NEW.validity := NULL; '
+            '    ELSE '
+            '        NEW.validity := '
+            '            tstzrange(NEW.start_date, NEW.end_date, \'[)\'); '
+            '    END IF; '
+            '    RETURN NEW; '
+            'END; '
+            '$entity_validity$ LANGUAGE plpgsql; '
+            'CREATE TRIGGER entity_validity_trigger '
+            'BEFORE INSERT OR UPDATE OF start_date, end_date, validity '
+            'ON georepo_geographicalentity '
+            'FOR EACH ROW EXECUTE PROCEDURE entity_validity(); '
+            'UPDATE georepo_geographicalentity '
+            'SET validity = tstzrange(start_date, end_date, \'[)\') '
+            'WHERE start_date IS NOT NULL AND '
+            '    (end_date IS NULL OR end_date >= start_date);',
+            reverse_sql=(
+                'DROP TRIGGER IF EXISTS entity_validity_trigger '
+                'ON georepo_geographicalentity; '
+                'DROP FUNCTION IF EXISTS entity_validity();'
+            )
+        ),
+        migrations.AddIndex(
+            model_name='geographicalentity',
+            index=django.contrib.postgres.indexes.GistIndex(fields=['dataset', 'level', 'validity'], name='entity_ds_level_validity_idx'),
+        ),
+    ]
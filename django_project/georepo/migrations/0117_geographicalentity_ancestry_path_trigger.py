@@ -0,0 +1,67 @@
+# Generated by Django 4.0.7 on 2023-09-13 02:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('georepo', '0116_geographicalentity_validity'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            'CREATE OR REPLACE FUNCTION entity_ancestry_path() '
+            'RETURNS trigger AS $entity_ancestry_path$ '
+            'BEGIN '
+            '    IF TG_OP = \'UPDATE\' AND '
+            '        NEW.parent_id IS NOT DISTINCT FROM OLD.parent_id '
+            '    THEN '
+            '        NEW.ancestry_path := OLD.ancestry_path; '
+            '        RETURN NEW; '
+            '    END IF; '
+            '    IF NEW.parent_id IS NULL THEN '
+            '        NEW.ancestry_path := NEW.id::text::ltree; '
+            '    ELSE '
+            '        NEW.ancestry_path := ('
+            '            SELECT p.ancestry_path '
+            '            FROM georepo_geographicalentity p '
+            '            WHERE p.id = NEW.parent_id'
+            '        ) || NEW.id::text; '
+            '    END IF; '
+            '    RETURN NEW; '
+            'END; '
+            '$entity_ancestry_path$ LANGUAGE plpgsql; '
+            'CREATE TRIGGER entity_ancestry_path_trigger '
+            'BEFORE INSERT OR UPDATE OF parent_id '
+            'ON georepo_geographicalentity '
+            'FOR EACH ROW EXECUTE PROCEDURE entity_ancestry_path();',
+            reverse_sql=(
+                'DROP TRIGGER IF EXISTS entity_ancestry_path_trigger '
+                'ON georepo_geographicalentity; '
+                'DROP FUNCTION IF EXISTS entity_ancestry_path();'
+            )
+        ),
+        # backfill paths of existing entities
+        migrations.RunSQL(
+            'WITH RECURSIVE tree AS ( '
+            '  SELECT gg.id, gg.id::text::ltree AS path '
+            '  FROM georepo_geographicalentity gg '
+            '  WHERE gg.parent_id IS NULL '
+            '  UNION ALL '
+            '  SELECT child.id, tree.path || child.id::text '
+            '  FROM georepo_geographicalentity child '
+            '  INNER JOIN tree ON child.parent_id = tree.id '
+            ') '
+            'UPDATE georepo_geographicalentity gg '
+            'SET ancestry_path = tree.path '
+            'FROM tree '
+            'WHERE gg.id = tree.id AND '
+            'gg.ancestry_path IS DISTINCT FROM tree.path',
+            reverse_sql=migrations.RunSQL.noop
+        ),
+        migrations.AddIndex(
+            model_name='geographicalentity',
+            index=models.Index(condition=models.Q(('ancestry_path__isnull', True)), fields=['dataset'], name='entity_missing_path_idx'),
+        ),
+    ]
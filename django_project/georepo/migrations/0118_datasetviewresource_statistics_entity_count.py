@@ -0,0 +1,18 @@
+# Generated by Django 4.0.7 on 2023-09-14 03:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('georepo', '0117_geographicalentity_ancestry_path_trigger'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='datasetviewresource',
+            name='statistics_entity_count',
+            field=models.IntegerField(default=0, help_text='Entity count of this privacy level in the view, entity_count is only set when vector tiles are generated'),
+        ),
+    ]
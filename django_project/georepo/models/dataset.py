@@ -1,5 +1,4 @@
 import uuid
-from django.core.cache import cache
 from django.db import models
 from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
@@ -194,39 +193,44 @@ class Dataset(models.Model):
         default='Entity simplification finished'
     )
 
+    read_model_generated_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text=(
+            'Time when entity read model of this dataset is generated. '
+            'Entity list API uses the read model when this is set.'
+        )
+    )
+
+    subdivided_geometry_generated_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text=(
+            'Time when subdivided geometry of this dataset is generated. '
+            'Point lookup API uses the subdivided geometry when this is set.'
+        )
+    )
+
+    search_document_generated_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text=(
+            'Time when entity search document of this dataset is generated. '
+            'Name search uses the search document when this is set.'
+        )
+    )
+
     def save(self, *args, **kwargs):
         if not self.uuid:
             self.uuid = uuid.uuid4()
 
         self.last_update = timezone.now()
 
-        # Clear cache
-        cache_keys = cache.get('cache_keys')
-        if cache_keys:
-            dataset_keys = cache_keys.get('Dataset', [])
-            if dataset_keys:
-                to_removed = []
-                for dataset_key in dataset_keys:
-                    if str(self.uuid) in dataset_key:
-                        cache.delete(dataset_key)
-                        to_removed.append(dataset_key)
-                for remove in to_removed:
-                    dataset_keys.remove(remove)
-                cache_keys['Dataset'] = dataset_keys
-                cache.set('cache_keys', cache_keys)
-
-        try:
-            dataset_caches = (
-                cache._cache.get_client().keys(f'*{str(self.uuid)}*')
-            )
-            if dataset_caches:
-                for dataset_cache in dataset_caches:
-                    cache.delete(
-                        str(dataset_cache).split(':')[-1].replace('\'', ''))
-        except AttributeError:
-            pass
-
-        return super(Dataset, self).save(*args, **kwargs)
+        result = super(Dataset, self).save(*args, **kwargs)
+        # invalidate cached api responses of this dataset
+        from georepo.utils.cache_generation import bump_dataset_generation
+        bump_dataset_generation(self)
+        return result
 
     def __str__(self):
         return self.label
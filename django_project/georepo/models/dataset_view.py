@@ -154,6 +154,15 @@ class DatasetView(models.Model):
         blank=True
     )
 
+    membership_generated_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text=(
+            'Time when entity membership of this view is generated. '
+            'View queries use the membership table when this is set.'
+        )
+    )
+
     def get_resource_level_for_user(self, user_privacy_level):
         """
         Return allowed resource based on user level
@@ -174,36 +183,14 @@ class DatasetView(models.Model):
         if not self.uuid:
             self.uuid = uuid4()
 
-        # Clear cache
-        cache_keys = cache.get('cache_keys')
-        if cache_keys:
-            dataset_keys = cache_keys.get('DatasetView', [])
-            if dataset_keys:
-                to_removed = []
-                for dataset_key in dataset_keys:
-                    if str(self.uuid) in dataset_key:
-                        cache.delete(dataset_key)
-                        to_removed.append(dataset_key)
-                for remove in to_removed:
-                    dataset_keys.remove(remove)
-                cache_keys['DatasetView'] = dataset_keys
-                cache.set('cache_keys', cache_keys)
-
-        try:
-            dataset_caches = (
-                cache._cache.get_client().keys(f'*{str(self.uuid)}*')
-            )
-            if dataset_caches:
-                for dataset_cache in dataset_caches:
-                    cache.delete(
-                        str(dataset_cache).split(':')[-1].replace('\'', ''))
-        except AttributeError:
-            pass
-
         for resource in self.datasetviewresource_set.all():
             resource.clear_permission_cache()
 
-        return super(DatasetView, self).save(*args, **kwargs)
+        result = super(DatasetView, self).save(*args, **kwargs)
+        # invalidate cached api responses of this view
+        from georepo.utils.cache_generation import bump_view_generation
+        bump_view_generation(self)
+        return result
 
     def __str__(self):
         return self.name
@@ -291,6 +278,7 @@ def view_post_create(sender, instance: DatasetView, created, *args, **kwargs):
 @receiver(post_delete, sender=DatasetView)
 def view_post_delete(sender, instance: DatasetView, *args, **kwargs):
     from core.celery import app
+    from georepo.utils.view_registry import invalidate_sql_view
 
     if instance.task_id:
         app.control.revoke(
@@ -319,6 +307,54 @@ def view_post_delete(sender, instance: DatasetView, *args, **kwargs):
         )
     cursor = connection.cursor()
     cursor.execute('''%s''' % sql)
+    invalidate_sql_view(view_name)
+
+
+class DatasetViewEntity(models.Model):
+    """
+    Membership of entities in dataset view.
+
+    Stores the entity ids returned by the view SQL, so view queries
+    can use an indexed join instead of executing the view SQL.
+    Privacy level and level are copied from the entity, so tiling
+    and export queries can narrow the membership by its indexes.
+    Generated when the view is created/updated, when
+    the dataset of dynamic view is approved and after dataset patch
+    tasks. Other direct updates of entities need to regenerate it
+    with generate_view_membership command.
+    """
+
+    dataset_view = models.ForeignKey(
+        'georepo.DatasetView',
+        on_delete=models.CASCADE
+    )
+
+    geographical_entity = models.ForeignKey(
+        'georepo.GeographicalEntity',
+        on_delete=models.CASCADE
+    )
+
+    privacy_level = models.IntegerField()
+
+    level = models.IntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                name='unique_view_entity',
+                fields=['dataset_view', 'geographical_entity']
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=['dataset_view', 'privacy_level'],
+                name='view_entity_privacy_idx'
+            ),
+            models.Index(
+                fields=['dataset_view', 'level'],
+                name='view_entity_level_idx'
+            )
+        ]
 
 
 class DatasetViewResource(models.Model):
@@ -358,6 +394,11 @@ class DatasetViewResource(models.Model):
         editable=True
     )
 
+    vector_tiles_export_data = models.BooleanField(
+        default=False,
+        help_text='Whether the latest vector tiles task also exports data'
+    )
+
     vector_tiles_progress = models.FloatField(
         null=True,
         blank=True,
@@ -384,6 +425,29 @@ class DatasetViewResource(models.Model):
         default=0
     )
 
+    statistics_entity_count = models.IntegerField(
+        default=0,
+        help_text=(
+            'Entity count of this privacy level in the view, '
+            'entity_count is only set when vector tiles are generated'
+        )
+    )
+
+    levels = models.JSONField(
+        default=list,
+        blank=True,
+        help_text='Admin levels of entities in this resource'
+    )
+
+    statistics_updated_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text=(
+            'Time when entity count, levels and bbox of this resource '
+            'are generated'
+        )
+    )
+
     @property
     def resource_id(self):
         return str(self.uuid)
@@ -2,7 +2,11 @@ from uuid import uuid4
 
 from django.conf import settings
 from django.contrib.gis.db import models
+from django.contrib.postgres.fields import ArrayField, DateTimeRangeField
+from django.contrib.postgres.indexes import GistIndex, GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import IntegrityError, transaction
+from django.db.models import Q
 
 # revision uuid
 UUID_ENTITY_ID = 'uuid'
@@ -21,6 +25,84 @@ MAIN_ENTITY_ID_LIST = [
 ]
 
 
+class LtreeField(models.TextField):
+    """Postgres ltree field, requires ltree extension."""
+
+    def db_type(self, connection):
+        return 'ltree'
+
+
+@LtreeField.register_lookup
+class LtreeDescendantOf(models.Lookup):
+    """Path is descendant of (or equal to) the given path."""
+    lookup_name = 'descendant_of'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} <@ {rhs}::ltree', lhs_params + rhs_params
+
+
+@LtreeField.register_lookup
+class LtreeAncestorOf(models.Lookup):
+    """Path is ancestor of (or equal to) the given path."""
+    lookup_name = 'ancestor_of'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} @> {rhs}::ltree', lhs_params + rhs_params
+
+
+class SearchDocumentField(models.TextField):
+    """Text field of search document, requires pg_trgm extension."""
+
+
+@SearchDocumentField.register_lookup
+class SearchDocumentWordSimilar(models.Lookup):
+    """
+    Document has a word similar to the given text.
+
+    Uses pg_trgm.word_similarity_threshold, hence can use trigram index.
+    """
+    lookup_name = 'word_similar'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} %%> {rhs}', lhs_params + rhs_params
+
+
+class EqualsAny(models.Lookup):
+    """
+    Value equals any item of the list.
+
+    The list is sent as single array parameter, so the query
+    does not grow with the number of items like IN lookup.
+    Registered on integer, char and uuid fields only.
+    """
+    lookup_name = 'any'
+    prepare_rhs = False
+
+    def get_db_prep_lookup(self, value, connection):
+        return '%s', [[
+            self.lhs.output_field.get_db_prep_value(
+                item, connection, prepared=False)
+            for item in value
+        ]]
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        db_type = self.lhs.output_field.db_type(connection)
+        return f'{lhs} = ANY({rhs}::{db_type}[])', lhs_params + rhs_params
+
+
+models.IntegerField.register_lookup(EqualsAny)
+models.CharField.register_lookup(EqualsAny)
+models.UUIDField.register_lookup(EqualsAny)
+
+
 class GeographicalEntity(models.Model):
     id = models.AutoField(primary_key=True)
 
@@ -91,6 +173,16 @@ class GeographicalEntity(models.Model):
         blank=True
     )
 
+    validity = DateTimeRangeField(
+        help_text=(
+            'Range of [start_date, end_date), '
+            'maintained by entity_validity trigger'
+        ),
+        null=True,
+        blank=True,
+        editable=False
+    )
+
     is_latest = models.BooleanField(
         null=True,
         blank=True,
@@ -180,16 +272,31 @@ class GeographicalEntity(models.Model):
     )
 
     area = models.FloatField(
+        help_text='Geodesic area in km2',
         null=True,
         blank=True
     )
 
     perimeter = models.FloatField(
-        help_text='The total length of borders',
+        help_text='The total length of borders, geodesic length in km',
         null=True,
         blank=True,
     )
 
+    point_on_surface = models.PointField(
+        help_text='Point that is guaranteed to be on the geometry',
+        null=True,
+        blank=True
+    )
+
+    bbox = ArrayField(
+        models.FloatField(),
+        size=4,
+        help_text='Bounding box of geometry: [xmin, ymin, xmax, ymax]',
+        null=True,
+        blank=True
+    )
+
     vertices = models.PositiveIntegerField(
         help_text='The total number of line vertices',
         null=True,
@@ -224,6 +331,12 @@ class GeographicalEntity(models.Model):
         help_text='Parent Level 0'
     )
 
+    ancestry_path = LtreeField(
+        null=True,
+        blank=True,
+        help_text='Materialized path of entity ids from level 0'
+    )
+
     admin_level_name = models.CharField(
         null=True,
         blank=True,
@@ -247,7 +360,25 @@ class GeographicalEntity(models.Model):
                     models.Index(fields=['label']),
                     models.Index(fields=['level']),
                     models.Index(fields=['revision_number']),
-                    models.Index(fields=['concept_ucode'])
+                    models.Index(fields=['concept_ucode']),
+                    models.Index(
+                        fields=['dataset', 'is_approved',
+                                'is_latest', 'level'],
+                        name='entity_ds_latest_level_idx'
+                    ),
+                    GistIndex(
+                        fields=['ancestry_path'],
+                        name='entity_ancestry_path_idx'
+                    ),
+                    models.Index(
+                        fields=['dataset'],
+                        condition=Q(ancestry_path__isnull=True),
+                        name='entity_missing_path_idx'
+                    ),
+                    GistIndex(
+                        fields=['dataset', 'level', 'validity'],
+                        name='entity_ds_level_validity_idx'
+                    )
                 ]
 
     def __str__(self):
@@ -258,8 +389,39 @@ class GeographicalEntity(models.Model):
             f'{self.dataset.label}'
         )
 
+    def has_complete_ancestry_path(self):
+        """
+        Return True if ancestry path can be used for hierarchy queries.
+
+        Entities whose parent path is not generated yet do not have
+        the path, then descendant query would miss them.
+        """
+        if not self.ancestry_path:
+            return False
+        return not GeographicalEntity.objects.filter(
+            dataset_id=self.dataset_id,
+            ancestry_path__isnull=True
+        ).exists()
+
+    def all_parents(self):
+        """Return ancestors of entity, excluding the entity itself."""
+        if self.ancestry_path:
+            return GeographicalEntity.objects.filter(
+                ancestry_path__ancestor_of=self.ancestry_path
+            ).exclude(id=self.id)
+        parent_ids = []
+        parent = self.parent
+        while parent and parent.id not in parent_ids:
+            parent_ids.append(parent.id)
+            parent = parent.parent
+        return GeographicalEntity.objects.filter(id__in=parent_ids)
+
     def all_children(self):
-        from django.db.models import Q
+        if self.has_complete_ancestry_path():
+            # includes the entity itself
+            return GeographicalEntity.objects.filter(
+                ancestry_path__descendant_of=self.ancestry_path
+            )
         max_level: int = 0
         max_level_entity = GeographicalEntity.objects.all().order_by(
             'level').last()
@@ -478,3 +640,114 @@ class EntitySimplified(models.Model):
     simplified_geometry = models.GeometryField(
         null=True
     )
+
+
+class EntityReadModel(models.Model):
+    """
+    Denormalized entity detail for entity API responses.
+
+    Stores ext_codes, names and parents of entity so that entity list
+    does not need to join EntityId, EntityName and the parent chain.
+    Generated when upload is approved.
+    """
+    geographical_entity = models.OneToOneField(
+        'georepo.GeographicalEntity',
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='read_model'
+    )
+
+    dataset = models.ForeignKey(
+        'georepo.Dataset',
+        on_delete=models.CASCADE
+    )
+
+    # {code_name: value, 'default': default_code}
+    ext_codes = models.JSONField(
+        default=dict,
+        blank=True
+    )
+
+    # [{'idx': 0, 'name': 'name', 'lang': 'EN', 'label': 'label'}]
+    names = models.JSONField(
+        default=list,
+        blank=True
+    )
+
+    # ordered from the direct parent up to level 0
+    # [{'default': code, 'ucode': ucode, 'admin_level': 0, 'type': type}]
+    parents = models.JSONField(
+        default=list,
+        blank=True
+    )
+
+    updated_at = models.DateTimeField(
+        auto_now=True
+    )
+
+
+class EntitySubdividedGeometry(models.Model):
+    """
+    Geometry of entity that is split into small parts using ST_Subdivide.
+
+    Spatial index of small parts is much more selective than the index of
+    huge multipolygons, so point lookup only tests few vertices.
+    Generated when upload is approved.
+    """
+    geographical_entity = models.ForeignKey(
+        'georepo.GeographicalEntity',
+        on_delete=models.CASCADE,
+        related_name='subdivided_geometries'
+    )
+
+    dataset = models.ForeignKey(
+        'georepo.Dataset',
+        on_delete=models.CASCADE
+    )
+
+    geometry = models.GeometryField()
+
+
+class EntitySearchDocument(models.Model):
+    """
+    Search document of entity for name fuzzy search.
+
+    Combines label, names, codes, entity type and ancestor labels into
+    a lower-cased and unaccented text, so the search only needs
+    a single index scan instead of joining names and ids.
+    Generated when upload is approved.
+    """
+    geographical_entity = models.OneToOneField(
+        'georepo.GeographicalEntity',
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='search_document'
+    )
+
+    dataset = models.ForeignKey(
+        'georepo.Dataset',
+        on_delete=models.CASCADE
+    )
+
+    document = SearchDocumentField(
+        default='',
+        blank=True
+    )
+
+    search_vector = SearchVectorField(
+        null=True,
+        blank=True
+    )
+
+    class Meta:
+        indexes = [
+            GinIndex(
+                fields=['document'],
+                name='entity_search_doc_trgm_idx',
+                opclasses=['gin_trgm_ops']
+            ),
+            GinIndex(
+                fields=['search_vector'],
+                name='entity_search_vector_idx'
+            )
+        ]
@@ -74,7 +74,15 @@ class Module(models.Model):
     def save(self, *args, **kwargs):
         if self.default_module:
             Module.objects.exclude(id=self.id).update(default_module=False)
-        return super(Module, self).save(*args, **kwargs)
+        result = super(Module, self).save(*args, **kwargs)
+        # module status affects every dataset in the module,
+        # invalidate all cached api responses
+        from georepo.utils.cache_generation import (
+            bump_generation,
+            GLOBAL_SCOPE
+        )
+        bump_generation(GLOBAL_SCOPE)
+        return result
 
     def __str__(self):
         return self.name
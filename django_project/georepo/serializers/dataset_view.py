@@ -14,11 +14,13 @@ from georepo.models.dataset_view import DatasetView, DatasetViewResource
 from georepo.models.dataset import DatasetAdminLevelName
 from georepo.utils.dataset_view import (
     generate_view_resource_bbox,
-    get_view_resource_from_view
+    get_view_resource_from_view,
+    view_entity_ids_sql
 )
 from georepo.utils.permission import (
     get_view_permission_privacy_level
 )
+from georepo.utils.tile_signature import get_signed_tile_url_params
 
 
 class DatasetViewItemSerializer(TaggitSerializer, APIResponseModelSerializer):
@@ -123,6 +125,7 @@ class DatasetViewItemSerializer(TaggitSerializer, APIResponseModelSerializer):
             url = (
                 f'/layer_tiles/{str(resource.uuid)}/{{z}}/{{x}}/{{y}}'
                 f'?t={int(resource.vector_tiles_updated_at.timestamp())}'
+                f'{get_signed_tile_url_params(resource.uuid)}'
             )
             request = self.context['request']
             url = request.build_absolute_uri(url)
@@ -190,9 +193,8 @@ class DatasetViewItemSerializer(TaggitSerializer, APIResponseModelSerializer):
 class DatasetViewItemForUserSerializer(DatasetViewItemSerializer):
 
     def get_vector_tiles(self, obj: DatasetView):
-        obj_checker = self.context['obj_checker']
         user_privacy_level = get_view_permission_privacy_level(
-            obj_checker, obj.dataset, obj
+            self.context['user'], obj.dataset, obj
         )
         if user_privacy_level < obj.min_privacy_level:
             return None
@@ -201,9 +203,8 @@ class DatasetViewItemForUserSerializer(DatasetViewItemSerializer):
 
     def get_bbox(self, obj: DatasetView):
         bbox = []
-        obj_checker = self.context['obj_checker']
         user_privacy_level = get_view_permission_privacy_level(
-            obj_checker, obj.dataset, obj
+            self.context['user'], obj.dataset, obj
         )
         if user_privacy_level < obj.min_privacy_level:
             return bbox
@@ -334,6 +335,7 @@ class DatasetViewDetailSerializer(TaggitSerializer,
             url = (
                 f'/layer_tiles/{str(resource.uuid)}/{{z}}/{{x}}/{{y}}'
                 f'?t={int(resource.vector_tiles_updated_at.timestamp())}'
+                f'{get_signed_tile_url_params(resource.uuid)}'
             )
             request = self.context['request']
             url = request.build_absolute_uri(url)
@@ -375,9 +377,7 @@ class DatasetViewDetailSerializer(TaggitSerializer,
             Q(admin_level_name__isnull=True) | Q(admin_level_name='')
         )
         # raw_sql to view to select id
-        raw_sql = (
-            'SELECT id from "{}"'
-        ).format(str(obj.uuid))
+        raw_sql = view_entity_ids_sql(obj)
         entities = entities.filter(
             id__in=RawSQL(raw_sql, [])
         )
@@ -425,9 +425,7 @@ class DatasetViewDetailSerializer(TaggitSerializer,
             geographical_entity__privacy_level__lte=user_privacy_level
         )
         # raw_sql to view to select id
-        raw_sql = (
-            'SELECT id from "{}"'
-        ).format(str(obj.uuid))
+        raw_sql = view_entity_ids_sql(obj)
         ids = ids.filter(
             geographical_entity__id__in=RawSQL(raw_sql, [])
         )
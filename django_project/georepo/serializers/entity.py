@@ -7,6 +7,7 @@ from django.contrib.gis.geos import GEOSGeometry
 from georepo.serializers.common import APIResponseModelSerializer
 from georepo.models import GeographicalEntity
 from georepo.utils.unique_code import get_unique_code
+from georepo.utils.renderers import RawJSON
 
 
 class GeographicalEntitySerializer(APIResponseModelSerializer):
@@ -39,6 +40,9 @@ class GeographicalEntitySerializer(APIResponseModelSerializer):
 
     def get_geometry(self, obj: GeographicalEntity):
         if 'rhr_geom' in obj and obj['rhr_geom']:
+            if isinstance(obj['rhr_geom'], str):
+                # geojson text from the database is embedded as is
+                return RawJSON(obj['rhr_geom'])
             geom = GEOSGeometry(obj['rhr_geom'])
             return json.loads(geom.geojson)
         return None
@@ -89,6 +93,8 @@ class GeographicalEntitySerializer(APIResponseModelSerializer):
             self.context['ids'] if 'ids' in self.context
             else []
         )
+        if 'read_model__ext_codes' in obj:
+            return self.get_ext_codes_from_read_model(obj, ids)
         if len(ids) == 0:
             return {
                 'default': obj.get('internal_code', '')
@@ -113,11 +119,28 @@ class GeographicalEntitySerializer(APIResponseModelSerializer):
             identifiers['default'] = obj.get('internal_code', '')
         return identifiers
 
+    def get_ext_codes_from_read_model(self, obj, ids):
+        ext_codes = obj['read_model__ext_codes'] or {}
+        identifiers = {}
+        # jsonb does not keep the key order, follow the order of id types
+        for id in ids:
+            val = ext_codes.get(id['code__name'], None)
+            if val:
+                identifiers[id['code__name']] = val
+            elif self.output_format == 'geojson':
+                identifiers[id['code__name']] = None
+        identifiers['default'] = (
+            ext_codes.get('default', None) or obj.get('internal_code', '')
+        )
+        return identifiers
+
     def get_names(self, obj: GeographicalEntity):
         names_max_idx = (
             self.context['names'] if 'names' in self.context
             else None
         )
+        if 'read_model__names' in obj:
+            return self.get_names_from_read_model(obj, names_max_idx)
         if names_max_idx is None or names_max_idx['idx__max'] is None:
             return []
         names = []
@@ -142,7 +165,34 @@ class GeographicalEntitySerializer(APIResponseModelSerializer):
                 names.append(name)
         return names
 
+    def get_names_from_read_model(self, obj, names_max_idx):
+        entity_names = obj['read_model__names'] or []
+        if self.output_format == 'geojson':
+            if names_max_idx is None or names_max_idx['idx__max'] is None:
+                return []
+            names_by_idx = {
+                name['idx']: name['name'] for name in entity_names
+            }
+            return [
+                {
+                    'name': names_by_idx.get(name_idx, None),
+                    'label': f'name_{name_idx + 1}'
+                } for name_idx in range(names_max_idx['idx__max'] + 1)
+            ]
+        names = []
+        for entity_name in entity_names:
+            if not entity_name['name']:
+                continue
+            name = {
+                key: value for key, value in entity_name.items() if
+                key != 'idx'
+            }
+            names.append(name)
+        return names
+
     def get_parents(self, obj: GeographicalEntity):
+        if 'read_model__parents' in obj:
+            return self.get_parents_from_read_model(obj)
         parents = []
         max_level = self.context['max_level']
         related = ''
@@ -177,6 +227,25 @@ class GeographicalEntitySerializer(APIResponseModelSerializer):
                 })
         return parents
 
+    def get_parents_from_read_model(self, obj):
+        max_level = self.context['max_level']
+        stored_parents = (obj['read_model__parents'] or [])[:max_level]
+        parents = []
+        for i in range(max_level):
+            parent = (
+                stored_parents[i] if i < len(stored_parents) else None
+            )
+            if parent:
+                parents.append(parent)
+            elif self.output_format == 'geojson':
+                parents.append({
+                    'default': None,
+                    'ucode': None,
+                    'admin_level': i,
+                    'type': None
+                })
+        return parents
+
     def to_representation(self, instance: GeographicalEntity):
         representation = (
             super(GeographicalEntitySerializer, self).
@@ -1,3 +1,4 @@
 from .validation import *  # noqa
 from .simplify_geometry import * # noqa
 from .dataset_patch import * # noqa
+from .geometry_metrics import * # noqa
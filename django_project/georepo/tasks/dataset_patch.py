@@ -4,6 +4,7 @@ from django.db.models import Q
 from georepo.models.entity import GeographicalEntity
 from georepo.models.dataset import Dataset
 from georepo.utils.unique_code import generate_concept_ucode_base
+from georepo.utils.dataset_view import refresh_dynamic_views_membership
 
 
 @shared_task(name="dataset_patch")
@@ -89,6 +90,8 @@ def dataset_patch(dataset_id):
                     f'Updated {ancestor.internal_code} - '
                     f'{count}/{total_count} records'
                 )
+    # entities in dynamic views may change after the patch
+    refresh_dynamic_views_membership(dataset)
 
 
 def dataset_patch_is_latest(dataset_id, revision_number):
@@ -111,6 +114,7 @@ def dataset_patch_is_latest(dataset_id, revision_number):
         is_latest=True,
         is_approved=True
     )
+    refresh_dynamic_views_membership(dataset)
 
 
 def patch_revision_uuid(dataset_id):
@@ -127,6 +131,7 @@ def patch_revision_uuid(dataset_id):
         idx += 1
         if idx % 1000 == 0:
             print(f'Total count {idx}')
+    refresh_dynamic_views_membership(Dataset.objects.get(id=dataset_id))
 
 
 @shared_task(name='generate_concept_ucode')
@@ -182,3 +187,4 @@ def generate_concept_ucode(dataset_id):
                     is_approved=True,
                 ).update(concept_ucode=cucode)
                 sequence += 1
+    refresh_dynamic_views_membership(dataset)
@@ -0,0 +1,9 @@
+from celery import shared_task
+
+
+@shared_task(name="generate_geometry_metrics_in_dataset")
+def generate_geometry_metrics_in_dataset(dataset_id):
+    from georepo.models.dataset import Dataset
+    from georepo.utils.geometry_metrics import generate_geometry_metrics
+    dataset = Dataset.objects.get(id=dataset_id)
+    generate_geometry_metrics(dataset)
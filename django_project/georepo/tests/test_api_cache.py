@@ -2,11 +2,13 @@ from collections import OrderedDict
 from uuid import UUID
 
 import mock
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.urls import reverse
 from rest_framework.test import APIRequestFactory
 
-from georepo.api_views.dataset import DatasetList
+from django.contrib.auth.models import Group
+from georepo.api_views.dataset import DatasetList, DatasetDetail
+from georepo.utils.permission import grant_dataset_viewer
 from georepo.tests.model_factories import (
     GeographicalEntityF, DatasetF, UserF
 )
@@ -61,6 +63,47 @@ class TestApiCache(TestCase):
         self.assertIn('dataset', response.data['results'][0].get('name'))
         self.assertNotIn('short_code', response.data['results'][0])
 
+    @mock.patch('django.core.cache.cache.get')
+    def test_get_from_cache(self, mocked_get):
+        kwargs = {
+            'uuid': self.dataset.module.uuid
+        }
+        cached_results = {
+            'page': 1,
+            'total_page': 1,
+            'page_size': 50,
+            'results': [{'name': 'cached dataset'}]
+        }
+
+        def cache_get(key, *args, **kwargs):
+            if key.startswith('api:DatasetList:'):
+                return {
+                    'data': cached_results,
+                    'response_headers': None
+                }
+            return None
+        mocked_get.side_effect = cache_get
+        request = self.factory.get(
+            reverse('v1:dataset-list', kwargs=kwargs)
+        )
+        request.user = self.superuser
+        response = self.view(request, **kwargs)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, cached_results)
+
+    def test_generation_bump(self):
+        from georepo.utils.cache_generation import (
+            get_generation, bump_generation
+        )
+        mocked_incr = mock.Mock(side_effect=ValueError)
+        mocked_set = mock.Mock()
+        with mock.patch('django.core.cache.cache.incr', mocked_incr):
+            with mock.patch('django.core.cache.cache.set', mocked_set):
+                bump_generation('dataset:test')
+        mocked_incr.assert_called_once_with('generation:dataset:test')
+        mocked_set.assert_called_once()
+        self.assertIsNotNone(get_generation('dataset:test'))
+
     def test_dataset_list_module_disabled(self):
         dataset = DatasetF.create()
         dataset.module.is_active = False
@@ -77,3 +120,101 @@ class TestApiCache(TestCase):
         request.user = self.superuser
         response = self.view(request, **kwargs)
         self.assertEqual(response.status_code, 404)
+
+    @override_settings(CACHES={
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'test-conditional-request'
+        }
+    })
+    def test_conditional_request(self):
+        from georepo.utils.cache_generation import (
+            bump_generation, module_scope
+        )
+        kwargs = {
+            'uuid': self.dataset.module.uuid
+        }
+        url = reverse('v1:dataset-list', kwargs=kwargs)
+        request = self.factory.get(url)
+        request.user = self.superuser
+        response = self.view(request, **kwargs)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        self.assertTrue(etag)
+        self.assertIn('Last-Modified', response)
+        # matching ETag does not generate the response
+        request = self.factory.get(url, HTTP_IF_NONE_MATCH=etag)
+        request.user = self.superuser
+        with mock.patch.object(
+                DatasetList, 'get_response_data') as mocked_response:
+            response = self.view(request, **kwargs)
+            mocked_response.assert_not_called()
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        request = self.factory.get(url, HTTP_IF_NONE_MATCH=f'W/{etag}')
+        request.user = self.superuser
+        response = self.view(request, **kwargs)
+        self.assertEqual(response.status_code, 304)
+        # wildcard does not bypass the permission and existence checks
+        request = self.factory.get(url, HTTP_IF_NONE_MATCH='*')
+        request.user = self.superuser
+        response = self.view(request, **kwargs)
+        self.assertEqual(response.status_code, 200)
+        missing_kwargs = {
+            'uuid': '4685e7fe-5996-48aa-9e56-98820f53a7b2'
+        }
+        request = self.factory.get(
+            reverse('v1:dataset-list', kwargs=missing_kwargs),
+            HTTP_IF_NONE_MATCH='*'
+        )
+        request.user = UserF.create()
+        response = self.view(request, **missing_kwargs)
+        self.assertEqual(response.status_code, 404)
+        # other user has different ETag
+        request = self.factory.get(url, HTTP_IF_NONE_MATCH=etag)
+        request.user = UserF.create(is_superuser=True)
+        response = self.view(request, **kwargs)
+        self.assertEqual(response.status_code, 200)
+        # last modified from cached response
+        request = self.factory.get(url)
+        request.user = self.superuser
+        last_modified = self.view(request, **kwargs)['Last-Modified']
+        request = self.factory.get(
+            url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        request.user = self.superuser
+        response = self.view(request, **kwargs)
+        self.assertEqual(response.status_code, 304)
+        # module is updated
+        bump_generation(module_scope(self.dataset.module.uuid))
+        request = self.factory.get(url, HTTP_IF_NONE_MATCH=etag)
+        request.user = self.superuser
+        response = self.view(request, **kwargs)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    @override_settings(CACHES={
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'test-permission-change'
+        }
+    })
+    def test_cached_response_after_permission_change(self):
+        group = Group.objects.create(name='dataset viewer')
+        grant_dataset_viewer(self.dataset, group, 4)
+        user = UserF.create()
+        group.user_set.add(user)
+        kwargs = {
+            'uuid': self.dataset.uuid
+        }
+        url = reverse('v1:dataset-detail', kwargs=kwargs) + '?cached=True'
+        view = DatasetDetail.as_view()
+        request = self.factory.get(url)
+        request.user = user
+        response = view(request, **kwargs)
+        self.assertEqual(response.status_code, 200)
+        # user is removed from group, cached response is not served
+        group.user_set.remove(user)
+        request = self.factory.get(url)
+        request.user = user
+        response = view(request, **kwargs)
+        self.assertIn(response.status_code, [403, 404])
@@ -21,7 +21,11 @@ from georepo.api_views.dataset import (
     DatasetExportDownloadByCountryAndLevel
 )
 from georepo.api_views.protected_api import IsDatasetAllowedAPI
-from georepo.models import IdType, DatasetViewResource
+from georepo.models import IdType, DatasetViewResource, GeographicalEntity
+from georepo.utils.ancestry_path import (
+    generate_ancestry_path,
+    generate_ancestry_path_of_entities
+)
 from georepo.utils.dataset_view import (
     generate_default_view_dataset_latest
 )
@@ -289,6 +293,64 @@ class TestApiDataset(TestCase):
             response.data[0]['GO_001_V1'][0], 'GO_001_001_V1')
         self.check_disabled_module(view, request, kwargs=kwargs)
 
+    def test_entity_ancestry_path(self):
+        geo = GeographicalEntityF.create(
+            level=1,
+            dataset=self.dataset,
+            unique_code='GO_001',
+            parent=self.entity,
+            is_approved=True,
+            is_latest=True
+        )
+        child = GeographicalEntityF.create(
+            dataset=self.dataset,
+            level=2,
+            parent=geo,
+            unique_code='GO_001_001',
+            is_approved=True,
+            is_latest=True
+        )
+        # path is set by trigger
+        self.entity.refresh_from_db()
+        geo.refresh_from_db()
+        child.refresh_from_db()
+        self.assertEqual(self.entity.ancestry_path, str(self.entity.id))
+        self.assertEqual(
+            child.ancestry_path,
+            f'{self.entity.id}.{geo.id}.{child.id}'
+        )
+        children = geo.all_children().values_list('id', flat=True)
+        self.assertEqual(set(children), {geo.id, child.id})
+        parents = child.all_parents().values_list('id', flat=True)
+        self.assertEqual(set(parents), {self.entity.id, geo.id})
+        # regenerate from parent chain
+        GeographicalEntity.objects.filter(
+            dataset=self.dataset
+        ).update(ancestry_path=None)
+        generate_ancestry_path(self.dataset)
+        child.refresh_from_db()
+        self.assertEqual(
+            child.ancestry_path,
+            f'{self.entity.id}.{geo.id}.{child.id}'
+        )
+        # regenerate subtree of approved entities
+        GeographicalEntity.objects.filter(
+            id=child.id
+        ).update(ancestry_path=None)
+        self.assertFalse(geo.has_complete_ancestry_path())
+        # entity without path is still found by parent chain
+        children = geo.all_children().values_list('id', flat=True)
+        self.assertEqual(set(children), {geo.id, child.id})
+        generate_ancestry_path_of_entities(
+            GeographicalEntity.objects.filter(id__in=[geo.id, child.id])
+        )
+        child.refresh_from_db()
+        self.assertEqual(
+            child.ancestry_path,
+            f'{self.entity.id}.{geo.id}.{child.id}'
+        )
+        self.assertTrue(geo.has_complete_ancestry_path())
+
     @override_settings(
         GEOJSON_FOLDER_OUTPUT=(
             '/home/web/django_project/georepo/tests/dataset_export'
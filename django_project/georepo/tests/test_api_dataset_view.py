@@ -8,6 +8,7 @@ from dateutil.parser import isoparse
 from typing import List
 from django.test import TestCase, override_settings
 from django.urls import reverse
+from guardian.shortcuts import assign_perm
 from django.contrib.gis.geos import GEOSGeometry
 
 from rest_framework.test import APIRequestFactory
@@ -35,7 +36,8 @@ from georepo.utils.dataset_view import (
     check_view_exists
 )
 from georepo.utils.dataset_view import (
-    init_view_privacy_level
+    init_view_privacy_level,
+    generate_view_membership
 )
 from georepo.utils.permission import (
     grant_datasetview_external_viewer
@@ -207,6 +209,19 @@ class TestApiDatasetView(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertIn('results', response.data)
         self.assertEqual(len(response.data['results']), 1)
+        # view with read permission is listed even if user privacy level
+        # is below the view, without vector tiles and bbox
+        user_alice = UserF.create()
+        assign_perm('view_datasetview', user_alice, dataset_view)
+        DatasetView.objects.filter(id=dataset_view.id).update(
+            min_privacy_level=4
+        )
+        request.user = user_alice
+        response = view(request)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertIsNone(response.data['results'][0]['vector_tiles'])
+        self.assertEqual(len(response.data['results'][0]['bbox']), 0)
         # check disabled module, should return 0
         dataset.module.is_active = False
         dataset.module.save()
@@ -362,6 +377,8 @@ class TestApiDatasetView(TestCase):
         dataset_view.default_ancestor_code = geo_1.unique_code
         dataset_view.save(update_fields=['default_type',
                                          'default_ancestor_code'])
+        # entities are added after the view is created
+        generate_view_membership(dataset_view)
         new_adm_levels = [
             DatasetAdminLevelName(
                 dataset=dataset,
@@ -437,6 +454,8 @@ class TestApiDatasetView(TestCase):
             unique_code='PAK_001',
             unique_code_version=1
         )
+        # entities are added after the view is created
+        generate_view_membership(dataset_view)
         kwargs = {
             'uuid': str(dataset_view.uuid)
         }
@@ -510,6 +529,8 @@ class TestApiDatasetView(TestCase):
             unique_code='PAK_001',
             unique_code_version=1
         )
+        # entities are added after the view is created
+        generate_view_membership(dataset_view)
         kwargs = {
             'uuid': str(dataset_view.uuid),
             'admin_level': 1
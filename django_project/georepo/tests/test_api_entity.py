@@ -5,12 +5,20 @@ from dateutil.parser import isoparse
 from django.test import TestCase
 from django.urls import reverse
 from django.contrib.gis.geos import GEOSGeometry
+from django.core.files.uploadedfile import SimpleUploadedFile
 
 from rest_framework.test import APIRequestFactory
 from rest_framework import versioning
 
 from georepo.utils import absolute_path
 from georepo.models import IdType, GeographicalEntity, EntityType
+from georepo.models.entity import EntityReadModel, EntitySimplified
+from georepo.models.dataset_tile_config import (
+    DatasetTilingConfig, AdminLevelTilingConfig
+)
+from georepo.utils.entity_read_model import generate_entity_read_model
+from georepo.utils.subdivided_geometry import generate_subdivided_geometry
+from georepo.utils.search_document import generate_search_document
 from georepo.tests.model_factories import (
     GeographicalEntityF, EntityTypeF, DatasetF, EntityIdF,
     EntityNameF, LanguageF, UserF
@@ -19,10 +27,12 @@ from georepo.api_views.entity import (
     EntityBoundingBox,
     EntityIdList,
     EntityContainmentCheck,
+    EntityPointLookup,
     EntityFuzzySearch,
     EntityGeometryFuzzySearch,
     EntityList,
     FindEntityById,
+    EntityBatchLookup,
     FindEntityVersionsByConceptUCode,
     EntityListByUCode,
     EntityListByAdminLevel,
@@ -303,6 +313,235 @@ class TestApiEntity(EntityResponseChecker, TestCase):
                             excluded_columns=['geometry'],
                             geom_type='centroid')
 
+    def test_get_entity_list_geometry_precision(self):
+        geo = GeographicalEntity.objects.get(id=self.geographical_entity.id)
+        kwargs = {
+            'uuid': geo.dataset.uuid,
+            'admin_level': geo.level
+        }
+        scheme = versioning.NamespaceVersioning
+        view = EntityListByAdminLevel.as_view(versioning_class=scheme)
+        request = self.factory.get(
+            reverse('v1:search-entity-by-level', kwargs=kwargs) +
+            '/?cached=False&geom=full_geom&precision=2'
+        )
+        request.resolver_match = FakeResolverMatchV1
+        request.user = self.superuser
+        response = view(request, **kwargs)
+        self.assertEqual(response.status_code, 200)
+        response.render()
+        data = json.loads(response.content)
+        item = next(
+            (result for result in data['results'] if
+             result['ucode'] == geo.ucode),
+            None
+        )
+        self.assertTrue(item)
+        self.check_response(item, geo, geom_type='geometry')
+        self.assertEqual(item['geometry']['type'], geo.geometry.geom_type)
+        coords = item['geometry']['coordinates']
+        while isinstance(coords[0], list):
+            coords = coords[0]
+        for coord in coords:
+            self.assertEqual(coord, round(coord, 2))
+
+    def test_get_entity_list_from_read_model(self):
+        kwargs = {
+            'uuid': self.dataset.uuid,
+            'admin_level': 0
+        }
+        scheme = versioning.NamespaceVersioning
+        view = EntityListByAdminLevel.as_view(versioning_class=scheme)
+        responses = []
+        for format in ['json', 'geojson']:
+            request = self.factory.get(
+                reverse('v1:search-entity-by-level', kwargs=kwargs) +
+                f'?cached=False&format={format}'
+            )
+            request.resolver_match = FakeResolverMatchV1
+            request.user = self.superuser
+            response = view(request, **kwargs)
+            self.assertEqual(response.status_code, 200)
+            responses.append(response.data)
+        generate_entity_read_model(self.dataset)
+        self.dataset.refresh_from_db()
+        self.assertIsNotNone(self.dataset.read_model_generated_at)
+        self.assertTrue(
+            EntityReadModel.objects.filter(
+                geographical_entity=self.geographical_entity
+            ).exists()
+        )
+        for idx, format in enumerate(['json', 'geojson']):
+            request = self.factory.get(
+                reverse('v1:search-entity-by-level', kwargs=kwargs) +
+                f'?cached=False&format={format}'
+            )
+            request.resolver_match = FakeResolverMatchV1
+            request.user = self.superuser
+            response = view(request, **kwargs)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(
+                json.loads(json.dumps(response.data)),
+                json.loads(json.dumps(responses[idx]))
+            )
+
+    def test_read_model_output_matches_legacy(self):
+        dataset = DatasetF.create()
+        iso_code = IdType.objects.create(name='ISO3')
+        country = GeographicalEntityF.create(
+            uuid=str(uuid.uuid4()),
+            type=EntityTypeF.create(label='Country'),
+            level=0,
+            dataset=dataset,
+            internal_code='PAK',
+            unique_code='PAK',
+            is_approved=True,
+            is_latest=True,
+            start_date=isoparse('2023-01-01T06:16:13Z'),
+            concept_ucode='#PAK_1'
+        )
+        # parent without codes is padded at its level
+        province = GeographicalEntityF.create(
+            uuid=str(uuid.uuid4()),
+            type=EntityTypeF.create(label='Province'),
+            level=1,
+            dataset=dataset,
+            parent=country,
+            internal_code='',
+            unique_code='PAK_001',
+            is_approved=True,
+            is_latest=True,
+            start_date=isoparse('2023-01-01T06:16:13Z'),
+            concept_ucode='#PAK_001_1'
+        )
+        district_type = EntityTypeF.create(label='District')
+        district_1 = GeographicalEntityF.create(
+            uuid=str(uuid.uuid4()),
+            type=district_type,
+            level=2,
+            dataset=dataset,
+            parent=province,
+            internal_code='PAK001001',
+            unique_code='PAK_001_001',
+            is_approved=True,
+            is_latest=True,
+            start_date=isoparse('2023-01-01T06:16:13Z'),
+            concept_ucode='#PAK_001_001_1'
+        )
+        district_2 = GeographicalEntityF.create(
+            uuid=str(uuid.uuid4()),
+            type=district_type,
+            level=2,
+            dataset=dataset,
+            parent=province,
+            internal_code='PAK001002',
+            unique_code='PAK_001_002',
+            is_approved=True,
+            is_latest=True,
+            start_date=isoparse('2023-01-01T06:16:13Z'),
+            concept_ucode='#PAK_001_002_1'
+        )
+        # id type with lower id is missing in the first district
+        EntityIdF.create(
+            code=iso_code,
+            geographical_entity=district_1,
+            default=False,
+            value='ISO001'
+        )
+        EntityIdF.create(
+            code=self.pCode,
+            geographical_entity=district_2,
+            default=True,
+            value=district_2.internal_code
+        )
+        kwargs = {
+            'uuid': dataset.uuid,
+            'admin_level': 2
+        }
+        scheme = versioning.NamespaceVersioning
+        view = EntityListByAdminLevel.as_view(versioning_class=scheme)
+        formats = ['json', 'geojson']
+        responses = []
+        for format in formats:
+            request = self.factory.get(
+                reverse('v1:search-entity-by-level', kwargs=kwargs) +
+                f'?cached=False&format={format}'
+            )
+            request.resolver_match = FakeResolverMatchV1
+            request.user = self.superuser
+            response = view(request, **kwargs)
+            self.assertEqual(response.status_code, 200)
+            responses.append(json.dumps(response.data))
+        generate_entity_read_model(dataset)
+        for idx, format in enumerate(formats):
+            request = self.factory.get(
+                reverse('v1:search-entity-by-level', kwargs=kwargs) +
+                f'?cached=False&format={format}'
+            )
+            request.resolver_match = FakeResolverMatchV1
+            request.user = self.superuser
+            response = view(request, **kwargs)
+            self.assertEqual(response.status_code, 200)
+            # compare the key order as well
+            self.assertEqual(json.dumps(response.data), responses[idx])
+
+    def test_get_entity_list_by_cursor(self):
+        dataset = DatasetF.create()
+        entity_type = EntityType.objects.get_by_label('Country')
+        for idx in range(3):
+            GeographicalEntityF.create(
+                uuid=str(uuid.uuid4()),
+                type=entity_type,
+                level=0,
+                dataset=dataset,
+                internal_code=f'PAK{idx}',
+                unique_code=f'PAK{idx}',
+                unique_code_version=1,
+                is_approved=True,
+                is_latest=True,
+                start_date=isoparse('2023-01-01T06:16:13Z'),
+                concept_ucode=f'#PAK{idx}_1'
+            )
+        kwargs = {
+            'uuid': dataset.uuid,
+            'admin_level': 0
+        }
+        scheme = versioning.NamespaceVersioning
+        view = EntityListByAdminLevel.as_view(versioning_class=scheme)
+        request = self.factory.get(
+            reverse('v1:search-entity-by-level', kwargs=kwargs) +
+            '?cached=False&page_size=2&cursor=&include_count=true'
+        )
+        request.resolver_match = FakeResolverMatchV1
+        request.user = self.superuser
+        response = view(request, **kwargs)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertEqual(response.data['total_count'], 3)
+        self.assertEqual(response.data['results'][0]['ucode'], 'PAK0_V1')
+        self.assertTrue(response.data['next'])
+        request = self.factory.get(
+            reverse('v1:search-entity-by-level', kwargs=kwargs) +
+            f'?cached=False&page_size=2&cursor={response.data["next"]}'
+        )
+        request.resolver_match = FakeResolverMatchV1
+        request.user = self.superuser
+        response = view(request, **kwargs)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['ucode'], 'PAK2_V1')
+        self.assertEqual(response.data['next'], '')
+        self.assertNotIn('total_count', response.data)
+        # invalid cursor
+        request = self.factory.get(
+            reverse('v1:search-entity-by-level', kwargs=kwargs) +
+            '?cached=False&cursor=invalid'
+        )
+        request.resolver_match = FakeResolverMatchV1
+        request.user = self.superuser
+        response = view(request, **kwargs)
+        self.assertEqual(response.status_code, 400)
+
     def test_entity_bounding_box(self):
         # found is_approved and is_latest
         pcode_0 = 'PAK'
@@ -630,6 +869,97 @@ class TestApiEntity(EntityResponseChecker, TestCase):
         response = view(request, **kwargs)
         self.assertEqual(response.status_code, 200)
         self.assertIn('ucode', response.data['features'][0]['properties'])
+        # multiple features are checked in single query
+        data_4 = {
+            'type': 'FeatureCollection',
+            'features': (
+                data_2['features'] + data_3['features'] + data_2['features']
+            )
+        }
+        request = self.factory.post(
+            reverse(
+                'v1:entity-containment-check',
+                kwargs=kwargs
+            ),
+            data=data_4,
+            format='json'
+        )
+        request.user = self.superuser
+        view = EntityContainmentCheck.as_view()
+        response = view(request, **kwargs)
+        self.assertEqual(response.status_code, 200)
+        features = response.data['features']
+        self.assertEqual(len(features), 3)
+        self.assertNotIn('ucode', features[0].get('properties', {}))
+        self.assertIn('ucode', features[1]['properties'])
+        self.assertNotIn('ucode', features[2].get('properties', {}))
+
+    def test_point_lookup(self):
+        point = self.geographical_entity.geometry.point_on_surface
+        kwargs = {
+            'uuid': str(self.dataset.uuid),
+            'id_type': 'PCode'
+        }
+        data = {
+            'points': [
+                [point.x, point.y],
+                [0, 0]
+            ]
+        }
+        # without subdivided geometry
+        request = self.factory.post(
+            reverse('v1:entity-point-lookup', kwargs=kwargs),
+            data=data,
+            format='json'
+        )
+        request.user = self.superuser
+        view = EntityPointLookup.as_view()
+        response = view(request, **kwargs)
+        self.assertEqual(response.status_code, 200)
+        results = response.data['results']
+        self.assertEqual(len(results), 2)
+        self.assertEqual(len(results[0]), 1)
+        self.assertEqual(results[0][0]['PCode'], 'PAK')
+        self.assertEqual(results[0][0]['admin_level'], 0)
+        self.assertEqual(results[1], [])
+        # using subdivided geometry
+        generate_subdivided_geometry(self.dataset)
+        self.assertTrue(
+            self.geographical_entity.subdivided_geometries.exists()
+        )
+        request = self.factory.post(
+            reverse('v1:entity-point-lookup', kwargs=kwargs),
+            data=data,
+            format='json'
+        )
+        request.user = self.superuser
+        response = view(request, **kwargs)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['results'], results)
+        # csv file
+        csv_file = SimpleUploadedFile(
+            'points.csv',
+            f'id,lon,lat\n1,{point.x},{point.y}\n2,0,0\n'.encode('utf-8'),
+            content_type='text/csv'
+        )
+        request = self.factory.post(
+            reverse('v1:entity-point-lookup', kwargs=kwargs),
+            data={'file': csv_file},
+            format='multipart'
+        )
+        request.user = self.superuser
+        response = view(request, **kwargs)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['results'], results)
+        # invalid points
+        request = self.factory.post(
+            reverse('v1:entity-point-lookup', kwargs=kwargs),
+            data={'points': [[200, 0]]},
+            format='json'
+        )
+        request.user = self.superuser
+        response = view(request, **kwargs)
+        self.assertEqual(response.status_code, 400)
 
     def test_entity_id_list(self):
         request = self.factory.get(
@@ -735,6 +1065,84 @@ class TestApiEntity(EntityResponseChecker, TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(len(response.data['results']), 0)
 
+    def test_entity_fuzzy_search_document(self):
+        generate_search_document(self.dataset)
+        self.dataset.refresh_from_db()
+        self.assertIsNotNone(self.dataset.search_document_generated_at)
+        view = EntityFuzzySearch.as_view()
+        # accent and case are ignored
+        for search_text in ['paktan', 'PAKÍSTAN']:
+            kwargs = {
+                'uuid': str(self.dataset.uuid),
+                'search_text': search_text
+            }
+            request = self.factory.get(
+                reverse('v1:entity-fuzzy-search-by-name', kwargs=kwargs)
+            )
+            request.user = self.superuser
+            response = view(request, **kwargs)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.data['results']), 1)
+            self.check_response(response.data['results'][0],
+                                self.geographical_entity,
+                                excluded_columns=['centroid', 'geometry'])
+        kwargs = {
+            'uuid': str(self.dataset.uuid),
+            'search_text': 'xyzxyz'
+        }
+        request = self.factory.get(
+            reverse('v1:entity-fuzzy-search-by-name', kwargs=kwargs)
+        )
+        request.user = self.superuser
+        response = view(request, **kwargs)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 0)
+
+    def test_entity_fuzzy_search_document_rank(self):
+        # child document contains the label of its ancestor
+        child = GeographicalEntityF.create(
+            dataset=self.dataset,
+            type=EntityTypeF.create(label='Province'),
+            level=1,
+            parent=self.geographical_entity,
+            ancestor=self.geographical_entity,
+            is_validated=True,
+            is_approved=True,
+            is_latest=True,
+            internal_code='PAK001',
+            label='Punjab',
+            unique_code='PAK_001',
+            start_date=isoparse('2023-01-01T06:16:13Z'),
+            concept_ucode='#PAK_001_1'
+        )
+        generate_search_document(self.dataset)
+        # output of search document uses the read model
+        generate_entity_read_model(self.dataset)
+        kwargs = {
+            'uuid': str(self.dataset.uuid),
+            'search_text': 'pakistan'
+        }
+        request = self.factory.get(
+            reverse('v1:entity-fuzzy-search-by-name', kwargs=kwargs)
+        )
+        request.user = self.superuser
+        view = EntityFuzzySearch.as_view()
+        response = view(request, **kwargs)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertEqual(
+            response.data['results'][0]['ucode'],
+            self.geographical_entity.ucode
+        )
+        self.assertEqual(
+            response.data['results'][1]['ucode'],
+            child.ucode
+        )
+        self.assertEqual(
+            response.data['results'][1]['parents'][0]['ucode'],
+            self.geographical_entity.ucode
+        )
+
     @mock.patch.object(
         EntityGeometryFuzzySearch, 'get_simplify_tolerance',
         mock.Mock(return_value=0.08))
@@ -788,6 +1196,59 @@ class TestApiEntity(EntityResponseChecker, TestCase):
         response = view(request, **kwargs)
         self.assertEqual(response.status_code, 200)
         self.assertEqual(len(response.data['results']), 0)
+        # candidates are filtered by simplified geometry of the level
+        tiling_config = DatasetTilingConfig.objects.create(
+            dataset=self.dataset,
+            zoom_level=0
+        )
+        AdminLevelTilingConfig.objects.create(
+            dataset_tiling_config=tiling_config,
+            level=self.geographical_entity.level,
+            simplify_tolerance=0.1
+        )
+        EntitySimplified.objects.create(
+            geographical_entity=self.geographical_entity,
+            simplify_tolerance=0.1,
+            simplified_geometry=(
+                self.geographical_entity.geometry.simplify(0.1)
+            )
+        )
+        request = self.factory.post(
+            reverse(
+                'v1:entity-fuzzy-search-by-geometry', kwargs=kwargs
+            ),
+            data=data_1,
+            format='json'
+        )
+        request.user = self.superuser
+        view = EntityGeometryFuzzySearch.as_view()
+        response = view(request, **kwargs)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 1)
+        self.check_response(response.data['results'][0],
+                            self.geographical_entity,
+                            excluded_columns=['centroid', 'geometry'])
+        # point input is searched using exact query
+        point = self.geographical_entity.geometry.point_on_surface
+        request = self.factory.post(
+            reverse(
+                'v1:entity-fuzzy-search-by-geometry', kwargs=kwargs
+            ),
+            data={
+                'type': 'Feature',
+                'properties': {},
+                'geometry': json.loads(point.json)
+            },
+            format='json'
+        )
+        request.user = self.superuser
+        view = EntityGeometryFuzzySearch.as_view()
+        response = view(request, **kwargs)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 1)
+        self.check_response(response.data['results'][0],
+                            self.geographical_entity,
+                            excluded_columns=['centroid', 'geometry'])
 
     def test_search_entity_by_id(self):
         dataset = DatasetF.create()
@@ -870,6 +1331,33 @@ class TestApiEntity(EntityResponseChecker, TestCase):
         self.check_response(response.data['results'][0],
                             geo,
                             excluded_columns=['centroid', 'geometry'])
+        # parents are padded up to the max level of the dataset
+        GeographicalEntityF.create(
+            uuid=uuid.uuid4(),
+            type=EntityTypeF.create(label='District'),
+            level=2,
+            dataset=dataset,
+            parent=geo,
+            internal_code='PAK0001001',
+            unique_code='PAK_0001_001',
+            unique_code_version=1,
+            is_approved=True,
+            is_latest=True,
+            start_date=isoparse('2023-01-01T06:16:13Z'),
+            concept_ucode='#PAK0_3'
+        )
+        request = self.factory.get(
+            reverse('v1:search-entity-by-id', kwargs=kwargs) +
+            '/?format=geojson'
+        )
+        request.user = self.superuser
+        request.resolver_match = FakeResolverMatchV1
+        response = view(request, **kwargs)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['features']), 1)
+        properties = response.data['features'][0]['properties']
+        self.assertIn('adm1_ucode', properties)
+        self.assertIsNone(properties['adm1_ucode'])
         # search by invalid uuid
         kwargs = {
             'uuid': dataset.uuid,
@@ -887,6 +1375,75 @@ class TestApiEntity(EntityResponseChecker, TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(len(response.data['results']), 0)
 
+    def test_search_entity_by_id_batch(self):
+        geo = GeographicalEntity.objects.get(id=self.geographical_entity.id)
+        scheme = versioning.NamespaceVersioning
+        view = EntityBatchLookup.as_view(versioning_class=scheme)
+        # search by ucode
+        kwargs = {
+            'uuid': self.dataset.uuid,
+            'id_type': 'ucode'
+        }
+        request = self.factory.post(
+            reverse('v1:search-entity-by-id-batch', kwargs=kwargs),
+            data={
+                'ids': [geo.ucode, 'XYZ_V1', 'invalid']
+            },
+            format='json'
+        )
+        request.user = self.superuser
+        request.resolver_match = FakeResolverMatchV1
+        response = view(request, **kwargs)
+        self.assertEqual(response.status_code, 200)
+        results = response.data['results']
+        self.assertEqual(len(results), 3)
+        self.assertEqual(len(results[geo.ucode]), 1)
+        self.check_response(results[geo.ucode][0], geo,
+                            excluded_columns=['centroid', 'geometry'])
+        self.assertIsNone(results['XYZ_V1'])
+        self.assertIsNone(results['invalid'])
+        # search by PCode
+        kwargs = {
+            'uuid': self.dataset.uuid,
+            'id_type': self.pCode.name
+        }
+        request = self.factory.post(
+            reverse('v1:search-entity-by-id-batch', kwargs=kwargs),
+            data={
+                'ids': [geo.internal_code, 'XYZ']
+            },
+            format='json'
+        )
+        request.user = self.superuser
+        request.resolver_match = FakeResolverMatchV1
+        response = view(request, **kwargs)
+        self.assertEqual(response.status_code, 200)
+        results = response.data['results']
+        self.assertEqual(len(results[geo.internal_code]), 1)
+        self.assertEqual(
+            results[geo.internal_code][0]['ucode'], geo.ucode)
+        self.assertIsNone(results['XYZ'])
+        # invalid payload
+        request = self.factory.post(
+            reverse('v1:search-entity-by-id-batch', kwargs=kwargs),
+            data={
+                'ids': 'PAK'
+            },
+            format='json'
+        )
+        request.user = self.superuser
+        request.resolver_match = FakeResolverMatchV1
+        response = view(request, **kwargs)
+        self.assertEqual(response.status_code, 400)
+        # ids are only accepted from POST payload
+        request = self.factory.get(
+            reverse('v1:search-entity-by-id-batch', kwargs=kwargs)
+        )
+        request.user = self.superuser
+        request.resolver_match = FakeResolverMatchV1
+        response = view(request, **kwargs)
+        self.assertEqual(response.status_code, 405)
+
     def test_search_entity_by_concept_uuid(self):
         dataset = DatasetF.create()
         entity_type0 = EntityType.objects.get_by_label('Country')
@@ -1,4 +1,4 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.contrib.auth.models import Group
 from guardian.core import ObjectPermissionChecker
 from core.models.preferences import SitePreferences
@@ -12,6 +12,7 @@ from georepo.utils.permission import (
     grant_dataset_manager,
     grant_dataset_viewer,
     grant_dataset_to_public_groups,
+    get_views_for_user,
     revoke_module_writer,
     revoke_dataset_access,
     revoke_datasetview_external_viewer
@@ -186,3 +187,67 @@ class PermissionTestCase(TestCase):
         revoke_datasetview_external_viewer(dataset_view, self.user2)
         self.assert_dataset_view_privacy_level(dataset, self.user2,
                                                0, dataset_view)
+
+    @override_settings(CACHES={
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'
+        }
+    })
+    def test_privacy_level_cache(self):
+        dataset = DatasetF.create()
+        dataset_view = DatasetViewF.create(
+            dataset=dataset
+        )
+        group = Group.objects.create(name='privacy_level_test')
+        self.assert_dataset_view_privacy_level(dataset, self.user1, 0)
+        # inherit from group
+        grant_dataset_viewer(dataset, group, 2)
+        self.assert_dataset_view_privacy_level(dataset, self.user1, 0)
+        self.user1.groups.add(group)
+        self.assert_dataset_view_privacy_level(dataset, self.user1, 2)
+        # user permission has higher level than group
+        grant_dataset_viewer(dataset, self.user1, 3)
+        self.assert_dataset_view_privacy_level(dataset, self.user1, 3)
+        grant_datasetview_external_viewer(dataset_view, self.user1, 4)
+        self.assert_dataset_view_privacy_level(dataset, self.user1,
+                                               4, dataset_view)
+        revoke_datasetview_external_viewer(dataset_view, self.user1)
+        revoke_dataset_access(dataset, self.user1)
+        self.assert_dataset_view_privacy_level(dataset, self.user1,
+                                               2, dataset_view)
+        self.user1.groups.remove(group)
+        self.assert_dataset_view_privacy_level(dataset, self.user1,
+                                               0, dataset_view)
+
+    def test_get_views_for_user(self):
+        dataset_1 = DatasetF.create()
+        dataset_2 = DatasetF.create()
+        view_1 = DatasetViewF.create(
+            dataset=dataset_1,
+            min_privacy_level=1
+        )
+        view_2 = DatasetViewF.create(
+            dataset=dataset_1,
+            min_privacy_level=3
+        )
+        view_3 = DatasetViewF.create(
+            dataset=dataset_2,
+            min_privacy_level=4
+        )
+        grant_dataset_viewer(dataset_1, self.user1, 2)
+        privacy_levels, views = get_views_for_user(self.user1)
+        self.assertEqual(privacy_levels, {dataset_1.id: 2})
+        self.assertEqual(list(views), [view_1])
+        self.assertNotIn(view_2, views)
+        # external view is included regardless of dataset privacy level
+        grant_datasetview_external_viewer(view_3, self.user1, 1)
+        privacy_levels, views = get_views_for_user(self.user1)
+        self.assertEqual(privacy_levels, {dataset_1.id: 2})
+        self.assertEqual(
+            sorted([view.id for view in views]),
+            sorted([view_1.id, view_3.id])
+        )
+        # no access
+        privacy_levels, views = get_views_for_user(self.user2)
+        self.assertEqual(privacy_levels, {})
+        self.assertFalse(views.exists())
@@ -0,0 +1,66 @@
+import base64
+import hashlib
+from urllib.parse import urlparse, parse_qs
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory
+
+from georepo.models.dataset_view import DatasetViewResource
+from georepo.serializers.dataset_view import DatasetViewItemSerializer
+from georepo.tests.model_factories import DatasetViewF
+from georepo.utils.tile_signature import (
+    get_signature_expiry,
+    get_signed_tile_url_params,
+    sign_tile_path
+)
+
+
+@override_settings(
+    TILE_URL_SIGNING_KEY='test-key',
+    TILE_URL_SIGNATURE_TTL=3600
+)
+class TestTileSignature(TestCase):
+
+    def test_signature_expiry(self):
+        now = 7200 + 100
+        expires = get_signature_expiry(now)
+        self.assertEqual(expires, 4 * 3600)
+        self.assertGreaterEqual(expires - now, 3600)
+        # stable within the window
+        self.assertEqual(get_signature_expiry(7200 + 3500), expires)
+
+    def test_sign_tile_path(self):
+        # same as nginx secure_link_md5
+        expected = base64.urlsafe_b64encode(
+            hashlib.md5(
+                b'1000/layer_tiles/abc/ test-key'
+            ).digest()
+        ).decode('utf-8').rstrip('=')
+        self.assertEqual(sign_tile_path('abc', 1000), expected)
+        self.assertNotEqual(sign_tile_path('abd', 1000), expected)
+        self.assertNotEqual(sign_tile_path('abc', 1001), expected)
+
+    @override_settings(TILE_URL_SIGNING_KEY='')
+    def test_signing_disabled(self):
+        self.assertEqual(get_signed_tile_url_params('abc'), '')
+
+    def test_signed_vector_tile_url(self):
+        dataset_view = DatasetViewF.create()
+        resource = DatasetViewResource.objects.filter(
+            dataset_view=dataset_view,
+            privacy_level=4
+        ).first()
+        resource.vector_tiles_size = 100
+        resource.vector_tiles_updated_at = timezone.now()
+        resource.save()
+        request = APIRequestFactory().get('/')
+        url = DatasetViewItemSerializer(
+            context={'request': request}
+        ).vector_tile_url(resource)
+        self.assertIn('/{z}/{x}/{y}', url)
+        params = parse_qs(urlparse(url).query)
+        expires = int(params['exp'][0])
+        self.assertEqual(
+            params['sig'][0],
+            sign_tile_path(resource.uuid, expires)
+        )
@@ -1,4 +1,5 @@
 import mock
+from django.db import connection
 from django.test import TestCase
 from georepo.models.dataset_view import (
     DatasetView,
@@ -6,10 +7,11 @@ from georepo.models.dataset_view import (
     DATASET_VIEW_ALL_VERSIONS_TAG,
     DATASET_VIEW_DATASET_TAG,
     DATASET_VIEW_SUBSET_TAG,
-    DatasetViewResource
+    DatasetViewResource,
+    DatasetViewEntity
 )
 from georepo.tests.model_factories import (
-    DatasetF, GeographicalEntityF
+    DatasetF, GeographicalEntityF, DatasetViewF
 )
 from georepo.utils.dataset_view import (
     generate_default_view_dataset_latest,
@@ -18,8 +20,26 @@ from georepo.utils.dataset_view import (
     generate_default_view_adm0_all_versions,
     check_view_exists,
     trigger_generate_dynamic_views,
-    get_view_resource_from_view
+    get_view_resource_from_view,
+    get_entities_count_in_view,
+    generate_view_membership,
+    view_entity_ids_sql,
+    create_sql_view,
+    check_materialized_view_exists,
+    has_unique_index,
+    refresh_static_view,
+    generate_view_statistics,
+    trigger_generate_vector_tile_for_view,
+    ensure_sql_views,
+    refresh_dynamic_views_membership
 )
+from georepo.utils.view_registry import (
+    get_sql_view_kinds,
+    REGULAR_VIEW,
+    MATERIALIZED_VIEW,
+    MISSING_VIEW
+)
+from dashboard.tasks.export import is_vector_tiles_task_superseded
 
 
 class DummyTask:
@@ -341,6 +361,186 @@ class TestToolsDatasetView(TestCase):
         trigger_generate_dynamic_views(dataset, adm0, export_data=False)
         mocked_task.assert_called()
 
+    def test_generate_view_membership(self):
+        dataset = DatasetF.create(
+            label='World'
+        )
+        GeographicalEntityF.create(
+            label='Pakistan',
+            unique_code='PAK',
+            dataset=dataset,
+            level=0,
+            privacy_level=2,
+            is_latest=True,
+            is_approved=True
+        )
+        view = generate_default_view_dataset_latest(dataset)[0]
+        self.assertIsNotNone(view.membership_generated_at)
+        self.assertIn('georepo_datasetviewentity', view_entity_ids_sql(view))
+        memberships = DatasetViewEntity.objects.filter(dataset_view=view)
+        self.assertEqual(memberships.count(), 1)
+        self.assertEqual(memberships.first().privacy_level, 2)
+        self.assertEqual(memberships.first().level, 0)
+        # new entity is not in the view until membership is refreshed
+        GeographicalEntityF.create(
+            label='Syria',
+            unique_code='SY',
+            dataset=dataset,
+            level=0,
+            privacy_level=4,
+            is_latest=True,
+            is_approved=True
+        )
+        self.assertEqual(get_entities_count_in_view(view, 4), 0)
+        generate_view_membership(view)
+        self.assertEqual(memberships.count(), 2)
+        self.assertEqual(get_entities_count_in_view(view, 4), 1)
+        # dataset patch refreshes membership of dynamic views
+        memberships.delete()
+        refresh_dynamic_views_membership(dataset)
+        self.assertEqual(memberships.count(), 2)
+        # membership is narrowed by privacy level and level
+        with connection.cursor() as cursor:
+            cursor.execute(view_entity_ids_sql(view, privacy_level=2))
+            self.assertEqual(len(cursor.fetchall()), 1)
+            cursor.execute(
+                view_entity_ids_sql(view, privacy_level=4, level=1))
+            self.assertEqual(len(cursor.fetchall()), 0)
+        # view without membership selects ids from the sql view
+        view.membership_generated_at = None
+        self.assertEqual(
+            view_entity_ids_sql(view),
+            f'SELECT id from "{str(view.uuid)}"'
+        )
+
+    def test_static_view_refresh(self):
+        dataset = DatasetF.create(
+            label='World'
+        )
+        GeographicalEntityF.create(
+            label='Pakistan',
+            unique_code='PAK',
+            dataset=dataset,
+            level=0,
+            is_latest=True,
+            is_approved=True
+        )
+        view = DatasetViewF.create(
+            dataset=dataset,
+            is_static=True,
+            query_string=(
+                'SELECT * FROM georepo_geographicalentity where '
+                f'dataset_id={dataset.id}'
+            )
+        )
+        create_sql_view(view)
+        view_name = str(view.uuid)
+        self.assertTrue(check_materialized_view_exists(view_name))
+        self.assertFalse(check_materialized_view_exists(f'{view_name}_tmp'))
+        self.assertTrue(has_unique_index(view_name))
+        self.assertEqual(get_entities_count_in_view(view, 4), 1)
+        # rebuild view with the same name
+        create_sql_view(view)
+        self.assertTrue(check_materialized_view_exists(view_name))
+        self.assertTrue(has_unique_index(view_name))
+        GeographicalEntityF.create(
+            label='Syria',
+            unique_code='SY',
+            dataset=dataset,
+            level=0,
+            is_latest=True,
+            is_approved=True
+        )
+        self.assertEqual(get_entities_count_in_view(view, 4), 1)
+        refresh_static_view(view)
+        self.assertEqual(get_entities_count_in_view(view, 4), 2)
+
+    def test_generate_view_statistics(self):
+        dataset = DatasetF.create(
+            label='World'
+        )
+        adm0 = GeographicalEntityF.create(
+            label='Pakistan',
+            unique_code='PAK',
+            dataset=dataset,
+            level=0,
+            privacy_level=2,
+            is_latest=True,
+            is_approved=True
+        )
+        GeographicalEntityF.create(
+            label='PAK_001',
+            unique_code='PAK_001',
+            dataset=dataset,
+            level=1,
+            privacy_level=4,
+            parent=adm0,
+            ancestor=adm0,
+            is_latest=True,
+            is_approved=True
+        )
+        view = generate_default_view_dataset_latest(dataset)[0]
+        generate_view_statistics(view)
+        view.refresh_from_db()
+        self.assertEqual(view.min_privacy_level, 2)
+        self.assertEqual(view.max_privacy_level, 4)
+        resources = {
+            resource.privacy_level: resource for resource in
+            view.datasetviewresource_set.all()
+        }
+        self.assertIsNotNone(resources[1].statistics_updated_at)
+        self.assertEqual(resources[1].statistics_entity_count, 0)
+        self.assertEqual(resources[1].levels, [])
+        self.assertEqual(resources[1].bbox, '')
+        self.assertEqual(resources[2].statistics_entity_count, 1)
+        self.assertEqual(resources[2].levels, [0])
+        self.assertEqual(resources[3].statistics_entity_count, 0)
+        self.assertEqual(resources[3].levels, [0])
+        self.assertEqual(resources[4].statistics_entity_count, 1)
+        self.assertEqual(resources[4].levels, [0, 1])
+        self.assertEqual(
+            resources[4].statistics_entity_count,
+            get_entities_count_in_view(view, 4)
+        )
+        # resource without vector tiles is not handed out to clients
+        self.assertEqual(resources[4].entity_count, 0)
+        self.assertIsNone(get_view_resource_from_view(view, 4))
+
+    @mock.patch(
+        'dashboard.tasks.generate_view_vector_tiles_task.apply_async'
+    )
+    @mock.patch('georepo.utils.dataset_view.app.control.revoke')
+    def test_trigger_generate_vector_tile_coalesced(self, mocked_revoke,
+                                                    mocked_task):
+        mocked_revoke.side_effect = mocked_revoke_running_task
+        mocked_task.side_effect = mocked_run_generate_vector_tiles
+        dataset = DatasetF.create(
+            label='World'
+        )
+        view = generate_default_view_dataset_latest(dataset)[0]
+        trigger_generate_vector_tile_for_view(view, export_data=True)
+        resource = view.datasetviewresource_set.get(privacy_level=4)
+        first_task_id = resource.vector_tiles_task_id
+        self.assertTrue(resource.vector_tiles_export_data)
+        self.assertFalse(
+            is_vector_tiles_task_superseded(resource, first_task_id))
+        mocked_task.reset_mock()
+        # pending task is superseded and keeps exporting data
+        trigger_generate_vector_tile_for_view(view, export_data=False)
+        resource.refresh_from_db()
+        self.assertNotEqual(resource.vector_tiles_task_id, first_task_id)
+        self.assertTrue(resource.vector_tiles_export_data)
+        self.assertTrue(
+            is_vector_tiles_task_superseded(resource, first_task_id))
+        mocked_revoke.assert_called()
+        args, kwargs = mocked_task.call_args
+        self.assertTrue(args[0][1])
+        self.assertIn('countdown', kwargs)
+        self.assertIn(
+            kwargs['task_id'],
+            view.datasetviewresource_set.values_list(
+                'vector_tiles_task_id', flat=True)
+        )
 
     def test_get_view_resource_from_view(self):
         dataset = DatasetF.create(
@@ -385,3 +585,38 @@ class TestToolsDatasetView(TestCase):
         result = get_view_resource_from_view(view, 4)
         self.assertTrue(result)
         self.assertEqual(result.resource_id, resource_2.resource_id)
+
+    def test_sql_view_registry(self):
+        dataset = DatasetF.create(
+            label='World'
+        )
+        query_string = (
+            'SELECT * FROM georepo_geographicalentity where '
+            f'dataset_id={dataset.id}'
+        )
+        dynamic_view = DatasetViewF.create(
+            dataset=dataset,
+            query_string=query_string
+        )
+        static_view = DatasetViewF.create(
+            dataset=dataset,
+            is_static=True,
+            query_string=query_string
+        )
+        view_names = [str(dynamic_view.uuid), str(static_view.uuid)]
+        kinds = get_sql_view_kinds(view_names)
+        self.assertEqual(kinds, {
+            str(dynamic_view.uuid): MISSING_VIEW,
+            str(static_view.uuid): MISSING_VIEW
+        })
+        ensure_sql_views([dynamic_view, static_view])
+        kinds = get_sql_view_kinds(view_names)
+        self.assertEqual(kinds, {
+            str(dynamic_view.uuid): REGULAR_VIEW,
+            str(static_view.uuid): MATERIALIZED_VIEW
+        })
+        self.assertTrue(check_view_exists(str(dynamic_view.uuid)))
+        self.assertFalse(check_view_exists(str(static_view.uuid)))
+        self.assertTrue(check_materialized_view_exists(str(static_view.uuid)))
+        dynamic_view.delete()
+        self.assertFalse(check_view_exists(view_names[0]))
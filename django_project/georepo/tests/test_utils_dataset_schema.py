@@ -0,0 +1,59 @@
+from django.test import TestCase
+
+from georepo.models import IdType
+from georepo.tests.model_factories import (
+    GeographicalEntityF, DatasetF, EntityIdF, EntityNameF, LanguageF
+)
+from georepo.utils.dataset_schema import get_dataset_schema
+
+
+class TestUtilsDatasetSchema(TestCase):
+
+    def setUp(self) -> None:
+        self.dataset = DatasetF.create()
+        self.pCode = IdType.objects.get(name='PCode')
+        self.language = LanguageF.create(code='EN', name='English')
+        self.parent = GeographicalEntityF.create(
+            dataset=self.dataset,
+            level=0,
+            is_approved=True,
+            is_latest=True,
+            internal_code='PAK'
+        )
+        self.entity = GeographicalEntityF.create(
+            dataset=self.dataset,
+            level=1,
+            parent=self.parent,
+            is_approved=True,
+            is_latest=True,
+            internal_code='PAK001'
+        )
+        EntityIdF.create(
+            code=self.pCode,
+            geographical_entity=self.entity,
+            default=True,
+            value='PAK001'
+        )
+        EntityNameF.create(
+            geographical_entity=self.entity,
+            name='Entity 1',
+            language=self.language,
+            idx=0
+        )
+        EntityNameF.create(
+            geographical_entity=self.entity,
+            name='Entity 1 ES',
+            language=self.language,
+            idx=1
+        )
+
+    def test_get_dataset_schema(self):
+        schema = get_dataset_schema(self.dataset)
+        self.assertEqual(schema['max_level'], 1)
+        self.assertEqual(schema['names']['idx__max'], 1)
+        self.assertEqual(len(schema['ids']), 1)
+        self.assertEqual(schema['ids'][0]['code__name'], 'PCode')
+        schema = get_dataset_schema(self.dataset, admin_level=0)
+        self.assertEqual(schema['max_level'], 0)
+        self.assertIsNone(schema['names']['idx__max'])
+        self.assertEqual(len(schema['ids']), 0)
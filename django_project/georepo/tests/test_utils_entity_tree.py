@@ -0,0 +1,100 @@
+from django.test import TestCase
+
+from georepo.models import GeographicalEntity
+from georepo.tests.model_factories import GeographicalEntityF, DatasetF
+from georepo.utils.entity_tree import build_entity_tree
+
+
+class TestUtilsEntityTree(TestCase):
+
+    def setUp(self) -> None:
+        self.dataset = DatasetF.create()
+        self.root = GeographicalEntityF.create(
+            dataset=self.dataset,
+            level=0,
+            internal_code='PAK',
+            is_approved=True,
+            is_latest=True
+        )
+        self.child_1 = GeographicalEntityF.create(
+            dataset=self.dataset,
+            level=1,
+            parent=self.root,
+            internal_code='PAK001',
+            is_approved=True,
+            is_latest=True
+        )
+        GeographicalEntityF.create(
+            dataset=self.dataset,
+            level=1,
+            parent=self.root,
+            internal_code='PAK002',
+            is_approved=True,
+            is_latest=True
+        )
+        GeographicalEntityF.create(
+            dataset=self.dataset,
+            level=2,
+            parent=self.child_1,
+            internal_code='PAK001001',
+            is_approved=True,
+            is_latest=True
+        )
+        # not latest entity is not listed
+        GeographicalEntityF.create(
+            dataset=self.dataset,
+            level=2,
+            parent=self.child_1,
+            internal_code='PAK001002',
+            is_approved=True,
+            is_latest=False
+        )
+
+    def test_build_entity_tree(self):
+        entities = GeographicalEntity.objects.filter(
+            dataset=self.dataset,
+            is_approved=True,
+            is_latest=True
+        ).order_by('internal_code').values(
+            'id', 'parent_id', 'internal_code'
+        )
+        expected = [
+            {'PAK001': ['PAK001001']},
+            'PAK002'
+        ]
+        trees = build_entity_tree(
+            [self.root.id],
+            entities,
+            lambda entity: entity['internal_code']
+        )
+        self.assertEqual(trees[self.root.id], expected)
+        # fetch subtree in single query
+        self.root.refresh_from_db()
+        trees = build_entity_tree(
+            [self.root.id],
+            entities.filter(
+                ancestry_path__descendant_of=self.root.ancestry_path
+            ).exclude(id=self.root.id),
+            lambda entity: entity['internal_code'],
+            is_subtree=True
+        )
+        self.assertEqual(trees[self.root.id], expected)
+
+    def test_build_entity_tree_with_listed_filter(self):
+        entities = GeographicalEntity.objects.filter(
+            dataset=self.dataset,
+            level__gte=1
+        ).order_by('internal_code').values(
+            'id', 'parent_id', 'internal_code', 'is_latest'
+        )
+        trees = build_entity_tree(
+            [self.root.id, self.child_1.id],
+            entities,
+            lambda entity: entity['internal_code'],
+            is_listed=lambda entity: entity['is_latest']
+        )
+        self.assertEqual(
+            trees[self.root.id],
+            [{'PAK001': ['PAK001001']}, 'PAK002']
+        )
+        self.assertEqual(trees[self.child_1.id], ['PAK001001'])
@@ -0,0 +1,68 @@
+import datetime
+from django.test import TestCase
+from django.utils import timezone
+
+from georepo.models import GeographicalEntity
+from georepo.tests.model_factories import GeographicalEntityF, DatasetF
+from georepo.utils.entity_validity import (
+    filter_entities_as_of,
+    parse_as_of
+)
+
+
+class TestUtilsEntityValidity(TestCase):
+
+    def setUp(self) -> None:
+        self.dataset = DatasetF.create()
+        self.v1 = GeographicalEntityF.create(
+            dataset=self.dataset,
+            level=0,
+            internal_code='PAK',
+            start_date=datetime.datetime(
+                2023, 1, 1, tzinfo=timezone.utc),
+            end_date=datetime.datetime(
+                2023, 2, 1, tzinfo=timezone.utc),
+            is_latest=False
+        )
+        self.v2 = GeographicalEntityF.create(
+            dataset=self.dataset,
+            level=0,
+            internal_code='PAK',
+            start_date=datetime.datetime(
+                2023, 2, 1, tzinfo=timezone.utc),
+            end_date=None,
+            is_latest=True
+        )
+
+    def find_as_of(self, value):
+        entities = GeographicalEntity.objects.filter(
+            dataset=self.dataset
+        )
+        return list(
+            filter_entities_as_of(
+                entities, parse_as_of(value)
+            ).values_list('id', flat=True)
+        )
+
+    def test_parse_as_of(self):
+        self.assertEqual(
+            parse_as_of('2023-01-15'),
+            datetime.datetime(2023, 1, 15, tzinfo=timezone.utc)
+        )
+        self.assertEqual(
+            parse_as_of('1673740800'),
+            datetime.datetime(2023, 1, 15, tzinfo=timezone.utc)
+        )
+        self.assertIsNone(parse_as_of('abc'))
+
+    def test_filter_entities_as_of(self):
+        self.assertEqual(self.find_as_of('2022-12-31'), [])
+        self.assertEqual(self.find_as_of('2023-01-15'), [self.v1.id])
+        # end date is exclusive
+        self.assertEqual(self.find_as_of('2023-02-01'), [self.v2.id])
+        self.assertEqual(self.find_as_of('2030-01-01'), [self.v2.id])
+        # validity is updated with end date
+        GeographicalEntity.objects.filter(id=self.v2.id).update(
+            end_date=datetime.datetime(2024, 1, 1, tzinfo=timezone.utc)
+        )
+        self.assertEqual(self.find_as_of('2030-01-01'), [])
@@ -0,0 +1,68 @@
+from django.contrib.gis.geos import GEOSGeometry
+from django.test import TestCase
+
+from georepo.models import GeographicalEntity
+from georepo.tests.model_factories import GeographicalEntityF, DatasetF
+from georepo.utils.geometry_metrics import (
+    ensure_geometry_metrics,
+    generate_geometry_metrics,
+    get_entity_bbox
+)
+
+
+class TestUtilsGeometryMetrics(TestCase):
+
+    def setUp(self) -> None:
+        self.dataset = DatasetF.create()
+        self.entity = GeographicalEntityF.create(
+            dataset=self.dataset,
+            level=0,
+            internal_code='PAK',
+            geometry=GEOSGeometry(
+                'POLYGON((0 0, 0 1, 1 1, 1 0, 0 0))',
+                srid=4326
+            )
+        )
+
+    def assert_metrics(self, entity: GeographicalEntity):
+        self.assertEqual(entity.bbox, [0, 0, 1, 1])
+        self.assertTrue(entity.geometry.contains(entity.point_on_surface))
+        # 1x1 degree at equator is about 12308 km2
+        self.assertAlmostEqual(entity.area, 12308, delta=10)
+        self.assertAlmostEqual(entity.perimeter, 443.8, delta=1)
+
+    def test_trigger(self):
+        entity = GeographicalEntity.objects.get(id=self.entity.id)
+        self.assert_metrics(entity)
+        # metrics are updated when geometry is changed
+        entity.geometry = GEOSGeometry(
+            'POLYGON((0 0, 0 2, 2 2, 2 0, 0 0))',
+            srid=4326
+        )
+        entity.save()
+        entity.refresh_from_db()
+        self.assertEqual(entity.bbox, [0, 0, 2, 2])
+        self.assertGreater(entity.area, 12308 * 3)
+
+    def test_generate_geometry_metrics(self):
+        # entities before the metrics were stored
+        GeographicalEntity.objects.filter(id=self.entity.id).update(
+            point_on_surface=None,
+            bbox=None,
+            area=None,
+            perimeter=None
+        )
+        self.assertEqual(generate_geometry_metrics(self.dataset), 1)
+        self.assert_metrics(
+            GeographicalEntity.objects.get(id=self.entity.id))
+        self.assertEqual(generate_geometry_metrics(self.dataset), 0)
+
+    def test_ensure_geometry_metrics(self):
+        GeographicalEntity.objects.filter(id=self.entity.id).update(
+            bbox=None,
+            area=None
+        )
+        entity = GeographicalEntity.objects.get(id=self.entity.id)
+        self.assertEqual(get_entity_bbox(entity), [0, 0, 1, 1])
+        ensure_geometry_metrics(entity)
+        self.assert_metrics(entity)
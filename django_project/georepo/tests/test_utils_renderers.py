@@ -0,0 +1,43 @@
+import json
+import uuid
+import datetime
+from decimal import Decimal
+from django.test import TestCase
+from rest_framework.renderers import JSONRenderer
+from georepo.utils.renderers import FastJSONRenderer, RawJSON
+
+
+class TestUtilsRenderers(TestCase):
+
+    def test_fast_json_renderer(self):
+        geom = '{"type":"Point","coordinates":[1.12,2.35]}'
+        data = {
+            'uuid': uuid.uuid4(),
+            'start_date': datetime.datetime(
+                2023, 1, 1, 6, 16, 13, 123456,
+                tzinfo=datetime.timezone.utc),
+            'area': Decimal('1.5'),
+            'codes': {
+                1: ['PAK']
+            },
+            'results': [{
+                'name': 'Pakistan',
+                'geometry': RawJSON(geom)
+            }]
+        }
+        content = FastJSONRenderer().render(data)
+        self.assertIn(geom.encode('utf-8'), content)
+        result = json.loads(content)
+        self.assertEqual(result['uuid'], str(data['uuid']))
+        self.assertEqual(
+            result['results'][0]['geometry'],
+            json.loads(geom)
+        )
+        # output of other types is the same as DRF JSONRenderer
+        del data['results']
+        del result['results']
+        self.assertEqual(
+            result,
+            json.loads(JSONRenderer().render(data))
+        )
+        self.assertEqual(FastJSONRenderer().render(None), b'')
@@ -28,7 +28,8 @@ from georepo.utils.dataset_view import (
     generate_default_view_dataset_latest
 )
 from georepo.utils.dataset_view import (
-    init_view_privacy_level
+    init_view_privacy_level,
+    generate_view_membership
 )
 
 
@@ -99,6 +100,7 @@ class TestVectorTile(TestCase):
                 default=False,
                 value=self.entity_1.id
             )
+        generate_view_membership(self.view_latest)
         init_view_privacy_level(self.view_latest)
         self.dataset_tconfig_1 = DatasetTilingConfig.objects.create(
             dataset=self.dataset,
@@ -24,6 +24,7 @@ from georepo.api_views.dataset_view import (
 )
 from georepo.api_views.entity_view import (
     FindViewEntityById,
+    ViewEntityBatchLookup,
     ViewEntityListByAdminLevel,
     ViewEntityListByAdminLevelAndUCode,
     ViewEntityListByEntityType,
@@ -34,6 +35,7 @@ from georepo.api_views.entity_view import (
     ViewFindEntityGeometryFuzzySearch,
     ViewEntityBoundingBox,
     ViewEntityContainmentCheck,
+    ViewEntityPointLookup,
     ViewEntityTraverseHierarchyByUCode,
     ViewEntityTraverseChildrenHierarchyByUCode,
     ViewEntityListByAdminLevel0,
@@ -44,6 +46,7 @@ from georepo.api_views.entity import (
     EntityTypeList,
     EntityIdList,
     EntityContainmentCheck,
+    EntityPointLookup,
     EntityFuzzySearch,
     EntityGeometryFuzzySearch,
     EntityList,
@@ -51,6 +54,7 @@ from georepo.api_views.entity import (
     EntityListByAdminLevel,
     EntityListByAdminLevelAndUCode,
     FindEntityById,
+    EntityBatchLookup,
     FindEntityVersionsByConceptUCode,
     FindEntityVersionsByUCode
 )
@@ -115,6 +119,10 @@ entity_urls = [
         '<id_type>/<path:id>/',
         FindEntityById.as_view(),
         name='search-entity-by-id'),
+    path(
+        'search/dataset/<uuid:uuid>/entity/batch/identifier/<id_type>/',
+        EntityBatchLookup.as_view(),
+        name='search-entity-by-id-batch'),
     re_path(
         r'search/dataset/(?P<uuid>[\da-f-]+)/entity/geometry/?$',
         EntityGeometryFuzzySearch.as_view(),
@@ -142,6 +150,11 @@ operation_entity_urls = [
         EntityContainmentCheck.as_view(),
         name='entity-containment-check'
     ),
+    path(
+        'operation/dataset/<uuid:uuid>/point-lookup/<id_type>/',
+        EntityPointLookup.as_view(),
+        name='entity-point-lookup'
+    ),
 ]
 
 view_urls = [
@@ -168,6 +181,10 @@ view_entity_urls = [
         'search/view/<uuid:uuid>/entity/identifier/<str:id_type>/<str:id>/',
         FindViewEntityById.as_view(),
         name='search-view-entity-by-id'),
+    path(
+        'search/view/<uuid:uuid>/entity/batch/identifier/<str:id_type>/',
+        ViewEntityBatchLookup.as_view(),
+        name='search-view-entity-by-id-batch'),
     re_path(
         r'search/view/(?P<uuid>[\da-f-]+)/entity/level/'
         r'(?P<admin_level>[\d]+)/?$',
@@ -240,6 +257,11 @@ operation_view_entity_urls = [
         ViewEntityContainmentCheck.as_view(),
         name='view-entity-containment-check'
     ),
+    path(
+        'operation/view/<uuid:uuid>/point-lookup/<id_type>/',
+        ViewEntityPointLookup.as_view(),
+        name='view-entity-point-lookup'
+    ),
 ]
 
 download_urls = [
@@ -0,0 +1,65 @@
+from django.db import connection
+from georepo.models.dataset import Dataset
+
+# update path of the subtree rows from the given root rows
+ANCESTRY_PATH_UPDATE_SQL = (
+    'WITH RECURSIVE tree AS ( '
+    '  SELECT gg.id, {root_path} AS path '
+    '  FROM georepo_geographicalentity gg '
+    '  {root_join} '
+    '  WHERE {root_condition} '
+    '  UNION ALL '
+    '  SELECT child.id, tree.path || child.id::text '
+    '  FROM georepo_geographicalentity child '
+    '  INNER JOIN tree ON child.parent_id = tree.id '
+    ') '
+    'UPDATE georepo_geographicalentity gg '
+    'SET ancestry_path = tree.path '
+    'FROM tree '
+    'WHERE gg.id = tree.id AND '
+    'gg.ancestry_path IS DISTINCT FROM tree.path'
+)
+
+
+def generate_ancestry_path(dataset: Dataset):
+    """
+    Regenerate materialized ancestry path of all entities in dataset.
+
+    Walk the parent chain from level 0 entities in a single recursive query
+    and only update the rows whose path is changed.
+    """
+    sql = ANCESTRY_PATH_UPDATE_SQL.format(
+        root_path='gg.id::text::ltree',
+        root_join='',
+        root_condition='gg.parent_id IS NULL AND gg.dataset_id = %s'
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [dataset.id])
+
+
+def generate_ancestry_path_of_entities(entities):
+    """
+    Regenerate materialized ancestry path of entities and their subtree.
+
+    Called when upload is approved, the path of the top entities in the
+    upload is derived from their parent path.
+    """
+    entity_ids = list(entities.values_list('id', flat=True))
+    if not entity_ids:
+        return
+    sql = ANCESTRY_PATH_UPDATE_SQL.format(
+        root_path=(
+            'CASE WHEN gg.parent_id IS NULL THEN gg.id::text::ltree '
+            'ELSE parent.ancestry_path || gg.id::text END'
+        ),
+        root_join=(
+            'LEFT JOIN georepo_geographicalentity parent '
+            'ON parent.id = gg.parent_id'
+        ),
+        root_condition=(
+            'gg.id = ANY(%s) AND '
+            '(gg.parent_id IS NULL OR NOT gg.parent_id = ANY(%s))'
+        )
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [entity_ids, entity_ids])
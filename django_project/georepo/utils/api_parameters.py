@@ -38,3 +38,68 @@ common_api_params = [
         **api_pagination_params
     )
 ]
+
+
+cursor_api_params = [
+    openapi.Parameter(
+        'cursor', openapi.IN_QUERY,
+        description=(
+            'Cursor pagination token from next field of previous page. '
+            'Pass empty cursor to get the first page. '
+            'When cursor is used, page parameter is ignored.'
+        ),
+        type=openapi.TYPE_STRING,
+        required=False
+    ), openapi.Parameter(
+        'include_count', openapi.IN_QUERY,
+        description='Include total_count in cursor pagination',
+        type=openapi.TYPE_BOOLEAN,
+        default=False,
+        required=False
+    )
+]
+
+
+geometry_api_params = [
+    openapi.Parameter(
+        'precision', openapi.IN_QUERY,
+        description=(
+            'Number of decimal places of coordinates in geometry output'
+        ),
+        type=openapi.TYPE_INTEGER,
+        minimum=0,
+        maximum=15,
+        required=False
+    ), openapi.Parameter(
+        'tolerance', openapi.IN_QUERY,
+        description=(
+            'Return simplified geometry with the given tolerance, '
+            'full geometry is returned if simplified geometry '
+            'does not exist'
+        ),
+        type=openapi.TYPE_NUMBER,
+        required=False
+    ), openapi.Parameter(
+        'zoom', openapi.IN_QUERY,
+        description=(
+            'Return simplified geometry of the tiling config '
+            'at the given zoom level'
+        ),
+        type=openapi.TYPE_INTEGER,
+        required=False
+    )
+]
+
+
+as_of_api_params = [
+    openapi.Parameter(
+        'as_of', openapi.IN_QUERY,
+        description=(
+            'Return entity revisions that are valid at the given date, '
+            'in ISO format or unix timestamp. '
+            'Default to the latest revision.'
+        ),
+        type=openapi.TYPE_STRING,
+        required=False
+    )
+]
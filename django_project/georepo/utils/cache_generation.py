@@ -0,0 +1,133 @@
+import time
+from django.core.cache import cache
+
+# prefix of generation counter in cache
+GENERATION_KEY_PREFIX = 'generation'
+# global scope that is included in every api cache key
+GLOBAL_SCOPE = 'global'
+# scope for list of views across datasets
+VIEW_LIST_SCOPE = 'views'
+# scope for permissions of all users and groups
+PERMISSION_SCOPE = 'permissions'
+
+
+def dataset_scope(dataset_uuid) -> str:
+    return f'dataset:{str(dataset_uuid)}'
+
+
+def dataset_views_scope(dataset_uuid) -> str:
+    return f'dataset_views:{str(dataset_uuid)}'
+
+
+def dataset_schema_scope(dataset_uuid) -> str:
+    return f'dataset_schema:{str(dataset_uuid)}'
+
+
+def module_scope(module_uuid) -> str:
+    return f'module:{str(module_uuid)}'
+
+
+def view_scope(view_uuid) -> str:
+    return f'view:{str(view_uuid)}'
+
+
+def _generation_key(scope: str) -> str:
+    return f'{GENERATION_KEY_PREFIX}:{scope}'
+
+
+def _new_generation() -> int:
+    """
+    Initial value of generation counter.
+
+    Use timestamp so that evicted counter will never be reset
+    into a generation that has been used before.
+    """
+    return time.time_ns()
+
+
+def get_generation(scope: str) -> int:
+    """Return current generation number of a scope."""
+    key = _generation_key(scope)
+    generation = cache.get(key)
+    if generation is None:
+        generation = _new_generation()
+        if not cache.add(key, generation, None):
+            generation = cache.get(key, generation)
+    return generation
+
+
+def get_generations(scopes) -> dict:
+    """Return generation numbers of multiple scopes in one cache call."""
+    keys = {_generation_key(scope): scope for scope in scopes}
+    generations = cache.get_many(list(keys.keys()))
+    results = {}
+    for key, scope in keys.items():
+        if key in generations and generations[key] is not None:
+            results[scope] = generations[key]
+        else:
+            results[scope] = get_generation(scope)
+    return results
+
+
+def get_cached_by_generation(scope: str, key: str):
+    """
+    Return (cached value, generation) of key in generation of scope.
+
+    Generation and value are fetched in one cache call,
+    cached value is None if it is from older generation of scope.
+    """
+    generation_key = _generation_key(scope)
+    cached_values = cache.get_many([generation_key, key])
+    generation = cached_values.get(generation_key, None)
+    if generation is None:
+        generation = get_generation(scope)
+    cached = cached_values.get(key, None)
+    if (
+        isinstance(cached, dict) and
+        cached.get('generation', None) == generation
+    ):
+        return cached['value'], generation
+    return None, generation
+
+
+def set_cached_by_generation(key: str, value, generation: int,
+                             timeout=None) -> None:
+    """Cache value that is valid until generation of the scope is bumped."""
+    cache.set(key, {
+        'generation': generation,
+        'value': value
+    }, timeout)
+
+
+def bump_generation(scope: str) -> None:
+    """Invalidate all cached responses of a scope in O(1)."""
+    key = _generation_key(scope)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # counter does not exist yet
+        cache.set(key, _new_generation(), None)
+
+
+def bump_dataset_generation(dataset, include_views: bool = False) -> None:
+    """
+    Bump generation of dataset and its module.
+
+    include_views should be True when the entities of dataset are changed,
+    e.g. upload is approved, so the responses from views are invalidated.
+    """
+    bump_generation(dataset_scope(dataset.uuid))
+    if dataset.module_id:
+        bump_generation(module_scope(dataset.module.uuid))
+    if include_views:
+        view_uuids = dataset.datasetview_set.values_list('uuid', flat=True)
+        for view_uuid in view_uuids:
+            bump_generation(view_scope(view_uuid))
+
+
+def bump_view_generation(dataset_view) -> None:
+    """Bump generation of dataset view and the view list."""
+    bump_generation(view_scope(dataset_view.uuid))
+    if dataset_view.dataset_id:
+        bump_generation(dataset_views_scope(dataset_view.dataset.uuid))
+    bump_generation(VIEW_LIST_SCOPE)
@@ -0,0 +1,82 @@
+from django.core.cache import cache
+from django.db.models import Max
+from georepo.models.dataset import Dataset
+from georepo.models.entity import (
+    GeographicalEntity,
+    EntityId,
+    EntityName
+)
+from georepo.utils.cache_generation import (
+    get_generation,
+    dataset_schema_scope
+)
+
+DATASET_SCHEMA_CACHE_TTL = 60 * 60 * 24
+
+
+def _generate_dataset_schema(dataset: Dataset, entity_type=None,
+                             admin_level=None, is_latest=None):
+    entity_filters = {
+        'geographical_entity__dataset_id': dataset.id,
+        'geographical_entity__is_approved': True
+    }
+    if entity_type:
+        entity_filters['geographical_entity__type'] = entity_type.id
+    if admin_level is not None:
+        entity_filters['geographical_entity__level'] = admin_level
+    if is_latest is not None:
+        entity_filters['geographical_entity__is_latest'] = is_latest
+    ids = EntityId.objects.filter(
+        **entity_filters
+    ).order_by('code').values(
+        'code__id', 'code__name', 'default'
+    ).distinct('code__id')
+    names_max_idx = EntityName.objects.filter(
+        **entity_filters
+    ).aggregate(
+        Max('idx')
+    )
+    entities = GeographicalEntity.objects.filter(
+        **{
+            key.replace('geographical_entity__', ''): value for
+            key, value in entity_filters.items()
+        }
+    )
+    max_level = entities.aggregate(Max('level'))['level__max']
+    return {
+        'ids': list(ids),
+        'names': names_max_idx,
+        'max_level': max_level if max_level is not None else 0
+    }
+
+
+def get_dataset_schema(dataset: Dataset, entity_type=None,
+                       admin_level=None, is_latest=None) -> dict:
+    """
+    Return schema descriptor of approved entities in dataset.
+
+    The descriptor contains:
+    - ids: id types that are used by the entities
+    - names: max index of entity names
+    - max_level: max admin level
+    The descriptor is cached until the schema generation of dataset
+    is bumped when upload is approved.
+    """
+    generation = get_generation(dataset_schema_scope(dataset.uuid))
+    cache_key = (
+        f'dataset_schema:{str(dataset.uuid)}:{generation}:'
+        f'{entity_type.id if entity_type else ""}:'
+        f'{admin_level if admin_level is not None else ""}:'
+        f'{is_latest if is_latest is not None else ""}'
+    )
+    schema = cache.get(cache_key)
+    if isinstance(schema, dict) and 'ids' in schema:
+        return schema
+    schema = _generate_dataset_schema(
+        dataset,
+        entity_type=entity_type,
+        admin_level=admin_level,
+        is_latest=is_latest
+    )
+    cache.set(cache_key, schema, DATASET_SCHEMA_CACHE_TTL)
+    return schema
@@ -1,12 +1,14 @@
 import re
 from math import isclose
+from uuid import uuid4
 from typing import List
-from django.db import connection
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
 from django.db.models import Avg
+from django.utils import timezone
 from celery.result import AsyncResult
 from core.celery import app
 from django.db.models.expressions import RawSQL
-from django.db.models import Max, Min
 from georepo.models.dataset import Dataset
 from georepo.models.dataset_view import (
     DatasetView,
@@ -14,10 +16,20 @@ from georepo.models.dataset_view import (
     DATASET_VIEW_ALL_VERSIONS_TAG,
     DATASET_VIEW_DATASET_TAG,
     DATASET_VIEW_SUBSET_TAG,
-    DatasetViewResource
+    DatasetViewResource,
+    DatasetViewEntity
 )
 from georepo.models.entity import GeographicalEntity
 from georepo.restricted_sql_commands import RESTRICTED_COMMANDS
+from georepo.utils.cache_generation import bump_generation, view_scope
+from georepo.utils.view_registry import (
+    MATERIALIZED_VIEW,
+    MISSING_VIEW,
+    REGULAR_VIEW,
+    get_sql_view_kind,
+    get_sql_view_kinds,
+    invalidate_sql_view
+)
 
 VIEW_LATEST_DESC = (
     'This dataset contains only the latest entities from main dataset'
@@ -55,6 +67,8 @@ def trigger_generate_dynamic_views(dataset: Dataset,
             # skip refresh if default_ancestor_code is not in adm0_list
             if dataset_view.default_ancestor_code not in adm0_list:
                 continue
+        # entities in dynamic view may change after approval
+        generate_view_membership(dataset_view)
         # update max and min privacy level of entities in view
         init_view_privacy_level(dataset_view)
         trigger_generate_vector_tile_for_view(dataset_view, export_data)
@@ -64,29 +78,58 @@ def trigger_generate_vector_tile_for_view(dataset_view: DatasetView,
                                           export_data: bool = True):
     """
     Trigger generate vector tiles for a view
+
+    Tasks are delayed by VIEW_VECTOR_TILES_DEBOUNCE seconds, so
+    requests of the same view in quick succession are coalesced into
+    the latest task.
     """
-    from dashboard.tasks import (
-        generate_view_vector_tiles_task
-    )
     view_resources = DatasetViewResource.objects.filter(
         dataset_view=dataset_view
     )
     for view_resource in view_resources:
-        if view_resource.vector_tiles_task_id:
-            res = AsyncResult(view_resource.vector_tiles_task_id)
-            if not res.ready():
-                # find if there is running task and stop it
-                app.control.revoke(view_resource.vector_tiles_task_id,
-                                   terminate=True)
-        view_resource.status = DatasetView.DatasetViewStatus.PENDING
-        view_resource.vector_tiles_progress = 0
-        view_resource.save()
-        task = generate_view_vector_tiles_task.apply_async(
-            (view_resource.id, export_data),
-            queue='tegola'
+        schedule_view_resource_vector_tiles(
+            view_resource,
+            export_data=export_data,
+            countdown=settings.VIEW_VECTOR_TILES_DEBOUNCE
         )
-        view_resource.vector_tiles_task_id = task.id
-        view_resource.save(update_fields=['vector_tiles_task_id'])
+
+
+def schedule_view_resource_vector_tiles(view_resource: DatasetViewResource,
+                                        export_data: bool = True,
+                                        overwrite: bool = True,
+                                        countdown: int = 0):
+    """
+    Schedule vector tiles task of view resource.
+
+    Previous task that is pending or running is superseded by the new task.
+    The new task also exports data if the superseded task would export data.
+    """
+    from dashboard.tasks import (
+        generate_view_vector_tiles_task
+    )
+    if view_resource.vector_tiles_task_id:
+        res = AsyncResult(view_resource.vector_tiles_task_id)
+        if not res.ready():
+            export_data = (
+                export_data or view_resource.vector_tiles_export_data
+            )
+            # find if there is running task and stop it
+            app.control.revoke(view_resource.vector_tiles_task_id,
+                               terminate=True)
+    # task id is saved before the task is sent,
+    # so the task can check whether it has been superseded
+    task_id = str(uuid4())
+    view_resource.status = DatasetView.DatasetViewStatus.PENDING
+    view_resource.vector_tiles_progress = 0
+    view_resource.vector_tiles_task_id = task_id
+    view_resource.vector_tiles_export_data = export_data
+    view_resource.save()
+    generate_view_vector_tiles_task.apply_async(
+        (view_resource.id, export_data, overwrite),
+        queue='tegola',
+        task_id=task_id,
+        countdown=countdown
+    )
 
 
 def generate_default_view_dataset_latest(
@@ -314,17 +357,7 @@ def generate_default_view_adm0_all_versions(
 
 
 def check_view_exists(view_uuid: str) -> bool:
-    sql = (
-        'SELECT count(table_name) '
-        'FROM information_schema.tables '
-        'WHERE table_schema LIKE %s AND '
-        'table_type LIKE %s AND '
-        'table_name=%s'
-    )
-    with connection.cursor() as cursor:
-        cursor.execute(sql, ['public', 'VIEW', view_uuid])
-        total_count = cursor.fetchone()[0]
-    return total_count > 0
+    return get_sql_view_kind(view_uuid) == REGULAR_VIEW
 
 
 def create_sql_view(view: DatasetView):
@@ -382,19 +415,7 @@ def create_sql_view(view: DatasetView):
                 query_string,
                 flags=re.IGNORECASE)
         if view.is_static:
-            drop_sql = (
-                'DROP MATERIALIZED VIEW IF EXISTS "{view_name}"'
-            ).format(
-                view_name=view_name
-            )
-            cursor.execute('''%s''' % drop_sql)
-            sql = (
-                'CREATE MATERIALIZED VIEW "{view_name}" '
-                'AS {sql_raw}'.format(
-                    view_name=view_name,
-                    sql_raw=query_string
-                )
-            )
+            create_materialized_view(cursor, str(view_name), query_string)
         else:
             sql = (
                 'CREATE OR REPLACE VIEW "{view_name}" AS {sql_raw}'.format(
@@ -402,36 +423,268 @@ def create_sql_view(view: DatasetView):
                     sql_raw=query_string
                 )
             )
-        cursor.execute('''%s''' % sql)
+            cursor.execute('''%s''' % sql)
+    invalidate_sql_view(view_name)
+    generate_view_membership(view)
+    # view is refreshed, invalidate cached api responses
+    bump_generation(view_scope(view_name))
     return view_name
 
 
-def init_view_privacy_level(view: DatasetView):
+def check_materialized_view_exists(view_uuid: str) -> bool:
+    return get_sql_view_kind(view_uuid) == MATERIALIZED_VIEW
+
+
+def ensure_sql_views(views):
     """
-    Get max and min privacy level from entities in view
+    Create sql view of dataset views that do not have it.
+
+    Existence of the sql views is checked in one batch.
     """
-    entities = GeographicalEntity.objects.filter(
-        dataset=view.dataset,
-        is_approved=True
+    views = list(views)
+    kinds = get_sql_view_kinds([view.uuid for view in views])
+    for view in views:
+        expected_kind = (
+            MATERIALIZED_VIEW if view.is_static else REGULAR_VIEW
+        )
+        if kinds[str(view.uuid)] != expected_kind:
+            create_sql_view(view)
+
+
+def create_materialized_view_indexes(cursor, view_name: str):
+    """
+    Create index of id and geometry in materialized view.
+
+    Unique index of id is required to refresh the view concurrently,
+    use non-unique index if the view has duplicate ids.
+    """
+    cursor.execute(f'SELECT * FROM "{view_name}" LIMIT 0')
+    columns = [col[0] for col in cursor.description]
+    if 'id' in columns:
+        try:
+            with transaction.atomic():
+                cursor.execute(
+                    f'CREATE UNIQUE INDEX IF NOT EXISTS "{view_name}_id_idx" '
+                    f'ON "{view_name}" (id)'
+                )
+        except IntegrityError:
+            cursor.execute(
+                f'CREATE INDEX IF NOT EXISTS "{view_name}_id_idx" '
+                f'ON "{view_name}" (id)'
+            )
+    if 'geometry' in columns:
+        cursor.execute(
+            f'CREATE INDEX IF NOT EXISTS "{view_name}_geom_idx" '
+            f'ON "{view_name}" USING GIST (geometry)'
+        )
+
+
+def create_materialized_view(cursor, view_name: str, query_string: str):
+    """
+    Create materialized view with indexes.
+
+    The view is created with temporary name and swapped with
+    the existing view, so the view is never missing during rebuild.
+    """
+    tmp_name = f'{view_name}_tmp'
+    cursor.execute(f'DROP MATERIALIZED VIEW IF EXISTS "{tmp_name}"')
+    cursor.execute(
+        f'CREATE MATERIALIZED VIEW "{tmp_name}" AS {query_string}'
     )
-    # raw_sql to view to select id
-    raw_sql = (
-        'SELECT id from "{}"'
+    create_materialized_view_indexes(cursor, tmp_name)
+    with transaction.atomic():
+        cursor.execute(f'DROP MATERIALIZED VIEW IF EXISTS "{view_name}"')
+        cursor.execute(
+            f'ALTER MATERIALIZED VIEW "{tmp_name}" RENAME TO "{view_name}"'
+        )
+        for index in ['id_idx', 'geom_idx']:
+            cursor.execute(
+                f'ALTER INDEX IF EXISTS "{tmp_name}_{index}" '
+                f'RENAME TO "{view_name}_{index}"'
+            )
+
+
+def has_unique_index(view_name: str) -> bool:
+    sql = (
+        'SELECT count(i.indexrelid) '
+        'FROM pg_index i '
+        'INNER JOIN pg_class c ON c.oid = i.indrelid '
+        'INNER JOIN pg_namespace n ON n.oid = c.relnamespace '
+        'WHERE n.nspname=%s AND c.relname=%s AND i.indisunique'
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, ['public', view_name])
+        total_count = cursor.fetchone()[0]
+    return total_count > 0
+
+
+def refresh_static_view(view: DatasetView):
+    """
+    Refresh materialized view of static view.
+
+    The view is refreshed concurrently when it has unique index,
+    so the view can still be queried during the refresh.
+    Create the view if it does not exist.
+    """
+    view_name = str(view.uuid)
+    if not check_materialized_view_exists(view_name):
+        return create_sql_view(view)
+    with connection.cursor() as cursor:
+        # add indexes to view that is created without indexes
+        create_materialized_view_indexes(cursor, view_name)
+        concurrently = (
+            'CONCURRENTLY ' if has_unique_index(view_name) else ''
+        )
+        cursor.execute(
+            f'REFRESH MATERIALIZED VIEW {concurrently}"{view_name}"'
+        )
+    generate_view_membership(view)
+    # view is refreshed, invalidate cached api responses
+    bump_generation(view_scope(view_name))
+    return view_name
+
+
+def generate_view_membership(view: DatasetView):
+    """
+    Generate membership table of entities in view.
+
+    The membership is used by view queries instead of
+    executing the view SQL in every query.
+    """
+    sql = (
+        'INSERT INTO georepo_datasetviewentity '
+        '(dataset_view_id, geographical_entity_id, privacy_level, level) '
+        'SELECT %s, gg.id, gg.privacy_level, gg.level '
+        'FROM georepo_geographicalentity gg '
+        'WHERE gg.id IN (SELECT id from "{}")'
     ).format(str(view.uuid))
-    # Query existing entities with uuids found in views
-    entities = entities.filter(
-        id__in=RawSQL(raw_sql, [])
+    with transaction.atomic():
+        DatasetViewEntity.objects.filter(dataset_view=view).delete()
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [view.id])
+    # use update to avoid triggering view save
+    generated_at = timezone.now()
+    DatasetView.objects.filter(id=view.id).update(
+        membership_generated_at=generated_at
     )
-    entities = entities.aggregate(
-        Min('privacy_level'),
-        Max('privacy_level')
+    view.membership_generated_at = generated_at
+
+
+def view_entity_ids_sql(view: DatasetView, privacy_level: int = None,
+                        level: int = None) -> str:
+    """
+    Return sql to select entity ids in view.
+
+    Use the membership table if it is generated,
+    otherwise select the ids from the view.
+    privacy_level and level narrow the membership by its indexes,
+    the caller still needs to filter the entities by them.
+    """
+    if view.membership_generated_at:
+        sql = (
+            'SELECT geographical_entity_id '
+            'FROM georepo_datasetviewentity '
+            'WHERE dataset_view_id = {}'
+        ).format(int(view.id))
+        if privacy_level is not None:
+            sql = sql + ' AND privacy_level <= {}'.format(
+                int(privacy_level))
+        if level is not None:
+            sql = sql + ' AND level = {}'.format(int(level))
+        return sql
+    return (
+        'SELECT id from "{}"'
+    ).format(str(view.uuid))
+
+
+def refresh_dynamic_views_membership(dataset: Dataset):
+    """
+    Regenerate membership of dynamic views in dataset.
+
+    Called after entities are updated outside of the upload approval,
+    e.g. by dataset patch tasks.
+    """
+    dynamic_dataset_views = DatasetView.objects.filter(
+        dataset=dataset,
+        is_static=False
     )
-    if (
-        entities['privacy_level__max'] is not None and
-        entities['privacy_level__min'] is not None
-    ):
-        view.max_privacy_level = entities['privacy_level__max']
-        view.min_privacy_level = entities['privacy_level__min']
+    for dataset_view in dynamic_dataset_views:
+        if not check_view_exists(str(dataset_view.uuid)):
+            continue
+        generate_view_membership(dataset_view)
+        # update levels, bbox and counts of the view resources
+        init_view_privacy_level(dataset_view)
+        # view is refreshed, invalidate cached api responses
+        bump_generation(view_scope(str(dataset_view.uuid)))
+
+
+def init_view_privacy_level(view: DatasetView):
+    """
+    Get max and min privacy level from entities in view
+    """
+    generate_view_statistics(view)
+
+
+def generate_view_statistics(view: DatasetView):
+    """
+    Generate statistics of view and its resources in single query.
+
+    Resource of privacy level X has entity count of privacy level X,
+    levels and bbox of entities with privacy level <= X.
+    The count is stored in statistics_entity_count, entity_count is kept
+    for resources with generated vector tiles.
+    Also updates max and min privacy level of the view.
+    """
+    sql = (
+        'SELECT gg.privacy_level, count(gg.id), '
+        'array_agg(DISTINCT gg.level), '
+        'ST_XMin(ST_Extent(gg.geometry)), ST_YMin(ST_Extent(gg.geometry)), '
+        'ST_XMax(ST_Extent(gg.geometry)), ST_YMax(ST_Extent(gg.geometry)) '
+        'FROM georepo_geographicalentity gg '
+        'WHERE gg.dataset_id = %s AND gg.is_approved = true AND '
+        'gg.id IN ({}) '
+        'GROUP BY gg.privacy_level '
+        'ORDER BY gg.privacy_level'
+    ).format(view_entity_ids_sql(view))
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [view.dataset_id])
+        rows = cursor.fetchall()
+    updated_at = timezone.now()
+    for resource in view.datasetviewresource_set.all():
+        entity_count = 0
+        levels = set()
+        extent = None
+        for row in rows:
+            if row[0] > resource.privacy_level:
+                continue
+            if row[0] == resource.privacy_level:
+                entity_count = row[1]
+            levels.update(row[2])
+            if row[3] is None:
+                continue
+            if extent is None:
+                extent = list(row[3:7])
+            else:
+                extent = [
+                    min(extent[0], row[3]),
+                    min(extent[1], row[4]),
+                    max(extent[2], row[5]),
+                    max(extent[3], row[6])
+                ]
+        bbox = (
+            ','.join([str(round(coord, 3)) for coord in extent]) if
+            extent else ''
+        )
+        # use update to avoid triggering resource save
+        DatasetViewResource.objects.filter(id=resource.id).update(
+            statistics_entity_count=entity_count,
+            levels=sorted(levels),
+            bbox=bbox,
+            statistics_updated_at=updated_at
+        )
+    if rows:
+        view.max_privacy_level = rows[-1][0]
+        view.min_privacy_level = rows[0][0]
         view.save(update_fields=['max_privacy_level', 'min_privacy_level'])
 
 
@@ -439,29 +692,19 @@ def generate_view_resource_bbox(view_resource: DatasetViewResource):
     """
     Generate bbox from view based on privacy level
     """
-    sql_view = str(view_resource.dataset_view.uuid)
-    if not check_view_exists(sql_view):
+    view = view_resource.dataset_view
+    sql_view = str(view.uuid)
+    if (
+        not view.membership_generated_at and
+        get_sql_view_kind(sql_view) == MISSING_VIEW
+    ):
         return ''
-    bbox = []
-    geom_col = 'geometry'
-    with connection.cursor() as cursor:
-        cursor.execute(
-            f'SELECT ST_Extent({geom_col}) as bextent FROM "{sql_view}" '
-            f'WHERE privacy_level <= {view_resource.privacy_level} AND '
-            'is_approved=True'
+    if view_resource.statistics_updated_at is None:
+        generate_view_statistics(view)
+        view_resource.refresh_from_db(
+            fields=['statistics_entity_count', 'levels', 'bbox',
+                    'statistics_updated_at']
         )
-        extent = cursor.fetchone()
-        if extent:
-            try:
-                bbox = re.findall(r'[-+]?(?:\d*\.\d+|\d+)', extent[0])
-            except TypeError:
-                pass
-    if bbox:
-        _bbox = []
-        for coord in bbox:
-            _bbox.append(str(round(float(coord), 3)))
-        view_resource.bbox = ','.join(_bbox)
-        view_resource.save()
     return view_resource.bbox
 
 
@@ -494,9 +737,7 @@ def get_entities_count_in_view(view: DatasetView, privacy_level: int):
         is_approved=True
     )
     # raw_sql to view to select id
-    raw_sql = (
-        'SELECT id from "{}"'
-    ).format(str(view.uuid))
+    raw_sql = view_entity_ids_sql(view)
     # Query existing entities with uuids found in views
     entities = entities.filter(
         id__in=RawSQL(raw_sql, []),
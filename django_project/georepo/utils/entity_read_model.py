@@ -0,0 +1,180 @@
+import logging
+from django.db import transaction
+from django.db.models.expressions import RawSQL
+from django.utils import timezone
+from georepo.models.dataset import Dataset
+from georepo.models.entity import (
+    GeographicalEntity,
+    EntityId,
+    EntityName,
+    EntityReadModel
+)
+from georepo.utils.unique_code import get_unique_code
+from georepo.utils.cache_generation import bump_dataset_generation
+
+logger = logging.getLogger(__name__)
+
+READ_MODEL_BATCH_SIZE = 1000
+
+
+# ids of entities and all of their ancestors
+ANCESTOR_IDS_SQL = (
+    'WITH RECURSIVE ancestors AS ('
+    '  SELECT gg.id, gg.parent_id '
+    '  FROM georepo_geographicalentity gg '
+    '  WHERE gg.id = ANY(%s) '
+    '  UNION '
+    '  SELECT parent.id, parent.parent_id '
+    '  FROM georepo_geographicalentity parent '
+    '  INNER JOIN ancestors ON ancestors.parent_id = parent.id'
+    ') SELECT id FROM ancestors'
+)
+
+
+def _get_parent_lookup(entity_ids):
+    """
+    Return dict of entity id to its summary for building parents.
+
+    Only the entities and their ancestors are fetched.
+    """
+    entities = GeographicalEntity.objects.filter(
+        id__in=RawSQL(ANCESTOR_IDS_SQL, [entity_ids])
+    ).values(
+        'id', 'parent_id', 'internal_code', 'unique_code',
+        'unique_code_version', 'level', 'type__label'
+    )
+    return {entity['id']: entity for entity in entities.iterator()}
+
+
+def _get_parents(entity_id, lookup: dict):
+    """
+    Return parents of entity from the nearest one.
+
+    Parent without codes is stored as None to keep the position of
+    the upper parents, geojson output pads the parent at that position.
+    """
+    parents = []
+    entity = lookup.get(entity_id)
+    visited = set()
+    while entity and entity['parent_id'] and entity['id'] not in visited:
+        visited.add(entity['id'])
+        entity = lookup.get(entity['parent_id'])
+        if entity is None:
+            break
+        if entity['internal_code'] and entity['unique_code']:
+            parents.append({
+                'default': entity['internal_code'],
+                'ucode': get_unique_code(
+                    entity['unique_code'],
+                    entity['unique_code_version']
+                ),
+                'admin_level': entity['level'],
+                'type': entity['type__label']
+            })
+        else:
+            parents.append(None)
+    return parents
+
+
+def _get_ext_codes(entity: GeographicalEntity, entity_ids):
+    identifiers = {}
+    default_code = None
+    for entity_id in entity_ids:
+        if not entity_id.value:
+            continue
+        if entity_id.default:
+            default_code = entity_id.value
+        identifiers[entity_id.code.name] = entity_id.value
+    identifiers['default'] = (
+        default_code if default_code else entity.internal_code
+    )
+    return identifiers
+
+
+def _get_names(entity_names):
+    names = []
+    for entity_name in sorted(entity_names, key=lambda name: name.idx):
+        name = {
+            'idx': entity_name.idx,
+            'name': entity_name.name
+        }
+        if entity_name.language:
+            name['lang'] = entity_name.language.code
+        if entity_name.label:
+            name['label'] = entity_name.label
+        names.append(name)
+    return names
+
+
+def generate_entity_read_model(dataset: Dataset, entities=None):
+    """
+    Generate read model of entities in dataset.
+
+    If entities is None, then regenerate read model of all approved
+    entities in the dataset and mark the dataset read model as generated.
+    """
+    full_generation = entities is None
+    if full_generation:
+        entities = GeographicalEntity.objects.filter(
+            dataset=dataset,
+            is_approved=True
+        )
+    logger.info(f'Generating entity read model of dataset {dataset.id}')
+    entity_ids = list(entities.order_by('id').values_list('id', flat=True))
+    for start in range(0, len(entity_ids), READ_MODEL_BATCH_SIZE):
+        batch_ids = entity_ids[start:start + READ_MODEL_BATCH_SIZE]
+        lookup = _get_parent_lookup(batch_ids)
+        batch = GeographicalEntity.objects.filter(
+            id__in=batch_ids
+        ).only('id', 'internal_code')
+        codes = {}
+        for entity_id in EntityId.objects.filter(
+            geographical_entity_id__in=batch_ids
+        ).select_related('code').order_by('code_id'):
+            codes.setdefault(
+                entity_id.geographical_entity_id, []).append(entity_id)
+        names = {}
+        for entity_name in EntityName.objects.filter(
+            geographical_entity_id__in=batch_ids
+        ).select_related('language'):
+            names.setdefault(
+                entity_name.geographical_entity_id, []).append(entity_name)
+        read_models = []
+        for entity in batch:
+            read_models.append(EntityReadModel(
+                geographical_entity_id=entity.id,
+                dataset_id=dataset.id,
+                ext_codes=_get_ext_codes(entity, codes.get(entity.id, [])),
+                names=_get_names(names.get(entity.id, [])),
+                parents=_get_parents(entity.id, lookup)
+            ))
+        with transaction.atomic():
+            EntityReadModel.objects.filter(
+                geographical_entity_id__in=batch_ids
+            ).delete()
+            EntityReadModel.objects.bulk_create(read_models)
+    if full_generation:
+        # use update to avoid triggering dataset save
+        generated_at = timezone.now()
+        Dataset.objects.filter(id=dataset.id).update(
+            read_model_generated_at=generated_at
+        )
+        dataset.read_model_generated_at = generated_at
+        bump_dataset_generation(dataset, include_views=True)
+    logger.info(
+        f'Finished generating {len(entity_ids)} entity read model '
+        f'of dataset {dataset.id}'
+    )
+
+
+def update_entity_read_model_on_approval(dataset: Dataset, entities):
+    """
+    Called when upload is approved.
+
+    Generate read model for the new entities if dataset read model
+    exists, otherwise generate read model for the whole dataset.
+    """
+    if dataset.read_model_generated_at is None:
+        generate_entity_read_model(dataset)
+    else:
+        generate_entity_read_model(dataset, entities)
@@ -0,0 +1,67 @@
+from typing import Callable, Dict, List
+
+
+def build_entity_tree(root_ids: List[int], entities,
+                      get_key: Callable[[dict], str],
+                      is_listed: Callable[[dict], bool] = None,
+                      is_subtree: bool = False
+                      ) -> Dict[int, list]:
+    """
+    Build nested code tree of descendants of root entities.
+
+    Fetch the subtree one query per level instead of one query per node,
+    then assemble the nested structure in memory.
+
+    :param root_ids: list of root entity id
+    :param entities: ordered values queryset of GeographicalEntity,
+        must include id and parent_id. Entity that exists in this queryset
+        makes its parent a branch in the tree.
+    :param get_key: function that returns the key of entity in the tree,
+        entity without key is excluded together with its descendants.
+    :param is_listed: function to filter entity that is displayed in
+        the tree, default to all entities in the queryset.
+    :param is_subtree: True if entities queryset is already limited to
+        the descendants of root entities (e.g. using ancestry_path),
+        then the subtree is fetched in a single query.
+    :return: dict of root id to list of codes, each code is either
+        a key string or {key: [codes of children]}
+    """
+    children = {}
+    if is_subtree:
+        for row in entities.iterator():
+            children.setdefault(row['parent_id'], []).append(row)
+        parent_ids = []
+    else:
+        visited = set(root_ids)
+        parent_ids = list(visited)
+    while parent_ids:
+        rows = entities.filter(parent_id__in=parent_ids)
+        parent_ids = []
+        for row in rows.iterator():
+            children.setdefault(row['parent_id'], []).append(row)
+            if row['id'] in visited:
+                continue
+            if is_listed is not None and not is_listed(row):
+                continue
+            if not get_key(row):
+                continue
+            visited.add(row['id'])
+            parent_ids.append(row['id'])
+
+    def build_codes(parent_id):
+        codes = []
+        for row in children.get(parent_id, []):
+            if is_listed is not None and not is_listed(row):
+                continue
+            key = get_key(row)
+            if not key or not row['id']:
+                continue
+            if row['id'] in children:
+                codes.append({
+                    str(key): build_codes(row['id'])
+                })
+            else:
+                codes.append(str(key))
+        return codes
+
+    return {root_id: build_codes(root_id) for root_id in root_ids}
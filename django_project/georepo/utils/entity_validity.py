@@ -0,0 +1,41 @@
+from datetime import datetime
+from dateutil.parser import isoparse
+from django.utils import timezone
+
+
+def parse_as_of(value) -> datetime:
+    """
+    Parse as_of date from iso format or unix timestamp.
+
+    Return None if value is not valid date.
+    """
+    result = None
+    try:
+        result = isoparse(value)
+    except ValueError:
+        try:
+            result = datetime.fromtimestamp(float(value), timezone.utc)
+        except (ValueError, OverflowError, OSError):
+            return None
+    if timezone.is_naive(result):
+        result = timezone.make_aware(result, timezone.utc)
+    return result
+
+
+def filter_entities_as_of(entities, as_of: datetime, prefix=''):
+    """
+    Filter entity revisions that are valid at as_of date.
+
+    The validity range is [start_date, end_date) and uses
+    GiST index together with dataset and level.
+    :param prefix: relation path to GeographicalEntity,
+    e.g. 'geographical_entity__'
+    """
+    return entities.filter(**{
+        f'{prefix}validity__contains': as_of
+    })
+
+
+def validity_sql_condition(alias='gg') -> str:
+    """Raw sql condition of entity that is valid at a date parameter."""
+    return f'{alias}.validity @> %s::timestamptz'
@@ -23,7 +23,15 @@ from georepo.models import (
 )
 from georepo.utils.custom_geo_functions import ForcePolygonCCW
 from core.settings.utils import absolute_path
-from georepo.utils.dataset_view import check_view_exists, create_sql_view
+from georepo.utils.dataset_view import (
+    check_view_exists,
+    create_sql_view,
+    refresh_static_view,
+    generate_view_statistics,
+    view_entity_ids_sql
+)
+from georepo.utils.dataset_schema import get_dataset_schema
+from georepo.utils.entity_validity import filter_entities_as_of
 from georepo.utils.renderers import (
     GeojsonRenderer,
     ShapefileRenderer,
@@ -201,13 +209,15 @@ class DatasetExporterBase(object):
             rhr_geom=ForcePolygonCCW(F('geometry'))
         )
         values.append('rhr_geom')
-        # get max levels
-        max_level = 0
-        max_level_entity = entities.order_by(
-                'level'
-        ).last()
-        if max_level_entity:
-            max_level = max_level_entity.level
+        # retrieve id types, name slots and max level in current dataset
+        schema = get_dataset_schema(
+            self.dataset,
+            admin_level=level,
+            is_latest=True
+        )
+        ids = schema['ids']
+        names_max_idx = schema['names']
+        max_level = schema['max_level']
         related = ''
         for i in range(max_level):
             related = related + (
@@ -219,15 +229,6 @@ class DatasetExporterBase(object):
             values.append(f'{related}__unique_code_version')
             values.append(f'{related}__level')
             values.append(f'{related}__type__label')
-        # retrieve all ids in current dataset
-        ids = EntityId.objects.filter(
-            geographical_entity__dataset__uuid=self.dataset.uuid,
-            geographical_entity__is_approved=True,
-            geographical_entity__is_latest=True,
-            geographical_entity__level=level
-        ).order_by('code').values(
-            'code__id', 'code__name', 'default'
-        ).distinct('code__id')
         # conditional join to entity id for each id
         for id in ids:
             field_key = f"id_{id['code__id']}"
@@ -239,16 +240,6 @@ class DatasetExporterBase(object):
             }
             entities = entities.annotate(**annotations)
             values.append(f'{field_key}__value')
-        names = EntityName.objects.filter(
-            geographical_entity__dataset__uuid=self.dataset.uuid,
-            geographical_entity__is_approved=True,
-            geographical_entity__is_latest=True,
-            geographical_entity__level=level
-        )
-        # get max idx in the names
-        names_max_idx = names.aggregate(
-            Max('idx')
-        )
         if names_max_idx['idx__max'] is not None:
             for name_idx in range(names_max_idx['idx__max'] + 1):
                 field_key = f"name_{name_idx}"
@@ -290,18 +281,35 @@ class DatasetViewExporterBase(object):
     output = None
 
     def __init__(self, dataset_view: DatasetView,
-                 view_resource: DatasetViewResource = None) -> None:
+                 view_resource: DatasetViewResource = None,
+                 as_of: datetime.datetime = None) -> None:
         self.dataset_view = dataset_view
         self.total_to_be_exported = 0
         self.total_exported = 0
         self.generated_files = []
         self.resources = []
         self.view_resource = view_resource
+        # export entity revisions that are valid at as_of date
+        self.as_of = as_of
 
     def get_exported_file_name(self, level: int):
         exported_name = f'adm{level}'
         return exported_name
 
+    def get_resource_output_name(self, resource: DatasetViewResource):
+        """
+        Return output directory name of view resource.
+
+        As of export is written to separate directory, so it does not
+        replace the current export of the resource.
+        """
+        if self.as_of:
+            return (
+                f'{str(resource.uuid)}_'
+                f'{self.as_of.strftime("%Y%m%d%H%M%S")}'
+            )
+        return str(resource.uuid)
+
     def init_exporter(self):
         self.total_to_be_exported = 0
         resources = DatasetViewResource.objects.filter(
@@ -311,27 +319,13 @@ class DatasetViewExporterBase(object):
             resources = resources.filter(
                 id=self.view_resource.id
             )
+        if resources.filter(statistics_updated_at__isnull=True).exists():
+            generate_view_statistics(self.dataset_view)
         for resource in resources:
-            # check if view at privacy level has data
-            entities = GeographicalEntity.objects.filter(
-                dataset=self.dataset_view.dataset,
-                is_approved=True,
-                privacy_level__lte=resource.privacy_level
-            )
-            # raw_sql to view to select id
-            raw_sql = (
-                'SELECT id from "{}"'
-            ).format(str(self.dataset_view.uuid))
-            entities = entities.filter(
-                id__in=RawSQL(raw_sql, [])
-            )
-            if not entities.exists():
+            # levels of entities in view at privacy level
+            levels = resource.levels
+            if not levels:
                 continue
-            # count levels
-            levels = entities.order_by('level').values_list(
-                'level',
-                flat=True
-            ).distinct()
             self.resources.append({
                 'resource': resource,
                 'levels': levels
@@ -360,8 +354,9 @@ class DatasetViewExporterBase(object):
             f'(0/{self.total_to_be_exported})'
         )
         # check if view has been created
-        is_view_exists = check_view_exists(str(self.dataset_view.uuid))
-        if not is_view_exists:
+        if self.dataset_view.is_static:
+            refresh_static_view(self.dataset_view)
+        elif not check_view_exists(str(self.dataset_view.uuid)):
             create_sql_view(self.dataset_view)
 
         for res in self.resources:
@@ -369,7 +364,7 @@ class DatasetViewExporterBase(object):
             levels = res['levels']
             tmp_output_dir = os.path.join(
                 self.get_base_output_dir(),
-                f'temp_{str(resource.uuid)}'
+                f'temp_{self.get_resource_output_name(resource)}'
             )
             if not os.path.exists(tmp_output_dir):
                 os.mkdir(tmp_output_dir)
@@ -388,7 +383,7 @@ class DatasetViewExporterBase(object):
             # copy from temp dir to output dir
             output_dir = os.path.join(
                 self.get_base_output_dir(),
-                str(resource.uuid)
+                self.get_resource_output_name(resource)
             )
             if os.path.exists(output_dir):
                 shutil.rmtree(output_dir)
@@ -452,9 +447,11 @@ class DatasetViewExporterBase(object):
             privacy_level__lte=privacy_level
         )
         # raw_sql to view to select id
-        raw_sql = (
-            'SELECT id from "{}"'
-        ).format(str(self.dataset_view.uuid))
+        raw_sql = view_entity_ids_sql(
+            self.dataset_view,
+            privacy_level=privacy_level,
+            level=level
+        )
         entities = entities.filter(
             id__in=RawSQL(raw_sql, [])
         )
@@ -462,6 +459,8 @@ class DatasetViewExporterBase(object):
             entities = entities.filter(
                 level=level
             )
+        if self.as_of:
+            entities = filter_entities_as_of(entities, self.as_of)
         entities = entities.annotate(
             rhr_geom=AsGeoJSON(ForcePolygonCCW(F('geometry')))
         )
@@ -493,6 +492,9 @@ class DatasetViewExporterBase(object):
         ids = ids.filter(
             geographical_entity__id__in=RawSQL(raw_sql, [])
         )
+        if self.as_of:
+            ids = filter_entities_as_of(
+                ids, self.as_of, prefix='geographical_entity__')
         ids = ids.order_by('code').values(
             'code__id', 'code__name', 'default'
         ).distinct('code__id')
@@ -515,6 +517,9 @@ class DatasetViewExporterBase(object):
         names = names.filter(
             geographical_entity__id__in=RawSQL(raw_sql, [])
         )
+        if self.as_of:
+            names = filter_entities_as_of(
+                names, self.as_of, prefix='geographical_entity__')
         # get max idx in the names
         names_max_idx = names.aggregate(
             Max('idx')
@@ -571,6 +576,8 @@ class DatasetViewExporterBase(object):
             '',
             f"Extracted on {extracted_on.strftime('%d-%m-%Y')}"
         ]
+        if self.as_of:
+            lines.append(f'Entity revisions as of {self.as_of.isoformat()}')
         readme_filepath = os.path.join(
             tmp_output_dir,
             'readme.txt'
@@ -602,9 +609,7 @@ class DatasetViewExporterBase(object):
                 is_approved=True
             )
             # raw_sql to view to select id
-            raw_sql = (
-                'SELECT id from "{}"'
-            ).format(str(self.dataset_view.uuid))
+            raw_sql = view_entity_ids_sql(self.dataset_view)
             entities = entities.filter(
                 id__in=RawSQL(raw_sql, [])
             )
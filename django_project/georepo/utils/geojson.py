@@ -152,13 +152,16 @@ class GeojsonViewExporter(DatasetViewExporterBase):
 
 
 def generate_view_geojson(dataset_view: DatasetView,
-                          view_resource: DatasetViewResource = None):
+                          view_resource: DatasetViewResource = None,
+                          as_of=None):
     """
     Extract geojson from dataset_view and then save it to
     geojson dataset_view folder
     :param dataset_view: dataset_view object
+    :param as_of: export entity revisions valid at this date
     """
-    exporter = GeojsonViewExporter(dataset_view, view_resource=view_resource)
+    exporter = GeojsonViewExporter(dataset_view, view_resource=view_resource,
+                                   as_of=as_of)
     exporter.init_exporter()
     exporter.run()
 
@@ -0,0 +1,106 @@
+import logging
+from django.db import connection
+from georepo.models.dataset import Dataset
+from georepo.models.entity import GeographicalEntity
+
+logger = logging.getLogger(__name__)
+
+GEOMETRY_METRICS_FIELDS = ['point_on_surface', 'bbox', 'area', 'perimeter']
+# same expressions as entity_geometry_metrics trigger
+GEOMETRY_METRICS_SET_SQL = (
+    'point_on_surface = ST_PointOnSurface(gg.geometry), '
+    'bbox = ARRAY[ST_XMin(gg.geometry), ST_YMin(gg.geometry), '
+    '  ST_XMax(gg.geometry), ST_YMax(gg.geometry)], '
+    'area = ST_Area(gg.geometry::geography) / 1e6, '
+    'perimeter = ST_Perimeter(gg.geometry::geography) / 1e3 '
+)
+MISSING_GEOMETRY_METRICS_SQL = (
+    'gg.geometry IS NOT NULL AND ('
+    '  gg.point_on_surface IS NULL OR gg.bbox IS NULL OR '
+    '  gg.area IS NULL OR gg.perimeter IS NULL) '
+)
+
+
+def generate_geometry_metrics(dataset: Dataset, batch_size: int = 1000):
+    """
+    Backfill stored geometry metrics of entities in dataset.
+
+    New and updated geometries are maintained by the
+    entity_geometry_metrics trigger, this only computes the metrics
+    of entities that do not have them, in batches of entity ids.
+    """
+    logger.info(f'Generating geometry metrics of dataset {dataset.id}')
+    sql = (
+        'WITH batch AS ('
+        '  SELECT gg.id FROM georepo_geographicalentity gg '
+        '  WHERE gg.dataset_id = %s AND gg.id > %s AND ' +
+        MISSING_GEOMETRY_METRICS_SQL +
+        '  ORDER BY gg.id LIMIT %s'
+        ') '
+        'UPDATE georepo_geographicalentity gg SET ' +
+        GEOMETRY_METRICS_SET_SQL +
+        'FROM batch WHERE gg.id = batch.id '
+        'RETURNING gg.id'
+    )
+    last_id = 0
+    total = 0
+    while True:
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [dataset.id, last_id, batch_size])
+            ids = [row[0] for row in cursor.fetchall()]
+        if not ids:
+            break
+        last_id = max(ids)
+        total += len(ids)
+    logger.info(
+        f'Finished generating geometry metrics of {total} entities '
+        f'in dataset {dataset.id}'
+    )
+    return total
+
+
+def ensure_geometry_metrics(entity: GeographicalEntity):
+    """Compute geometry metrics of entity that is not backfilled yet."""
+    if not entity.geometry:
+        return
+    if all(
+        getattr(entity, field) is not None for
+        field in GEOMETRY_METRICS_FIELDS
+    ):
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'UPDATE georepo_geographicalentity gg SET ' +
+            GEOMETRY_METRICS_SET_SQL +
+            'WHERE gg.id = %s',
+            [entity.id]
+        )
+    entity.refresh_from_db(fields=GEOMETRY_METRICS_FIELDS)
+
+
+def ensure_geometry_metrics_of_entities(entities):
+    """Compute missing geometry metrics of queryset in one query."""
+    ids = list(entities.values_list('id', flat=True))
+    if not ids:
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'UPDATE georepo_geographicalentity gg SET ' +
+            GEOMETRY_METRICS_SET_SQL +
+            'WHERE gg.id = ANY(%s) AND ' +
+            MISSING_GEOMETRY_METRICS_SQL,
+            [ids]
+        )
+
+
+def get_entity_bbox(entity: GeographicalEntity):
+    """
+    Return bbox [xmin, ymin, xmax, ymax] of entity.
+
+    Geometry is loaded only when the stored bbox is not backfilled yet.
+    """
+    if entity.bbox:
+        return entity.bbox
+    if entity.geometry:
+        return list(entity.geometry.extent)
+    return None
@@ -5,6 +5,7 @@ import random
 from django.db.models.expressions import RawSQL
 from georepo.models.dataset import Dataset
 from georepo.models.dataset_view import DatasetView
+from georepo.utils.dataset_view import view_entity_ids_sql
 from georepo.models.entity import GeographicalEntity
 
 
@@ -87,9 +88,7 @@ def generate_jmeter_scripts():
         dataset=dataset,
         is_approved=True
     )
-    raw_sql = (
-        'SELECT id from "{}"'
-    ).format(str(view.uuid))
+    raw_sql = view_entity_ids_sql(view)
     entities = entities.filter(
         id__in=RawSQL(raw_sql, [])
     ).values_list('id', flat=True)
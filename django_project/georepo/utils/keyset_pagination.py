@@ -0,0 +1,80 @@
+import base64
+import json
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+# ordering of entity list that is used as the key of the cursor
+ENTITY_KEYSET_ORDERING = ['level', 'unique_code_version', 'unique_code', 'id']
+
+
+class InvalidCursor(ValidationError):
+    pass
+
+
+def encode_cursor(entity: dict) -> str:
+    """Encode last entity of current page into opaque cursor token."""
+    values = [entity[field] for field in ENTITY_KEYSET_ORDERING]
+    return base64.urlsafe_b64encode(
+        json.dumps(values).encode('utf-8')
+    ).decode('utf-8')
+
+
+def decode_cursor(cursor: str) -> list:
+    try:
+        values = json.loads(
+            base64.urlsafe_b64decode(cursor.encode('utf-8'))
+        )
+    except (ValueError, TypeError):
+        raise InvalidCursor(f'Invalid cursor {cursor}')
+    if (
+        not isinstance(values, list) or
+        len(values) != len(ENTITY_KEYSET_ORDERING)
+    ):
+        raise InvalidCursor(f'Invalid cursor {cursor}')
+    return values
+
+
+def filter_after_cursor(entities, cursor: str):
+    """
+    Filter entities that are after the cursor.
+
+    Entities must be ordered by level, unique_code_version, unique_code, id.
+    unique_code_version is nullable and Postgres puts NULL at the end
+    of ascending order.
+    """
+    level, version, ucode, entity_id = decode_cursor(cursor)
+    same_tier = Q(unique_code__gt=ucode) | (
+        Q(unique_code=ucode) & Q(id__gt=entity_id)
+    )
+    if version is None:
+        return entities.filter(
+            Q(level__gt=level) |
+            (Q(level=level) & Q(unique_code_version__isnull=True) & same_tier)
+        )
+    return entities.filter(
+        Q(level__gt=level) |
+        (
+            Q(level=level) & (
+                Q(unique_code_version__gt=version) |
+                Q(unique_code_version__isnull=True)
+            )
+        ) |
+        (Q(level=level) & Q(unique_code_version=version) & same_tier)
+    )
+
+
+def paginate_by_cursor(entities, page_size: int, cursor: str = None):
+    """
+    Return (list of entities in page, next cursor).
+
+    Fetch one extra row to find out whether next page exists,
+    so no COUNT query is needed.
+    """
+    if cursor:
+        entities = filter_after_cursor(entities, cursor)
+    rows = list(entities[:page_size + 1])
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = encode_cursor(rows[-1])
+    return rows, next_cursor
@@ -29,7 +29,7 @@ class KmlViewExporter(DatasetViewExporterBase):
         ) + suffix
         geojson_file = os.path.join(
             settings.GEOJSON_FOLDER_OUTPUT,
-            str(resource.uuid),
+            self.get_resource_output_name(resource),
             exported_name
         ) + '.geojson'
         # use ogr to convert from geojson to kml_file
@@ -54,13 +54,16 @@ class KmlViewExporter(DatasetViewExporterBase):
 
 
 def generate_view_kml(dataset_view: DatasetView,
-                      view_resource: DatasetViewResource = None):
+                      view_resource: DatasetViewResource = None,
+                      as_of=None):
     """
     Extract kml file from dataset_view and then save it to
     kml dataset_view folder
     :param dataset: dataset_view object
+    :param as_of: export entity revisions valid at this date
     """
     exporter = KmlViewExporter(dataset_view,
-                               view_resource=view_resource)
+                               view_resource=view_resource,
+                               as_of=as_of)
     exporter.init_exporter()
     exporter.run()
@@ -1,20 +1,43 @@
+import operator
 import re
 from enum import Enum
+from functools import reduce
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group
+from django.db.models import Q
 from rest_framework.permissions import BasePermission
 from rest_framework.authtoken.models import Token
 from guardian.shortcuts import get_objects_for_user, assign_perm,\
     remove_perm
 from guardian.core import ObjectPermissionChecker
 from core.models.preferences import SitePreferences
-from georepo.models import Module, Dataset, DatasetView
+from georepo.models import (
+    Module,
+    Dataset,
+    DatasetView,
+    DatasetUserObjectPermission,
+    DatasetGroupObjectPermission,
+    DatasetViewUserObjectPermission,
+    DatasetViewGroupObjectPermission
+)
+from georepo.utils.cache_generation import (
+    PERMISSION_SCOPE,
+    bump_generation,
+    bump_dataset_generation,
+    bump_view_generation,
+    get_cached_by_generation,
+    set_cached_by_generation,
+    module_scope
+)
 
 
 User = get_user_model()
 
 MAX_PRIVACY_LEVEL = 4
 MIN_PRIVACY_LEVEL = 1
+# prefix of cached privacy levels of user
+PRIVACY_LEVEL_CACHE_KEY_PREFIX = 'privacy_level'
 
 User = get_user_model()
 
@@ -197,10 +220,7 @@ class DatasetDetailAccessPermission(GeoRepoBaseAccessPermission):
         """Test if user has view permission to dataset"""
         if not dataset.module.is_active:
             return False
-        for i in range(MIN_PRIVACY_LEVEL, MAX_PRIVACY_LEVEL + 1):
-            if request.user.has_perm(f'view_dataset_level_{i}', dataset):
-                return True
-        return False
+        return get_view_permission_privacy_level(request.user, dataset) > 0
 
 
 class DatasetViewDetailAccessPermission(GeoRepoBaseAccessPermission):
@@ -210,25 +230,18 @@ class DatasetViewDetailAccessPermission(GeoRepoBaseAccessPermission):
         """Test if user has view permission to dataset view"""
         if not dataset_view.dataset.module.is_active:
             return False
-        has_read_perm = False
-        max_privacy_level = 0
-        for i in range(MAX_PRIVACY_LEVEL, MIN_PRIVACY_LEVEL - 1, -1):
-            if (
-                (request.user.has_perm('view_datasetview', dataset_view) and
-                 request.user.has_perm(f'view_dataset_level_{i}',
-                                       dataset_view.dataset)) or
-                request.user.has_perm(f'ext_view_datasetview_level_{i}',
-                                      dataset_view)
-            ):
-                has_read_perm = True
-                max_privacy_level = i
-                break
-        if (
-            has_read_perm and
-            max_privacy_level < dataset_view.min_privacy_level
-        ):
-            has_read_perm = False
-        return has_read_perm
+        max_privacy_level = get_external_view_permission_privacy_level(
+            request.user, dataset_view)
+        if request.user.has_perm('view_datasetview', dataset_view):
+            max_privacy_level = max(
+                max_privacy_level,
+                get_view_permission_privacy_level(
+                    request.user, dataset_view.dataset)
+            )
+        return (
+            max_privacy_level > 0 and
+            max_privacy_level >= dataset_view.min_privacy_level
+        )
 
 
 def check_user_has_view_permission(user_or_obj, dataset_view,
@@ -251,6 +264,83 @@ def check_user_has_view_permission(user_or_obj, dataset_view,
     )
 
 
+def _fetch_user_privacy_levels(user):
+    """
+    Fetch privacy levels of user and user groups in one query.
+
+    Return {'datasets': {dataset_id: level}, 'views': {view_id: level}}
+    """
+    dataset_perms = [
+        f'view_dataset_level_{i}' for i in
+        range(MIN_PRIVACY_LEVEL, MAX_PRIVACY_LEVEL + 1)
+    ]
+    view_perms = [
+        f'ext_view_datasetview_level_{i}' for i in
+        range(MIN_PRIVACY_LEVEL, MAX_PRIVACY_LEVEL + 1)
+    ]
+    fields = ['content_object_id', 'permission__codename']
+    perms = DatasetUserObjectPermission.objects.filter(
+        user=user,
+        permission__codename__in=dataset_perms
+    ).values_list(*fields).union(
+        DatasetGroupObjectPermission.objects.filter(
+            group__user=user,
+            permission__codename__in=dataset_perms
+        ).values_list(*fields),
+        DatasetViewUserObjectPermission.objects.filter(
+            user=user,
+            permission__codename__in=view_perms
+        ).values_list(*fields),
+        DatasetViewGroupObjectPermission.objects.filter(
+            group__user=user,
+            permission__codename__in=view_perms
+        ).values_list(*fields),
+        all=True
+    )
+    privacy_levels = {
+        'datasets': {},
+        'views': {}
+    }
+    for object_id, codename in perms:
+        target = (
+            privacy_levels['views'] if codename in view_perms else
+            privacy_levels['datasets']
+        )
+        level = int(codename.split('_')[-1])
+        target[object_id] = max(target.get(object_id, 0), level)
+    return privacy_levels
+
+
+def get_user_privacy_levels(user):
+    """
+    Return privacy levels of user for all datasets and external views.
+
+    The levels are cached until any dataset/view permission is
+    granted or revoked.
+    """
+    cache_key = f'{PRIVACY_LEVEL_CACHE_KEY_PREFIX}:{user.id}'
+    privacy_levels, generation = get_cached_by_generation(
+        PERMISSION_SCOPE, cache_key)
+    if privacy_levels is None:
+        privacy_levels = _fetch_user_privacy_levels(user)
+        set_cached_by_generation(
+            cache_key, privacy_levels, generation,
+            timeout=settings.API_CACHE_TTL
+        )
+    return privacy_levels
+
+
+def reset_privacy_level_cache():
+    """Invalidate cached privacy levels of all users."""
+    bump_generation(PERMISSION_SCOPE)
+
+
+def user_groups_changed(sender, action, **kwargs):
+    """Invalidate cached privacy levels when group members are changed."""
+    if action in ['post_add', 'post_remove', 'post_clear']:
+        reset_privacy_level_cache()
+
+
 def get_view_permission_privacy_level(user_or_obj, dataset,
                                       dataset_view=None):
     """
@@ -258,6 +348,17 @@ def get_view_permission_privacy_level(user_or_obj, dataset,
     Return 0 if cannot access
     user_or_obj: user or ObjectPermissionChecker
     """
+    if isinstance(user_or_obj, User):
+        if not user_or_obj.is_active:
+            return 0
+        if user_or_obj.is_superuser:
+            return MAX_PRIVACY_LEVEL
+        privacy_levels = get_user_privacy_levels(user_or_obj)
+        return max(
+            privacy_levels['datasets'].get(dataset.id, 0),
+            privacy_levels['views'].get(dataset_view.id, 0) if
+            dataset_view else 0
+        )
     dataset_privacy_level = 0
     view_privacy_level = 0
     for i in range(MAX_PRIVACY_LEVEL, MIN_PRIVACY_LEVEL - 1, -1):
@@ -279,6 +380,13 @@ def get_external_view_permission_privacy_level(user_or_obj, dataset_view):
     Return 0 if cannot access
     user_or_obj: user or ObjectPermissionChecker
     """
+    if isinstance(user_or_obj, User):
+        if not user_or_obj.is_active:
+            return 0
+        if user_or_obj.is_superuser:
+            return MAX_PRIVACY_LEVEL
+        privacy_levels = get_user_privacy_levels(user_or_obj)
+        return privacy_levels['views'].get(dataset_view.id, 0)
     for i in range(MAX_PRIVACY_LEVEL, MIN_PRIVACY_LEVEL - 1, -1):
         if (
             user_or_obj.has_perm(f'ext_view_datasetview_level_{i}',
@@ -315,39 +423,63 @@ def get_dataset_view_privacy_level_from_perms(permissions, dataset_perms):
     return 0
 
 
-def get_views_for_user(user):
-    datasets = Dataset.objects.all()
-    datasets = get_dataset_for_user(user, datasets)
-    views_querysets = DatasetView.objects.none()
-    user_privacy_levels = {}
-    for dataset in datasets:
-        views = DatasetView.objects.filter(
-            dataset=dataset
-        )
-        views, _ = get_dataset_views_for_user(
-            user,
-            dataset,
-            views
-        )
-        views_querysets = views_querysets.union(views)
-        privacy_level = get_view_permission_privacy_level(
-            user,
-            dataset
-        )
-        user_privacy_levels[dataset.id] = privacy_level
+def get_views_for_user(user, queryset=None):
+    """
+    Return (privacy level of user for each dataset, views user can access)
+
+    View can be accessed if user has read permission to the view and
+    the privacy level to the dataset is at least view min_privacy_level,
+    or the view is shared to user as external view.
+    Datasets, views and privacy levels are resolved in fixed number
+    of queries regardless of the number of datasets.
+    """
+    if queryset is None:
+        queryset = DatasetView.objects.order_by('created_at')
+    if user.is_superuser:
+        user_privacy_levels = {
+            dataset_id: MAX_PRIVACY_LEVEL for dataset_id in
+            Dataset.objects.values_list('id', flat=True)
+        }
+        return user_privacy_levels, queryset
+    user_privacy_levels = (
+        get_user_privacy_levels(user)['datasets'] if user.is_active else {}
+    )
     # include external user
-    external_views = DatasetView.objects.all()
     external_views = get_objects_for_user(
         user,
         EXTERNAL_READ_VIEW_PERMISSION_LIST,
-        klass=external_views,
+        klass=DatasetView.objects.all(),
         use_groups=True,
         any_perm=True,
         accept_global_perms=False
     )
-    views_querysets = views_querysets.union(external_views)
-    views_querysets = views_querysets.order_by('created_at')
-    return user_privacy_levels, views_querysets
+    view_filter = Q(id__in=external_views.values('id'))
+    # filter views based on privacy level of the dataset
+    level_filters = []
+    for level in range(MIN_PRIVACY_LEVEL, MAX_PRIVACY_LEVEL + 1):
+        dataset_ids = [
+            dataset_id for dataset_id, privacy_level in
+            user_privacy_levels.items() if privacy_level == level
+        ]
+        if dataset_ids:
+            level_filters.append(
+                Q(dataset_id__in=dataset_ids) &
+                Q(min_privacy_level__lte=level)
+            )
+    if level_filters:
+        views = get_objects_for_user(
+            user,
+            'view_datasetview',
+            klass=DatasetView.objects.all(),
+            use_groups=True,
+            any_perm=True,
+            accept_global_perms=False
+        )
+        view_filter |= (
+            Q(id__in=views.values('id')) &
+            reduce(operator.or_, level_filters)
+        )
+    return user_privacy_levels, queryset.filter(view_filter)
 
 
 def get_dataset_for_user(user, queryset, use_groups=True):
@@ -449,6 +581,8 @@ def grant_dataset_owner(dataset, user_or_group=None):
         return
     for permission in OWN_DATASET_PERMISSION_LIST:
         assign_perm(permission, user_or_group, dataset)
+    bump_dataset_generation(dataset)
+    reset_privacy_level_cache()
     # grant owner access to all views
     views = dataset.datasetview_set.all()
     for view in views:
@@ -456,6 +590,9 @@ def grant_dataset_owner(dataset, user_or_group=None):
 
 
 def reset_datasetview_cache(dataset_view, user_or_group):
+    # invalidate cached api responses of this dataset view
+    bump_view_generation(dataset_view)
+    reset_privacy_level_cache()
     # clear permission cache for this dataset view resources+user
     for resource in dataset_view.datasetviewresource_set.all():
         if isinstance(user_or_group, Group):
@@ -481,6 +618,8 @@ def grant_dataset_manager(dataset, user_or_group, permissions=None):
         permissions = MANAGE_DATASET_PERMISSION_LIST
     for permission in permissions:
         assign_perm(permission, user_or_group, dataset)
+    bump_dataset_generation(dataset)
+    reset_privacy_level_cache()
     # grant manager access to all views
     views = dataset.datasetview_set.all()
     for view in views:
@@ -499,6 +638,8 @@ def grant_dataset_viewer(dataset, user_or_group, privacy_level):
     for i in range(MIN_PRIVACY_LEVEL, privacy_level + 1):
         permission = f'view_dataset_level_{i}'
         assign_perm(permission, user_or_group, dataset)
+    bump_dataset_generation(dataset)
+    reset_privacy_level_cache()
     # grant view access to all views
     views = dataset.datasetview_set.all()
     for view in views:
@@ -516,6 +657,8 @@ def grant_datasetview_owner(dataset_view, user_or_group=None):
         return
     for permission in OWN_VIEW_PERMISSION_LIST:
         assign_perm(permission, user_or_group, dataset_view)
+    bump_view_generation(dataset_view)
+    reset_privacy_level_cache()
 
 
 def grant_datasetview_manager(dataset_view, user_or_group, permissions=None):
@@ -534,6 +677,8 @@ def grant_datasetview_manager(dataset_view, user_or_group, permissions=None):
         permissions = MANAGE_VIEW_PERMISSION_LIST
     for permission in permissions:
         assign_perm(permission, user_or_group, dataset_view)
+    bump_view_generation(dataset_view)
+    reset_privacy_level_cache()
 
 
 def grant_datasetview_viewer(dataset_view, user_or_group):
@@ -620,6 +765,8 @@ def revoke_dataset_access(dataset, user_or_group):
         permission_list = WRITE_DATASET_PERMISSION_LIST
     for permission in permission_list:
         remove_perm(permission, user_or_group, dataset)
+    bump_dataset_generation(dataset)
+    reset_privacy_level_cache()
     views = dataset.datasetview_set.all()
     for view in views:
         if checker.has_perm('view_datasetview', view):
@@ -634,6 +781,7 @@ def grant_module_writer(module, user_or_group):
         return
     for permission in WRITE_MODULE_PERMISSION_LIST:
         assign_perm(permission, user_or_group, module)
+    bump_generation(module_scope(module.uuid))
 
 
 def revoke_module_writer(module, user_or_group):
@@ -642,6 +790,7 @@ def revoke_module_writer(module, user_or_group):
     """
     for permission in WRITE_MODULE_PERMISSION_LIST:
         remove_perm(permission, user_or_group, module)
+    bump_generation(module_scope(module.uuid))
 
 
 def grant_dataset_to_public_groups(dataset):
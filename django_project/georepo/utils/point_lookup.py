@@ -0,0 +1,199 @@
+import csv
+import io
+from typing import List, Tuple
+from django.db import connection
+from georepo.models.dataset import Dataset
+from georepo.models.dataset_view import DatasetView
+from georepo.models.id_type import IdType
+from georepo.models.entity import (
+    UUID_ENTITY_ID,
+    CONCEPT_UUID_ENTITY_ID,
+    CODE_ENTITY_ID,
+    UCODE_ENTITY_ID,
+    CONCEPT_UCODE_ENTITY_ID
+)
+from georepo.utils.dataset_view import view_entity_ids_sql
+
+# max number of points in single request
+POINT_LOOKUP_MAX_POINTS = 100000
+# max number of points in single query
+POINT_LOOKUP_BATCH_SIZE = 10000
+
+CSV_LONGITUDE_COLUMNS = ['lon', 'lng', 'longitude', 'x']
+CSV_LATITUDE_COLUMNS = ['lat', 'latitude', 'y']
+
+
+class InvalidPointData(ValueError):
+    pass
+
+
+def _parse_point(point) -> Tuple[float, float]:
+    if not isinstance(point, (list, tuple)) or len(point) < 2:
+        raise InvalidPointData(f'Invalid point {point}')
+    try:
+        x, y = float(point[0]), float(point[1])
+    except (TypeError, ValueError):
+        raise InvalidPointData(f'Invalid point {point}')
+    if not (-180 <= x <= 180 and -90 <= y <= 90):
+        raise InvalidPointData(f'Invalid point {point}')
+    return x, y
+
+
+def parse_points(points: list) -> List[Tuple[float, float]]:
+    """Parse list of [longitude, latitude] in SRID 4326."""
+    if not isinstance(points, list):
+        raise InvalidPointData('Points should be a list')
+    return [_parse_point(point) for point in points]
+
+
+def parse_points_csv(csv_file) -> List[Tuple[float, float]]:
+    """
+    Parse points from CSV file.
+
+    The first row is the header that contains longitude and latitude
+    column, e.g. lon,lat or longitude,latitude or x,y.
+    """
+    content = csv_file.read()
+    if isinstance(content, bytes):
+        content = content.decode('utf-8-sig')
+    reader = csv.reader(io.StringIO(content))
+    header = next(reader, None)
+    if not header:
+        raise InvalidPointData('Empty CSV file')
+    header = [column.strip().lower() for column in header]
+    x_idx = next(
+        (idx for idx, column in enumerate(header) if
+         column in CSV_LONGITUDE_COLUMNS),
+        None
+    )
+    y_idx = next(
+        (idx for idx, column in enumerate(header) if
+         column in CSV_LATITUDE_COLUMNS),
+        None
+    )
+    if x_idx is None or y_idx is None:
+        raise InvalidPointData('Missing longitude/latitude column in CSV')
+    points = []
+    for row in reader:
+        if not row:
+            continue
+        if len(row) <= max(x_idx, y_idx):
+            raise InvalidPointData(f'Invalid row {row}')
+        points.append(_parse_point([row[x_idx], row[y_idx]]))
+    return points
+
+
+def _get_id_value_sql(id_type: IdType | str) -> str:
+    if isinstance(id_type, IdType):
+        return 'gi.value'
+    if id_type == UUID_ENTITY_ID:
+        return 'gg.uuid_revision::text'
+    if id_type == CONCEPT_UUID_ENTITY_ID:
+        return 'gg.uuid::text'
+    if id_type == CODE_ENTITY_ID:
+        return 'gg.internal_code'
+    if id_type == CONCEPT_UCODE_ENTITY_ID:
+        return 'gg.concept_ucode'
+    if id_type == UCODE_ENTITY_ID:
+        return (
+            "gg.unique_code || '_V' || CASE WHEN "
+            'gg.unique_code_version IS NULL THEN 1 ELSE '
+            'gg.unique_code_version END'
+        )
+    raise ValueError(f'Invalid id type {id_type}')
+
+
+def _run_point_lookup_query(dataset: Dataset,
+                            points: List[Tuple[float, float]],
+                            id_type: IdType | str,
+                            max_privacy_level: int,
+                            dataset_view: DatasetView = None) -> list:
+    query_values = [
+        [point[0] for point in points],
+        [point[1] for point in points],
+        dataset.id
+    ]
+    # points on the cut lines of subdivided parts are not within
+    # any part, hence ST_Intersects is used instead of ST_Within
+    if dataset.subdivided_geometry_generated_at:
+        geometry_join = (
+            'INNER JOIN georepo_entitysubdividedgeometry sg '
+            '  ON sg.dataset_id = %s AND '
+            '  ST_Intersects(input_point.geom, sg.geometry) '
+            'INNER JOIN georepo_geographicalentity gg '
+            '  ON gg.id = sg.geographical_entity_id '
+        )
+    else:
+        geometry_join = (
+            'INNER JOIN georepo_geographicalentity gg '
+            '  ON gg.dataset_id = %s AND '
+            '  ST_Intersects(input_point.geom, gg.geometry) '
+        )
+    query = (
+        'WITH input_point AS ('
+        '  SELECT t.idx, ST_SetSRID(ST_MakePoint(t.x, t.y), 4326) AS geom '
+        '  FROM unnest(%s::float8[], %s::float8[]) '
+        '  WITH ORDINALITY AS t(x, y, idx)'
+        ') '
+        'SELECT DISTINCT input_point.idx, gg.level, gg.id, ge.label, ' +
+        _get_id_value_sql(id_type) + ' '
+        'FROM input_point ' +
+        geometry_join +
+        'INNER JOIN georepo_entitytype ge ON ge.id = gg.type_id '
+    )
+    if isinstance(id_type, IdType):
+        query = (
+            query +
+            'LEFT JOIN georepo_entityid gi '
+            '  ON gi.geographical_entity_id = gg.id AND gi.code_id = %s '
+        )
+        query_values.append(id_type.id)
+    query = (
+        query +
+        'WHERE gg.is_approved = true AND gg.privacy_level <= %s AND '
+    )
+    query_values.append(max_privacy_level)
+    if dataset_view:
+        query = (
+            query +
+            'gg.id IN ({}) '.format(view_entity_ids_sql(dataset_view))
+        )
+    else:
+        query = query + 'gg.is_latest = true '
+    query = query + 'ORDER BY input_point.idx, gg.level, gg.id'
+    with connection.cursor() as cursor:
+        cursor.execute(query, query_values)
+        rows = cursor.fetchall()
+    return rows
+
+
+def lookup_points(dataset: Dataset,
+                  points: List[Tuple[float, float]],
+                  id_type: IdType | str,
+                  id_type_name: str,
+                  max_privacy_level: int,
+                  dataset_view: DatasetView = None) -> list:
+    """
+    Find entities at all levels that contain each point.
+
+    :return: list ordered as the input points, each item is list of
+        {admin_level, type, id_type_name: value} sorted by admin level
+    """
+    results = [[] for _ in points]
+    for start in range(0, len(points), POINT_LOOKUP_BATCH_SIZE):
+        batch = points[start:start + POINT_LOOKUP_BATCH_SIZE]
+        rows = _run_point_lookup_query(
+            dataset,
+            batch,
+            id_type,
+            max_privacy_level,
+            dataset_view=dataset_view
+        )
+        for idx, level, _, type_label, value in rows:
+            # ordinality starts from 1
+            results[start + idx - 1].append({
+                'admin_level': level,
+                'type': type_label,
+                id_type_name: value
+            })
+    return results
@@ -1,7 +1,56 @@
+import orjson
 from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
 
 
-class GeojsonRenderer(JSONRenderer):
+class RawJSON(object):
+    """JSON text that is embedded as is by FastJSONRenderer."""
+    __slots__ = ('text',)
+
+    def __init__(self, text: str):
+        self.text = text
+
+    def __getstate__(self):
+        return self.text
+
+    def __setstate__(self, state):
+        self.text = state
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSON renderer that encodes the response with orjson.
+
+    RawJSON text is written to the output as orjson Fragment, so
+    the geometry that is encoded by the database is not parsed.
+    Types that are not supported by orjson are encoded using
+    DRF JSONEncoder.
+    """
+    options = (
+        orjson.OPT_NON_STR_KEYS |
+        orjson.OPT_PASSTHROUGH_DATETIME
+    )
+
+    def __init__(self):
+        super().__init__()
+        self.fallback_encoder = JSONEncoder()
+
+    def default(self, obj):
+        if isinstance(obj, RawJSON):
+            return orjson.Fragment(obj.text)
+        return self.fallback_encoder.default(obj)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        renderer_context = renderer_context or {}
+        options = self.options
+        if self.get_indent(accepted_media_type, renderer_context):
+            options = options | orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=self.default, option=options)
+
+
+class GeojsonRenderer(FastJSONRenderer):
     format = 'geojson'
 
 
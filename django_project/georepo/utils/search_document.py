@@ -0,0 +1,122 @@
+import logging
+from django.db import connection, transaction
+from django.db.models import Func, Value
+from django.utils import timezone
+from georepo.models.dataset import Dataset
+from georepo.models.entity import EntitySearchDocument
+
+logger = logging.getLogger(__name__)
+
+# text search configuration without stemming, names are multilingual
+SEARCH_DOCUMENT_TS_CONFIG = 'simple'
+
+
+def generate_search_document(dataset: Dataset, entities=None):
+    """
+    Generate search document of entities in dataset.
+
+    If entities is None, then regenerate search document of all approved
+    entities in the dataset and mark the dataset search document
+    as generated.
+    """
+    full_generation = entities is None
+    logger.info(f'Generating search document of dataset {dataset.id}')
+    query_values = [SEARCH_DOCUMENT_TS_CONFIG, dataset.id]
+    # ancestors are taken from the materialized path,
+    # fallback to the level 0 entity if the path is not generated
+    sql = (
+        'INSERT INTO georepo_entitysearchdocument '
+        '(geographical_entity_id, dataset_id, document, search_vector) '
+        'SELECT doc.id, doc.dataset_id, doc.document, '
+        'to_tsvector(%s::regconfig, doc.document) '
+        'FROM ('
+        '  SELECT gg.id, gg.dataset_id, lower(unaccent(concat_ws(\' \', '
+        '    gg.label, gg.internal_code, gg.unique_code, '
+        '    gg.concept_ucode, ge.label, '
+        '    (SELECT string_agg(en.name, \' \' ORDER BY en.idx) '
+        '     FROM georepo_entityname en '
+        '     WHERE en.geographical_entity_id = gg.id), '
+        '    (SELECT string_agg(ei.value, \' \') '
+        '     FROM georepo_entityid ei '
+        '     WHERE ei.geographical_entity_id = gg.id), '
+        '    COALESCE('
+        '      (SELECT string_agg(anc.label, \' \' ORDER BY anc.level) '
+        '       FROM georepo_geographicalentity anc '
+        '       WHERE nlevel(gg.ancestry_path) > 1 AND '
+        '       anc.id = ANY(string_to_array(ltree2text('
+        '         subpath(gg.ancestry_path, 0, -1)), \'.\')::int[])), '
+        '      parent_0.label)'
+        '  ))) AS document '
+        '  FROM georepo_geographicalentity gg '
+        '  INNER JOIN georepo_entitytype ge ON ge.id = gg.type_id '
+        '  LEFT JOIN georepo_geographicalentity parent_0 '
+        '    ON parent_0.id = gg.ancestor_id '
+        '  WHERE gg.dataset_id = %s AND gg.is_approved = true'
+    )
+    search_documents = EntitySearchDocument.objects.filter(
+        dataset=dataset
+    )
+    if not full_generation:
+        entity_ids = list(entities.values_list('id', flat=True))
+        sql = sql + ' AND gg.id = ANY(%s)'
+        query_values.append(entity_ids)
+        search_documents = search_documents.filter(
+            geographical_entity_id__in=entity_ids
+        )
+    sql = sql + ') AS doc'
+    with transaction.atomic():
+        search_documents.delete()
+        with connection.cursor() as cursor:
+            cursor.execute(sql, query_values)
+    if full_generation:
+        # use update to avoid triggering dataset save
+        generated_at = timezone.now()
+        Dataset.objects.filter(id=dataset.id).update(
+            search_document_generated_at=generated_at
+        )
+        dataset.search_document_generated_at = generated_at
+    logger.info(
+        f'Finished generating search document of dataset {dataset.id}'
+    )
+
+
+def update_search_document_on_approval(dataset: Dataset, entities):
+    """
+    Called when upload is approved.
+
+    Generate search document for the new entities if dataset
+    search document exists, otherwise generate for the whole dataset.
+    """
+    if dataset.search_document_generated_at is None:
+        generate_search_document(dataset)
+    else:
+        generate_search_document(dataset, entities)
+
+
+def normalize_search_text(search_text):
+    """
+    Expression of search text normalized as the search document.
+
+    search_text can be a string or an expression, e.g. F('label').
+    """
+    if not hasattr(search_text, 'resolve_expression'):
+        search_text = Value(search_text)
+    return Func(
+        Func(search_text, function='unaccent'),
+        function='lower'
+    )
+
+
+def set_word_similarity_threshold(threshold: float):
+    """
+    Set threshold of word_similar lookup in current transaction.
+
+    The setting is reverted at the end of transaction, so this must
+    be called inside transaction.atomic() that also evaluates the query.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT set_config(\'pg_trgm.word_similarity_threshold\', '
+            '%s, true)',
+            [str(threshold)]
+        )
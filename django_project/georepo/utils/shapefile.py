@@ -227,7 +227,7 @@ class ShapefileViewExporter(DatasetViewExporterBase):
         ) + suffix
         geojson_file = os.path.join(
             settings.GEOJSON_FOLDER_OUTPUT,
-            str(resource.uuid),
+            self.get_resource_output_name(resource),
             exported_name
         ) + '.geojson'
         # use ogr to convert from geojson to shapefile
@@ -274,13 +274,16 @@ class ShapefileViewExporter(DatasetViewExporterBase):
 
 
 def generate_view_shapefile(dataset_view: DatasetView,
-                            view_resource: DatasetViewResource = None):
+                            view_resource: DatasetViewResource = None,
+                            as_of=None):
     """
     Extract shape file from dataset_view and then save it to
     shapefile dataset_view folder
     :param dataset: dataset_view object
+    :param as_of: export entity revisions valid at this date
     """
     exporter = ShapefileViewExporter(dataset_view,
-                                     view_resource=view_resource)
+                                     view_resource=view_resource,
+                                     as_of=as_of)
     exporter.init_exporter()
     exporter.run()
@@ -3,6 +3,7 @@ from django.db.models.expressions import RawSQL
 from georepo.models.dataset import Dataset
 from georepo.models.entity import GeographicalEntity
 from georepo.models.dataset_view import DatasetView
+from georepo.utils.dataset_view import view_entity_ids_sql
 
 logger = logging.getLogger(__name__)
 
@@ -57,9 +58,7 @@ def process_simplification_for_view(dataset_view_id,
     """
     dataset_view = DatasetView.objects.get(id=dataset_view_id)
     # raw_sql to view to select id
-    raw_sql = (
-        'SELECT id from "{}"'
-    ).format(str(dataset_view.uuid))
+    raw_sql = view_entity_ids_sql(dataset_view)
     entities = GeographicalEntity.objects.filter(
         dataset=dataset_view.dataset
     ).filter(
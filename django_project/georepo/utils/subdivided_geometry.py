@@ -0,0 +1,68 @@
+import logging
+from django.db import connection, transaction
+from django.utils import timezone
+from georepo.models.dataset import Dataset
+from georepo.models.entity import EntitySubdividedGeometry
+
+logger = logging.getLogger(__name__)
+
+# max number of vertices of each subdivided part
+SUBDIVIDE_MAX_VERTICES = 256
+
+
+def generate_subdivided_geometry(dataset: Dataset, entities=None):
+    """
+    Generate subdivided geometry of entities in dataset.
+
+    If entities is None, then regenerate subdivided geometry of all
+    approved entities in the dataset and mark the dataset subdivided
+    geometry as generated.
+    """
+    full_generation = entities is None
+    logger.info(f'Generating subdivided geometry of dataset {dataset.id}')
+    query_values = [SUBDIVIDE_MAX_VERTICES, dataset.id]
+    sql = (
+        'INSERT INTO georepo_entitysubdividedgeometry '
+        '(geographical_entity_id, dataset_id, geometry) '
+        'SELECT gg.id, gg.dataset_id, ST_Subdivide(gg.geometry, %s) '
+        'FROM georepo_geographicalentity gg '
+        'WHERE gg.dataset_id = %s AND gg.is_approved = true AND '
+        'gg.geometry IS NOT NULL'
+    )
+    subdivided_geometries = EntitySubdividedGeometry.objects.filter(
+        dataset=dataset
+    )
+    if not full_generation:
+        entity_ids = list(entities.values_list('id', flat=True))
+        sql = sql + ' AND gg.id = ANY(%s)'
+        query_values.append(entity_ids)
+        subdivided_geometries = subdivided_geometries.filter(
+            geographical_entity_id__in=entity_ids
+        )
+    with transaction.atomic():
+        subdivided_geometries.delete()
+        with connection.cursor() as cursor:
+            cursor.execute(sql, query_values)
+    if full_generation:
+        # use update to avoid triggering dataset save
+        generated_at = timezone.now()
+        Dataset.objects.filter(id=dataset.id).update(
+            subdivided_geometry_generated_at=generated_at
+        )
+        dataset.subdivided_geometry_generated_at = generated_at
+    logger.info(
+        f'Finished generating subdivided geometry of dataset {dataset.id}'
+    )
+
+
+def update_subdivided_geometry_on_approval(dataset: Dataset, entities):
+    """
+    Called when upload is approved.
+
+    Generate subdivided geometry for the new entities if dataset
+    subdivided geometry exists, otherwise generate for the whole dataset.
+    """
+    if dataset.subdivided_geometry_generated_at is None:
+        generate_subdivided_geometry(dataset)
+    else:
+        generate_subdivided_geometry(dataset, entities)
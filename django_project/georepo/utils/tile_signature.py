@@ -0,0 +1,60 @@
+import base64
+import hashlib
+import time
+from urllib.parse import urlencode
+from django.conf import settings
+
+
+def is_tile_url_signing_enabled() -> bool:
+    return bool(settings.TILE_URL_SIGNING_KEY)
+
+
+def get_signature_window(now: float = None) -> int:
+    """Return index of current signature window."""
+    if now is None:
+        now = time.time()
+    return int(now) // settings.TILE_URL_SIGNATURE_TTL
+
+
+def get_signature_expiry(now: float = None) -> int:
+    """
+    Return expiry timestamp of tile url signed at now.
+
+    The expiry is rounded to the end of next window, so signed urls
+    are stable within a window and can be cached by clients/CDN.
+    The url is valid for at least TILE_URL_SIGNATURE_TTL seconds.
+    """
+    return (
+        (get_signature_window(now) + 2) * settings.TILE_URL_SIGNATURE_TTL
+    )
+
+
+def sign_tile_path(resource_uuid, expires: int) -> str:
+    """
+    Return signature of tiles in view resource.
+
+    The signature is verified by nginx secure_link module:
+    base64url of md5('<expires>/layer_tiles/<resource_uuid>/ <key>').
+    """
+    value = (
+        f'{expires}/layer_tiles/{str(resource_uuid)}/ '
+        f'{settings.TILE_URL_SIGNING_KEY}'
+    )
+    digest = hashlib.md5(value.encode('utf-8')).digest()
+    return base64.urlsafe_b64encode(digest).decode('utf-8').rstrip('=')
+
+
+def get_signed_tile_url_params(resource_uuid) -> str:
+    """
+    Return query params of signed tile url template.
+
+    Empty string if signing key is not configured, then tiles
+    are authorized using token.
+    """
+    if not is_tile_url_signing_enabled():
+        return ''
+    expires = get_signature_expiry()
+    return '&' + urlencode({
+        'exp': expires,
+        'sig': sign_tile_path(resource_uuid, expires)
+    })
@@ -29,7 +29,7 @@ class TopojsonViewExporter(DatasetViewExporterBase):
         ) + suffix
         geojson_file = os.path.join(
             settings.GEOJSON_FOLDER_OUTPUT,
-            str(resource.uuid),
+            self.get_resource_output_name(resource),
             exported_name
         ) + '.geojson'
         # use ogr to convert from geojson to topojson_file
@@ -49,13 +49,16 @@ class TopojsonViewExporter(DatasetViewExporterBase):
 
 
 def generate_view_topojson(dataset_view: DatasetView,
-                           view_resource: DatasetViewResource = None):
+                           view_resource: DatasetViewResource = None,
+                           as_of=None):
     """
     Extract topojson from dataset_view and then save it to
     topojson dataset_view folder
     :param dataset: dataset_view object
+    :param as_of: export entity revisions valid at this date
     """
     exporter = TopojsonViewExporter(dataset_view,
-                                    view_resource=view_resource)
+                                    view_resource=view_resource,
+                                    as_of=as_of)
     exporter.init_exporter()
     exporter.run()
@@ -1,4 +1,3 @@
-import re
 import shutil
 import subprocess
 import logging
@@ -9,7 +8,6 @@ from typing import List
 from datetime import datetime
 
 from django.conf import settings
-from django.db import connection
 from django.db.models import Max
 from django.db.models.expressions import RawSQL
 from celery.result import AsyncResult
@@ -19,7 +17,8 @@ from georepo.models import Dataset, DatasetView, \
     EntityId, EntityName, GeographicalEntity, \
     DatasetViewResource
 from georepo.utils.dataset_view import create_sql_view, \
-    check_view_exists, get_entities_count_in_view
+    check_view_exists, view_entity_ids_sql, refresh_static_view, \
+    generate_view_statistics
 from georepo.utils.module_import import module_function
 from georepo.utils.azure_blob_storage import (
     DirectoryClient,
@@ -54,9 +53,11 @@ def dataset_view_sql_query(dataset_view: DatasetView, level,
             'GeomTransformMercator(gg.geometry), !BBOX!) AS geometry, '
         )
     # raw_sql to view to select id
-    raw_sql = (
-        'SELECT id from "{}"'
-    ).format(str(dataset_view.uuid))
+    raw_sql = view_entity_ids_sql(
+        dataset_view,
+        privacy_level=privacy_level,
+        level=level
+    )
     # find IdType that the dataset has
     # retrieve all ids in current dataset
     ids = EntityId.objects.filter(
@@ -116,7 +117,8 @@ def dataset_view_sql_query(dataset_view: DatasetView, level,
 
     sql = (
         select_sql +
-        'ST_AsText(ST_PointOnSurface(gg.geometry)) AS centroid, '
+        'ST_AsText(COALESCE(gg.point_on_surface, '
+        'ST_PointOnSurface(gg.geometry))) AS centroid, '
         'gg.id, gg.label, '
         'gg.level, ge.label as type, gg.internal_code as default, '
         'gg.start_date as start_date, gg.end_date as end_date, '
@@ -234,9 +236,10 @@ def create_view_configuration_files(
         privacy_level__lte=view_resource.privacy_level
     )
     # raw_sql to view to select id
-    raw_sql = (
-        'SELECT id from "{}"'
-    ).format(str(view_resource.dataset_view.uuid))
+    raw_sql = view_entity_ids_sql(
+        view_resource.dataset_view,
+        privacy_level=view_resource.privacy_level
+    )
     entities = entities.filter(
         id__in=RawSQL(raw_sql, [])
     )
@@ -338,16 +341,25 @@ def generate_view_vector_tiles(view_resource: DatasetViewResource,
     """
     view_resource.status = DatasetView.DatasetViewStatus.PROCESSING
     view_resource.vector_tiles_progress = 0
-    view_resource.save()
+    # update_fields keeps task id of newer task that supersedes this one
+    view_resource.save(update_fields=['status', 'vector_tiles_progress'])
     # Create a sql view
     sql_view = str(view_resource.dataset_view.uuid)
-    if not check_view_exists(sql_view):
+    view_refreshed = True
+    if view_resource.dataset_view.is_static:
+        refresh_static_view(view_resource.dataset_view)
+    elif not check_view_exists(sql_view):
         create_sql_view(view_resource.dataset_view)
+    else:
+        view_refreshed = False
+    if view_refreshed or view_resource.statistics_updated_at is None:
+        generate_view_statistics(view_resource.dataset_view)
+        view_resource.refresh_from_db(
+            fields=['statistics_entity_count', 'levels', 'bbox',
+                    'statistics_updated_at']
+        )
     # check the number of entity in view_resource
-    entity_count = get_entities_count_in_view(
-        view_resource.dataset_view,
-        view_resource.privacy_level
-    )
+    entity_count = view_resource.statistics_entity_count
     if entity_count == 0:
         logger.info(
             'Skipping vector tiles generation for '
@@ -370,22 +382,6 @@ def generate_view_vector_tiles(view_resource: DatasetViewResource,
         save_view_resource_on_success(view_resource, entity_count)
         calculate_vector_tiles_size(view_resource)
         return False
-    geom_col = 'geometry'
-
-    # Get bbox from sql view
-    bbox = []
-    with connection.cursor() as cursor:
-        cursor.execute(
-            f'SELECT ST_Extent({geom_col}) as bextent FROM "{sql_view}" '
-            f'WHERE privacy_level <= {view_resource.privacy_level} AND '
-            'is_approved=True'
-        )
-        extent = cursor.fetchone()
-        if extent:
-            try:
-                bbox = re.findall(r'[-+]?(?:\d*\.\d+|\d+)', extent[0])
-            except TypeError:
-                pass
 
     processed_count = 0
     tegola_concurrency = int(os.getenv('TEGOLA_CONCURRENCY', '2'))
@@ -411,14 +407,10 @@ def generate_view_vector_tiles(view_resource: DatasetViewResource,
                 '--concurrency',
                 f'{tegola_concurrency}',
             ])
-        if bbox:
-            _bbox = []
-            for coord in bbox:
-                _bbox.append(str(round(float(coord), 3)))
-            view_resource.bbox = ','.join(_bbox)
+        if view_resource.bbox:
             command_list.extend([
                 '--bounds',
-                ','.join(_bbox)
+                view_resource.bbox
             ])
 
         if 'zoom' in toml_config_file:
@@ -448,7 +440,7 @@ def generate_view_vector_tiles(view_resource: DatasetViewResource,
             logger.error(result.stderr)
             view_resource.status = DatasetView.DatasetViewStatus.ERROR
             view_resource.vector_tiles_log = result.stderr.decode()
-            view_resource.save()
+            view_resource.save(update_fields=['status', 'vector_tiles_log'])
             raise RuntimeError(view_resource.vector_tiles_log)
         processed_count += 1
         view_resource.vector_tiles_progress = (
@@ -459,7 +451,7 @@ def generate_view_vector_tiles(view_resource: DatasetViewResource,
             f'view_resource {view_resource.id} '
             f'- {view_resource.vector_tiles_progress}'
         )
-        view_resource.save()
+        view_resource.save(update_fields=['vector_tiles_progress'])
     logger.info(
         'Finished vector tile generation for '
         f'view_resource {view_resource.id} '
@@ -481,7 +473,8 @@ def save_view_resource_on_success(view_resource, entity_count):
     view_resource.vector_tiles_updated_at = datetime.now()
     view_resource.vector_tiles_progress = 100
     view_resource.entity_count = entity_count
-    view_resource.save()
+    view_resource.save(update_fields=['status', 'vector_tiles_updated_at',
+                                      'vector_tiles_progress', 'entity_count'])
 
 
 def check_task_tiling_status(dataset: Dataset) -> str:
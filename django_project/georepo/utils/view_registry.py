@@ -0,0 +1,82 @@
+from typing import Dict, Iterable
+from django.core.cache import cache
+from django.db import connection, transaction
+
+# prefix of cached relation kind of sql view
+SQL_VIEW_KEY_PREFIX = 'sql_view'
+# sql views are invalidated on create/delete, ttl is only a safety net
+SQL_VIEW_CACHE_TTL = 3600
+# pg_class relkind of sql view
+REGULAR_VIEW = 'v'
+MATERIALIZED_VIEW = 'm'
+# cached value when the view does not exist
+MISSING_VIEW = ''
+
+
+def _sql_view_key(view_name: str) -> str:
+    return f'{SQL_VIEW_KEY_PREFIX}:{view_name}'
+
+
+def _fetch_sql_view_kinds(view_names) -> Dict[str, str]:
+    """Lookup relation kind of views in public schema from pg_class."""
+    sql = (
+        'SELECT c.relname, c.relkind '
+        'FROM pg_class c '
+        'INNER JOIN pg_namespace n ON n.oid = c.relnamespace '
+        'WHERE n.nspname=%s AND c.relname = ANY(%s) AND '
+        'c.relkind IN (%s, %s)'
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [
+            'public', list(view_names),
+            REGULAR_VIEW, MATERIALIZED_VIEW
+        ])
+        kinds = dict(cursor.fetchall())
+    return {
+        view_name: kinds.get(view_name, MISSING_VIEW) for
+        view_name in view_names
+    }
+
+
+def get_sql_view_kinds(view_names: Iterable[str]) -> Dict[str, str]:
+    """
+    Return relation kind of sql views: REGULAR_VIEW, MATERIALIZED_VIEW
+    or MISSING_VIEW.
+
+    Views that are not in the cache are looked up in one query.
+    """
+    view_names = [str(view_name) for view_name in view_names]
+    if not view_names:
+        return {}
+    keys = {_sql_view_key(view_name): view_name for view_name in view_names}
+    cached = cache.get_many(list(keys.keys()))
+    result = {
+        keys[key]: kind for key, kind in cached.items()
+    }
+    missing = [
+        view_name for view_name in view_names if view_name not in result
+    ]
+    if missing:
+        kinds = _fetch_sql_view_kinds(missing)
+        cache.set_many({
+            _sql_view_key(view_name): kind for
+            view_name, kind in kinds.items()
+        }, SQL_VIEW_CACHE_TTL)
+        result.update(kinds)
+    return result
+
+
+def get_sql_view_kind(view_name: str) -> str:
+    return get_sql_view_kinds([view_name])[str(view_name)]
+
+
+def invalidate_sql_view(view_name: str):
+    """
+    Called when sql view is created or dropped.
+
+    Invalidate again after commit, so the view kind that is read by
+    other process before the transaction commits is not kept.
+    """
+    key = _sql_view_key(str(view_name))
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
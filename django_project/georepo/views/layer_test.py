@@ -15,6 +15,7 @@ from georepo.models import Dataset, DatasetView, GeographicalEntity,\
     DatasetViewResource
 from georepo.models.dataset_tile_config import AdminLevelTilingConfig
 from georepo.models.dataset_view_tile_config import ViewAdminLevelTilingConfig
+from georepo.utils.dataset_view import view_entity_ids_sql
 
 
 def get_view_zoom_level(level: int, dataset_view: DatasetView):
@@ -114,9 +115,7 @@ class LayerTestView(UserPassesTestMixin, TemplateView):
                 is_approved=True
             )
             # raw_sql to view to select id
-            raw_sql = (
-                'SELECT id from "{}"'
-            ).format(str(dataset_view.uuid))
+            raw_sql = view_entity_ids_sql(dataset_view)
             entities = entities.filter(
                 id__in=RawSQL(raw_sql, [])
             )
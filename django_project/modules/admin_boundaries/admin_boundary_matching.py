@@ -1,10 +1,9 @@
 from typing import Tuple
 import logging
 from difflib import SequenceMatcher
-from area import area
 from django.contrib.gis.db.models.functions import Intersection, Area
 from django.db.models import (
-    Avg, F, Q, Case, When,
+    Avg, F, Q, Case, When, Sum,
     FloatField, ExpressionWrapper
 )
 from django.contrib.gis.measure import D
@@ -16,6 +15,10 @@ from dashboard.models import (
 )
 from dashboard.models.boundary_comparison import BoundaryComparison
 from georepo.models import GeographicalEntity, EntityName, Dataset
+from georepo.utils.geometry_metrics import (
+    ensure_geometry_metrics,
+    ensure_geometry_metrics_of_entities
+)
 from georepo.utils.unique_code import (
     generate_upload_unique_code_version,
     get_version_code,
@@ -611,30 +614,15 @@ class AdminBoundaryMatching(object):
                     unique_code_version=prev_unique_code_version
                 )
                 old_entity_count = prev_entities.count()
-                for prev_entity in prev_entities.iterator(chunk_size=1):
-                    if prev_entity.area:
-                        old_total_area += prev_entity.area
-                    else:
-                        old_area = area(
-                            prev_entity.geometry.geojson
-                        ) / 1e+6 if prev_entity.geometry else 0
-                        prev_entity.area = old_area
-                        prev_entity.save()
-                        old_total_area += old_area
+                ensure_geometry_metrics_of_entities(prev_entities)
+                old_total_area = prev_entities.aggregate(
+                    total=Sum('area'))['total']
 
             new_total_area = 0
             if new_entities_by_level:
-                for new_entity in (
-                        new_entities_by_level.iterator(chunk_size=1)):
-                    if new_entity.area:
-                        new_total_area += new_entity.area
-                    else:
-                        new_area = area(
-                            new_entity.geometry.geojson
-                        ) / 1e+6 if new_entity.geometry else 0
-                        new_entity.area = new_area
-                        new_entity.save()
-                        new_total_area += new_area
+                ensure_geometry_metrics_of_entities(new_entities_by_level)
+                new_total_area = new_entities_by_level.aggregate(
+                    total=Sum('area'))['total']
 
             summary_data.append(
                 vars(AdminSummaryData(
@@ -827,16 +815,8 @@ def compare_entities(
         }
     }
     """
-    if not entity_target.area:
-        entity_target.area = area(
-            entity_target.geometry.geojson
-        ) / 1e+6
-        entity_target.save()
-    if not entity_source.area:
-        entity_source.area = area(
-            entity_source.geometry.geojson
-        ) / 1e+6
-        entity_source.save()
+    ensure_geometry_metrics(entity_target)
+    ensure_geometry_metrics(entity_source)
     intersection_new = entity_target.geometry.intersection(
         entity_source.geometry
     )
@@ -868,13 +848,13 @@ def compare_entities(
         'main_boundary_data': {
             'label': entity_target.label,
             'area': round(entity_target.area, 2),
-            'perimeter': round(entity_target.geometry.length, 2),
+            'perimeter': round(entity_target.perimeter, 2),
             'code': entity_target.unique_code
         },
         'comparison_boundary_data': {
             'label': entity_source.label,
             'area': round(entity_source.area, 2),
-            'perimeter': round(entity_source.geometry.length, 2),
+            'perimeter': round(entity_source.perimeter, 2),
             'code': entity_source.unique_code,
             'version': get_version_code(entity_source.unique_code_version),
             'level': entity_source.level
@@ -14,6 +14,23 @@ from georepo.utils.dataset_view import (
     generate_default_view_adm0_all_versions,
     trigger_generate_dynamic_views
 )
+from georepo.utils.cache_generation import (
+    bump_dataset_generation,
+    bump_generation,
+    dataset_schema_scope
+)
+from georepo.utils.ancestry_path import (
+    generate_ancestry_path_of_entities
+)
+from georepo.utils.entity_read_model import (
+    update_entity_read_model_on_approval
+)
+from georepo.utils.search_document import (
+    update_search_document_on_approval
+)
+from georepo.utils.subdivided_geometry import (
+    update_subdivided_geometry_on_approval
+)
 from georepo.utils.unique_code import (
     generate_concept_ucode
 )
@@ -56,6 +73,16 @@ def approve_revision(entity_upload: EntityUploadStatus, user, is_batch=False):
     else:
         approve_new_revision_upload(entity_upload, user)
     dataset = entity_upload.upload_session.dataset
+    # update materialized path of the approved entities
+    generate_ancestry_path_of_entities(new_entities)
+    # id types, name slots and levels may be changed by the upload
+    bump_generation(dataset_schema_scope(dataset.uuid))
+    # generate read model of the approved entities
+    update_entity_read_model_on_approval(dataset, new_entities)
+    # generate search document of the approved entities
+    update_search_document_on_approval(dataset, new_entities)
+    # generate subdivided geometry for point lookup
+    update_subdivided_geometry_on_approval(dataset, new_entities)
     # generate default views
     generate_default_views(dataset)
     # change status to APPROVED
@@ -64,6 +91,8 @@ def approve_revision(entity_upload: EntityUploadStatus, user, is_batch=False):
 
     entity_upload.upload_session.status = DONE
     entity_upload.upload_session.save()
+    # invalidate cached api responses of dataset and its views
+    bump_dataset_generation(dataset, include_views=True)
     if not is_batch:
         # trigger refresh views
         trigger_generate_dynamic_views(